@@ -0,0 +1,290 @@
+'''Benchmark suite for the euclidean, hyperbolic and rendering hot paths.
+
+   python benchmark.py                              # run everything and print a table
+   python benchmark.py --scale 4 --filter tiling    # larger inputs, only matching benchmarks
+   python benchmark.py --output baseline.json       # store the results
+   python benchmark.py --compare baseline.json      # fail if anything got slower than the threshold
+'''
+
+import io
+import sys
+import json
+import time
+import math
+import random
+import fnmatch
+import argparse
+import platform
+import statistics
+import subprocess
+
+from poincare import Point, Line, Circle, HyperbolicLine, HyperbolicPoint, PoincareDiskModel, RegularTiling
+from poincare import euclidean
+from test import draw_hyperbolic_rosette
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    '''Registers a benchmark. The decorated function takes the scale and returns the callable to time.'''
+    def register(function):
+        BENCHMARKS[name] = function
+        return function
+    return register
+
+def random_points(count, seed=0, max_radius=0.9):
+    rng = random.Random(seed)
+    polar_coordinates = [(rng.uniform(0, max_radius), rng.uniform(0, 2 * math.pi)) for _ in range(count)]
+    return [HyperbolicPoint(radius * math.cos(angle), radius * math.sin(angle)) for radius, angle in polar_coordinates]
+
+def random_lines(count, seed=0):
+    points = random_points(2 * count, seed)
+    return [HyperbolicLine(points[2 * i], points[2 * i + 1]) for i in range(count)]
+
+
+# Micro benchmarks
+
+@benchmark('euclidean.circle_circle_intersection')
+def bench_circle_circle_intersection(scale):
+    circles = [Circle(point, 0.5) for point in random_points(int(1000 * scale))]
+    return lambda: [euclidean._circle_circle_intersection(a, b) for a, b in zip(circles, circles[1:])]
+
+@benchmark('euclidean.circle_line_intersection')
+def bench_circle_line_intersection(scale):
+    points = random_points(int(1000 * scale))
+    circles, lines = [Circle(point, 0.5) for point in points], [Line(p, q) for p, q in zip(points, points[1:])]
+    return lambda: [euclidean._circle_line_intersection(circle, line) for circle, line in zip(circles, lines)]
+
+@benchmark('euclidean.line_line_intersection')
+def bench_line_line_intersection(scale):
+    points = random_points(int(1000 * scale))
+    lines = [Line(p, q) for p, q in zip(points, points[1:])]
+    return lambda: [euclidean._line_line_intersection(a, b) for a, b in zip(lines, lines[1:])]
+
+@benchmark('euclidean.rotated_point')
+def bench_rotated_point(scale):
+    points = random_points(int(1000 * scale))
+    return lambda: [point.rotated_point(points[0], 0.3) for point in points]
+
+@benchmark('euclidean.Point.__add__')
+def bench_point_add(scale):
+    points = random_points(int(1000 * scale))
+    return lambda: [p + q for p, q in zip(points, points[1:])]
+
+@benchmark('euclidean.Point.__mul__')
+def bench_point_mul(scale):
+    points = random_points(int(1000 * scale))
+    return lambda: [point * 0.5 for point in points]
+
+@benchmark('euclidean.Line.rotated_line')
+def bench_rotated_line(scale):
+    points = random_points(int(1000 * scale))
+    lines = [Line(p, q) for p, q in zip(points, points[1:])]
+    return lambda: [line.rotated_line(points[0], 0.3) for line in lines]
+
+@benchmark('hyperbolic.HyperbolicPoint.inverse')
+def bench_inverse(scale):
+    points = random_points(int(1000 * scale))
+    return lambda: [point.inverse() for point in points]
+
+@benchmark('hyperbolic.HyperbolicLine.__init__')
+def bench_hyperbolic_line_init(scale):
+    points = random_points(int(1000 * scale))
+    return lambda: [HyperbolicLine(p, q) for p, q in zip(points, points[1:])]
+
+@benchmark('hyperbolic.HyperbolicLine.length')
+def bench_hyperbolic_line_length(scale):
+    points = random_points(2 * int(1000 * scale))
+    # length() is cached on the line, so every run measures freshly constructed lines
+    return lambda: [HyperbolicLine(p, q).length() for p, q in zip(points[::2], points[1::2])]
+
+@benchmark('hyperbolic.HyperbolicPoint.distance')
+def bench_distance(scale):
+    points = random_points(int(1000 * scale))
+    return lambda: [p.distance(q) for p, q in zip(points, points[1:])]
+
+@benchmark('hyperbolic.HyperbolicPoint.distance[geometric]')
+def bench_distance_geometric(scale):
+    points = random_points(int(1000 * scale))
+    return lambda: [p.distance(q, geometric=True) for p, q in zip(points, points[1:])]
+
+@benchmark('hyperbolic.HyperbolicPoint.angle_between_three_points')
+def bench_angle_between_three_points(scale):
+    points = random_points(int(1000 * scale))
+    return lambda: [HyperbolicPoint.angle_between_three_points(*points[i:i + 3]) for i in range(len(points) - 2)]
+
+@benchmark('hyperbolic.HyperbolicLine.intersection')
+def bench_hyperbolic_intersection(scale):
+    lines = random_lines(int(1000 * scale))
+    return lambda: [a.intersection(b) for a, b in zip(lines, lines[1:])]
+
+@benchmark('hyperbolic.HyperbolicLine.line_at_angle')
+def bench_line_at_angle(scale):
+    lines = random_lines(int(200 * scale))
+    return lambda: [line.line_at_angle(1.0, 0.5) for line in lines]
+
+@benchmark('hyperbolic.HyperbolicLine.line_at_angle[geometric]')
+def bench_line_at_angle_geometric(scale):
+    lines = random_lines(int(200 * scale))
+    return lambda: [line.line_at_angle(1.0, 0.5, geometric=True) for line in lines]
+
+@benchmark('hyperbolic.all_intersections')
+def bench_all_intersections(scale):
+    from poincare.hyperbolic import all_intersections
+    edges = list(RegularTiling(7, 3).edges(3 + int(math.log2(max(scale, 1)))))
+    return lambda: all_intersections(edges)
+
+@benchmark('hyperbolic.all_intersections[pairwise]')
+def bench_all_intersections_pairwise(scale):
+    edges = list(RegularTiling(7, 3).edges(3 + int(math.log2(max(scale, 1)))))
+    return lambda: [a.intersection(b) for i, a in enumerate(edges) for b in edges[i + 1:]]
+
+@benchmark('arrays.HyperbolicPointArray.distance')
+def bench_point_array_distance(scale):
+    from poincare import HyperbolicPointArray
+    points = HyperbolicPointArray.from_points(random_points(int(100000 * scale)))
+    return lambda: points.distance(points[0])
+
+@benchmark('polygon.locate')
+def bench_locate(scale):
+    from poincare.polygon import HyperbolicPolygon, locate
+    polygons = [HyperbolicPolygon(vertices) for vertices in RegularTiling(7, 3).polygons(3)]
+    points = random_points(int(20000 * scale))
+    return lambda: locate(points, polygons)
+
+@benchmark('discretize.discretize_lines')
+def bench_discretize_lines(scale):
+    from poincare.discretize import discretize_lines
+    lines = random_lines(int(10000 * scale))
+    return lambda: discretize_lines(lines, cache=None)
+
+@benchmark('delaunay.DelaunayTriangulation')
+def bench_delaunay(scale):
+    from poincare.delaunay import DelaunayTriangulation
+    points = random_points(int(20000 * scale))
+    return lambda: DelaunayTriangulation(points).voronoi().regions()
+
+@benchmark('riemannian.kmeans')
+def bench_kmeans(scale):
+    from poincare.riemannian import kmeans
+    points = random_points(int(50000 * scale))
+    return lambda: kmeans(points, 16, max_iterations=10)
+
+@benchmark('patterns.sweep')
+def bench_sweep(scale):
+    from poincare.patterns import Rosette, sweep
+    thetas = [math.pi * (0.05 + 0.2 * i / 16) for i in range(max(1, int(16 * scale)))]
+    return lambda: sweep(Rosette(9, 9, 0.0), thetas)
+
+@benchmark('poincaredisk.drawline[svg]')
+def bench_drawline_svg(scale):
+    lines = random_lines(int(1000 * scale))
+    def draw():
+        model = PoincareDiskModel(backend='svg', output=io.StringIO())
+        for line in lines:
+            model.drawline(line)
+        model.save(None)
+    return draw
+
+@benchmark('scene.load_and_draw[svg]')
+def bench_scene_load(scale):
+    import tempfile
+    from poincare import Scene, SceneWriter
+    # removed once the timed callable holding it is released, or at exit
+    directory = tempfile.TemporaryDirectory()
+    path = directory.name
+    model = PoincareDiskModel(backend=SceneWriter(path))
+    for line in random_lines(int(1000 * scale)):
+        model.drawline(line)
+    model.save(None)
+    def draw():
+        model = PoincareDiskModel(backend='svg', output=io.StringIO())
+        Scene(directory.name).draw(model)
+        model.save(None)
+    return draw
+
+
+# Macro benchmarks
+
+@benchmark('macro.import_poincare')
+def bench_import(scale):
+    return lambda: subprocess.run([sys.executable, '-c', 'import poincare'], check=True)
+
+@benchmark('macro.rosette_9_9')
+def bench_rosette(scale):
+    def draw():
+        for _ in range(max(1, int(scale))):
+            model = PoincareDiskModel(backend='svg', output=io.StringIO())
+            draw_hyperbolic_rosette(model, 9, 9, math.pi / 10)
+            model.save(None)
+    return draw
+
+def tiling_benchmark(depth):
+    def bench_tiling(scale):
+        return lambda: sum(1 for _ in RegularTiling(7, 3).edges(depth + int(math.log2(max(scale, 1)))))
+    return bench_tiling
+
+for tiling_depth in range(2, 7):
+    benchmark('macro.tiling_7_3_depth_{}'.format(tiling_depth))(tiling_benchmark(tiling_depth))
+
+
+def run(names, scale, repeat):
+    '''Runs the benchmarks, returning a dictionary of timing statistics in seconds per benchmark.'''
+    results = {}
+    for name in names:
+        function = BENCHMARKS[name](scale)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+        results[name] = {'min': min(timings), 'median': statistics.median(timings), 'repeat': repeat}
+        print('{:<60} {:>12.6f} {:>12.6f}'.format(name, results[name]['min'], results[name]['median']))
+    return results
+
+def compare(results, baseline, threshold):
+    '''Prints the ratio of every result to its baseline, returning the names slower than the threshold.'''
+    regressions = []
+    print('\n{:<60} {:>12} {:>12} {:>8}'.format('benchmark', 'baseline', 'current', 'ratio'))
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result['min'] / baseline[name]['min']
+        flag = ' REGRESSION' if ratio > threshold else ''
+        print('{:<60} {:>12.6f} {:>12.6f} {:>8.2f}{}'.format(name, baseline[name]['min'], result['min'], ratio, flag))
+        if flag:
+            regressions.append(name)
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=float, default=1.0, help='multiplier of the input sizes')
+    parser.add_argument('--repeat', type=int, default=5, help='number of timed runs per benchmark')
+    parser.add_argument('--filter', default='*', help='glob pattern of the benchmarks to run')
+    parser.add_argument('--output', help='JSON file to write the results to')
+    parser.add_argument('--compare', help='JSON file of baseline results to compare against')
+    parser.add_argument('--threshold', type=float, default=1.2, help='slowdown ratio counted as a regression')
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if fnmatch.fnmatch(name, args.filter) or args.filter in name]
+    print('{:<60} {:>12} {:>12}'.format('benchmark', 'min [s]', 'median [s]'))
+    results = run(names, args.scale, args.repeat)
+
+    if args.output:
+        meta = {'python': platform.python_version(), 'platform': platform.platform(), 'scale': args.scale,
+                'time': time.strftime('%Y-%m-%dT%H:%M:%S')}
+        with open(args.output, 'w') as output:
+            json.dump({'meta': meta, 'results': results}, output, indent=2)
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline['meta']['scale'] != args.scale:
+            print('Warning: baseline was measured at scale {}.'.format(baseline['meta']['scale']))
+        if compare(results, baseline['results'], args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,31 @@
-'''Imports for the poincare package.'''
+'''Imports for the poincare package.
+   Modules depending on NumPy or on a plotting library are only imported on first access of their names.'''
 
-from . euclidean import Point, Line, Circle
-from . hyperbolic import HyperbolicLine, HyperbolicPoint
-from . poincaredisk import PoincareDiskModel
+import importlib
+
+from . euclidean import Point, Line, Circle, Intersection
+from . hyperbolic import HyperbolicLine, HyperbolicPoint, Mobius
+from . tiling import RegularTiling
+from . canonical import PointSet, LineSet
+
+_LAZY_IMPORTS = {'PoincareDiskModel': 'poincaredisk',
+                 'PointArray': 'arrays', 'LineArray': 'arrays', 'CircleArray': 'arrays',
+                 'HyperbolicPointArray': 'arrays',
+                 'HyperbolicKDTree': 'spatial',
+                 'pairwise_distances': 'pairwise', 'nearest_k': 'pairwise',
+                 'Scene': 'scene', 'SceneWriter': 'scene',
+                 'HyperbolicPolygon': 'polygon',
+                 'discretize_lines': 'discretize', 'discretize_circles': 'discretize',
+                 'discretize_polygons': 'discretize',
+                 'Star': 'patterns', 'Rosette': 'patterns',
+                 'DelaunayTriangulation': 'delaunay', 'VoronoiDiagram': 'delaunay',
+                 'exp_map': 'riemannian', 'log_map': 'riemannian', 'frechet_mean': 'riemannian',
+                 'frechet_means': 'riemannian', 'kmeans': 'riemannian'}
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        return getattr(importlib.import_module('.' + _LAZY_IMPORTS[name], __name__), name)
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
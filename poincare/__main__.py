@@ -0,0 +1,32 @@
+'''Renders pattern and tiling specs from JSON or TOML files, see poincare.render for the spec format.
+
+   python -m poincare rosettes.toml tilings.json                # render every spec, one worker per core
+   python -m poincare --no-cache --workers 1 rosette.json      # recompute the geometry in this process
+'''
+
+import sys
+import argparse
+
+from . cache import GeometryCache, DEFAULT_MAX_SIZE
+from . render import load_specs, render_all
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m poincare', description=__doc__.splitlines()[0])
+    parser.add_argument('specs', nargs='+', help='JSON or TOML files holding a spec or a list of specs')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes, one per core by default')
+    parser.add_argument('--cache-dir', default=None, help='geometry cache directory, $POINCARE_CACHE or '
+                        '~/.cache/poincare by default')
+    parser.add_argument('--cache-size', type=float, default=DEFAULT_MAX_SIZE / 2**20,
+                        help='maximal size of the geometry cache in MiB')
+    parser.add_argument('--no-cache', action='store_true', help='always compute the geometry')
+    args = parser.parse_args(argv)
+
+    specs = [spec for filename in args.specs for spec in load_specs(filename)]
+    cache = None if args.no_cache else GeometryCache(args.cache_dir, int(args.cache_size * 2**20))
+    for output in render_all(specs, cache, args.workers):
+        print(output)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,269 @@
+'''Module containing NumPy backed arrays of Points, Lines, Circles and HyperbolicPoints.'''
+
+import numpy as np
+
+from . euclidean import Point, Line, Circle
+from . hyperbolic import HyperbolicPoint
+from . import models
+
+
+def _as_coordinates(other):
+    '''Returns the coordinates of a Point or a PointArray as something broadcastable against an (N, 2) array.'''
+    if isinstance(other, PointArray):
+        return other.coordinates
+    return np.asarray(other, dtype=np.float64)
+
+def _coordinate_array(points):
+    '''Returns an (N, 2) coordinate array of a Point, an iterable of Points, a PointArray or an array.'''
+    if isinstance(points, PointArray):
+        return points.coordinates
+    if isinstance(points, Point):
+        return np.array([[points.x, points.y]])
+    if isinstance(points, np.ndarray):
+        return np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    return PointArray.from_points(points).coordinates
+
+
+class PointArray(object):
+    '''Array of 2D Euclidean points, stored as an (N, 2) float64 buffer of x and y coordinates.'''
+
+    _scalar_type = Point
+
+    def __init__(self, coordinates):
+        '''Constructs a PointArray from anything convertible to an (N, 2) float array.'''
+        coordinates = np.asarray(coordinates, dtype=np.float64)
+        if coordinates.size == 0:
+            coordinates = coordinates.reshape(0, 2)
+        if coordinates.ndim != 2 or coordinates.shape[1] != 2:
+            raise ValueError('Coordinates must be of shape (N, 2).')
+        self._coordinates = coordinates
+
+    @classmethod
+    def from_points(cls, points):
+        '''Constructs an array from an iterable of Points.'''
+        return cls([(point.x, point.y) for point in points])
+
+    def to_points(self):
+        '''Returns a list of scalar Points.'''
+        return [self._scalar_type(x, y) for x, y in self._coordinates.tolist()]
+
+    @classmethod
+    def from_complex(cls, z):
+        '''Constructs an array from an array of complex numbers.'''
+        z = np.asarray(z, dtype=np.complex128)
+        return cls(np.stack([z.real, z.imag], axis=-1))
+
+    def to_complex(self):
+        '''Returns the points as an (N,) array of complex numbers.'''
+        return self.x + 1j * self.y
+
+    @property
+    def coordinates(self):
+        '''The underlying (N, 2) coordinate buffer.'''
+        return self._coordinates
+
+    @property
+    def x(self):
+        return self._coordinates[:, 0]
+
+    @property
+    def y(self):
+        return self._coordinates[:, 1]
+
+    def __len__(self):
+        return len(self._coordinates)
+
+    def __iter__(self):
+        return iter(self.to_points())
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            x, y = self._coordinates[index].tolist()
+            return self._scalar_type(x, y)
+        return type(self)(self._coordinates[index])
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, self._coordinates)
+
+    def distance(self, other):
+        '''Distances between the points and a Point, or element-wise with another array of equal length.'''
+        difference = self._coordinates - _as_coordinates(other)
+        return np.hypot(difference[:, 0], difference[:, 1])
+
+    def distance_to_origin(self):
+        '''Distances between the points and the origin.'''
+        return np.hypot(self.x, self.y)
+
+    def azimuth(self):
+        '''Azimuths of the points relative to the origin in radians.'''
+        return np.arctan2(self.y, self.x)
+
+    def rotated_point(self, anchor, angle):
+        '''Returns the points' locations after rotation by the angle around an anchor point.'''
+        anchor = _as_coordinates(anchor)
+        difference = self._coordinates - anchor
+        cos_angle, sin_angle = np.cos(angle), np.sin(angle)
+        rotated = np.empty_like(difference)
+        rotated[:, 0] = difference[:, 0] * cos_angle - difference[:, 1] * sin_angle
+        rotated[:, 1] = difference[:, 0] * sin_angle + difference[:, 1] * cos_angle
+        return type(self)(rotated + anchor)
+
+    def __add__(self, other):
+        return type(self)(self._coordinates + _as_coordinates(other))
+
+    def __sub__(self, other):
+        return type(self)(self._coordinates - _as_coordinates(other))
+
+    def __mul__(self, other):
+        if isinstance(other, (Point, PointArray)):
+            return np.sum(self._coordinates * _as_coordinates(other), axis=1)
+        return type(self)(self._coordinates * np.asarray(other, dtype=np.float64).reshape(-1, 1))
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def __truediv__(self, other):
+        return type(self)(self._coordinates / np.asarray(other, dtype=np.float64).reshape(-1, 1))
+
+
+class LineArray(object):
+    '''Array of 2D Euclidean lines a*x + b*y = c, stored as an (N, 3) float64 buffer of a, b and c.'''
+
+    def __init__(self, coefficients):
+        '''Constructs a LineArray from anything convertible to an (N, 3) float array.'''
+        coefficients = np.asarray(coefficients, dtype=np.float64)
+        if coefficients.size == 0:
+            coefficients = coefficients.reshape(0, 3)
+        if coefficients.ndim != 2 or coefficients.shape[1] != 3:
+            raise ValueError('Coefficients must be of shape (N, 3).')
+        self._coefficients = coefficients
+
+    @classmethod
+    def from_lines(cls, lines):
+        '''Constructs an array from an iterable of Lines.'''
+        return cls([tuple(line) for line in lines])
+
+    def to_lines(self):
+        '''Returns a list of scalar Lines.'''
+        return [Line(a, b, c) for a, b, c in self._coefficients.tolist()]
+
+    @property
+    def coefficients(self):
+        '''The underlying (N, 3) coefficient buffer.'''
+        return self._coefficients
+
+    def __len__(self):
+        return len(self._coefficients)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return Line(*self._coefficients[index].tolist())
+        return LineArray(self._coefficients[index])
+
+
+class CircleArray(object):
+    '''Array of Euclidean circles, stored as an (N, 2) buffer of centers and an (N,) buffer of radii.'''
+
+    def __init__(self, centers, radii):
+        '''Constructs a CircleArray from center coordinates and radii.'''
+        self._centers = PointArray(centers).coordinates
+        self._radii = np.broadcast_to(np.asarray(radii, dtype=np.float64), (len(self._centers),))
+
+    @classmethod
+    def from_circles(cls, circles):
+        '''Constructs an array from an iterable of Circles.'''
+        circles = list(circles)
+        return cls([(circle.center.x, circle.center.y) for circle in circles], [circle.radius for circle in circles])
+
+    def to_circles(self):
+        '''Returns a list of scalar Circles.'''
+        return [Circle(Point(x, y), radius) for (x, y), radius in zip(self._centers.tolist(), self._radii.tolist())]
+
+    @property
+    def centers(self):
+        '''The (N, 2) buffer of circle centers.'''
+        return self._centers
+
+    @property
+    def radii(self):
+        '''The (N,) buffer of circle radii.'''
+        return self._radii
+
+    def __len__(self):
+        return len(self._centers)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            x, y = self._centers[index].tolist()
+            return Circle(Point(x, y), float(self._radii[index]))
+        return CircleArray(self._centers[index], self._radii[index])
+
+
+class HyperbolicPointArray(PointArray):
+    '''Array of points on the Poincare disk, the vectorized counterpart of HyperbolicPoint.'''
+
+    _scalar_type = HyperbolicPoint
+
+    @classmethod
+    def from_hyperboloid(cls, points):
+        '''Constructs an array from (N, 3) hyperboloid coordinates.'''
+        return cls(models.hyperboloid_to_disk(points))
+
+    def to_hyperboloid(self):
+        '''Returns the points as (N, 3) hyperboloid coordinates.'''
+        return models.disk_to_hyperboloid(self._coordinates)
+
+    @classmethod
+    def from_klein(cls, coordinates):
+        '''Constructs an array from (N, 2) Klein coordinates.'''
+        return cls(models.klein_to_disk(coordinates))
+
+    def to_klein(self):
+        '''Returns the points as (N, 2) Klein coordinates.'''
+        return models.disk_to_klein(self._coordinates)
+
+    def euclidean_distance_to_origin(self):
+        '''Euclidean distances to the origin of the Poincare Disk.'''
+        return PointArray.distance_to_origin(self)
+
+    def inverse(self):
+        '''Inverse points in respect with the Poincare Disk.'''
+        squared_norms = np.sum(self._coordinates**2, axis=1)
+        return HyperbolicPointArray(self._coordinates / squared_norms[:, np.newaxis])
+
+    def distance_to_origin(self):
+        '''Hyperbolic distances to the origin.'''
+        return 2.0 * np.arctanh(self.euclidean_distance_to_origin())
+
+    def is_in_unit_disk(self):
+        '''Boolean mask of the points that are actually in the Poincare Disc.'''
+        return self.euclidean_distance_to_origin() < 1.0
+
+    def distance(self, other):
+        '''Hyperbolic distances between the points and a HyperbolicPoint, or element-wise with another array.'''
+        other = _as_coordinates(other)
+        squared_difference = np.sum((self._coordinates - other)**2, axis=-1)
+        conformal_factors = (1.0 - np.sum(self._coordinates**2, axis=-1)) * (1.0 - np.sum(other**2, axis=-1))
+        return 2.0 * np.arcsinh(np.sqrt(squared_difference / conformal_factors))
+
+    def polar_line(self):
+        '''Returns the polar lines of the points, as a LineArray.'''
+        coefficients = np.empty((len(self), 3))
+        coefficients[:, :2] = 2.0 * self._coordinates
+        coefficients[:, 2] = 1.0 + np.sum(self._coordinates**2, axis=1)
+        return LineArray(coefficients)
+
+    def hyperbolic_circle(self, hyperbolic_radius):
+        '''Returns a CircleArray of hyperbolic circles with the prescribed hyperbolic radii,
+           centered around the current points.'''
+        euclidean_dist_to_center = self.euclidean_distance_to_origin()
+        half_dist_to_center = np.arctanh(euclidean_dist_to_center)
+        dist_to_near_point = np.tanh(half_dist_to_center - 0.5 * hyperbolic_radius)
+        dist_to_far_point = np.tanh(half_dist_to_center + 0.5 * hyperbolic_radius)
+        euclidean_radius = 0.5 * np.abs(dist_to_far_point - dist_to_near_point)
+
+        is_origin = euclidean_dist_to_center == 0.0
+        scale = np.divide(0.5 * (dist_to_far_point + dist_to_near_point), euclidean_dist_to_center,
+                          out=np.zeros_like(euclidean_dist_to_center), where=~is_origin)
+        euclidean_center = self._coordinates * scale[:, np.newaxis]
+        return CircleArray(euclidean_center, euclidean_radius)
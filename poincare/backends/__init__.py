@@ -0,0 +1,66 @@
+'''Rendering backends of the Poincare Disk model. Backends are only imported when first requested,
+   so that the geometry modules can be used without any plotting library installed.'''
+
+import importlib
+
+from .. euclidean import Point
+
+BACKENDS = {'bokeh': ('bokeh_backend', 'BokehBackend'),
+            'svg': ('svg', 'SVGBackend')}
+
+
+class Backend(object):
+    '''Interface of rendering backends. Coordinates are given in the Poincare Disk, and style keyword
+       arguments follow the Bokeh naming, such as line_color, line_width, fill_color and size.'''
+
+    def drawpoint(self, point, **kwargs):
+        '''Draws a Point.'''
+        raise NotImplementedError
+
+    def drawsegment(self, start_point, end_point, **kwargs):
+        '''Draws a straight segment between two Points.'''
+        raise NotImplementedError
+
+    def drawarc(self, center, radius, start_point, end_point, **kwargs):
+        '''Draws the shorter arc of the circle around the center between two Points on it.'''
+        raise NotImplementedError
+
+    def drawcircle(self, center, radius, **kwargs):
+        '''Draws a full circle.'''
+        raise NotImplementedError
+
+    def drawpoints(self, coordinates, **kwargs):
+        '''Draws an (N, 2) array of point coordinates. Backends with columnar glyphs draw them at once.'''
+        for x, y in coordinates.tolist():
+            self.drawpoint(Point(x, y), **kwargs)
+
+    def drawsegments(self, start_coordinates, end_coordinates, **kwargs):
+        '''Draws straight segments between two (N, 2) arrays of coordinates.'''
+        for (x0, y0), (x1, y1) in zip(start_coordinates.tolist(), end_coordinates.tolist()):
+            self.drawsegment(Point(x0, y0), Point(x1, y1), **kwargs)
+
+    def drawarcs(self, centers, radii, start_coordinates, end_coordinates, **kwargs):
+        '''Draws arcs given (N, 2) arrays of centers, start and end coordinates and an (N,) array of radii.'''
+        for (x, y), radius, (x0, y0), (x1, y1) in zip(centers.tolist(), radii.tolist(),
+                                                      start_coordinates.tolist(), end_coordinates.tolist()):
+            self.drawarc(Point(x, y), radius, Point(x0, y0), Point(x1, y1), **kwargs)
+
+    def flush(self):
+        '''Draws anything buffered by the backend.'''
+
+    def show(self):
+        '''Shows the drawing.'''
+        raise NotImplementedError
+
+    def save(self, filename):
+        '''Saves the drawing to a file.'''
+        raise NotImplementedError
+
+
+def get_backend(name):
+    '''Returns the backend class registered under the name, importing its module on first use.'''
+    try:
+        module_name, class_name = BACKENDS[name]
+    except KeyError:
+        raise ValueError('Unknown backend {!r}, available backends are {}.'.format(name, ', '.join(BACKENDS)))
+    return getattr(importlib.import_module('.' + module_name, __name__), class_name)
@@ -0,0 +1,120 @@
+'''Bokeh rendering backend.'''
+
+import json
+import math
+from collections import defaultdict
+
+import numpy as np
+import bokeh.plotting
+import bokeh.models
+
+from . import Backend
+
+
+def _arc_angles(centers, start_points, end_points):
+    '''Returns start and end angles of the arcs around the centers between the start and end points,
+       going the short way around, as (N,) arrays.'''
+    start_angles = np.arctan2(start_points[:, 1] - centers[:, 1], start_points[:, 0] - centers[:, 0])
+    end_angles = np.arctan2(end_points[:, 1] - centers[:, 1], end_points[:, 0] - centers[:, 0])
+    start_angles, end_angles = [np.where(angles > 0, angles, angles + 2*math.pi)
+                                for angles in [start_angles, end_angles]]
+    start_angles, end_angles = np.minimum(start_angles, end_angles), np.maximum(start_angles, end_angles)
+    swap = np.abs(end_angles - start_angles) > math.pi
+    return np.where(swap, end_angles, start_angles), np.where(swap, start_angles, end_angles)
+
+def _style_key(kwargs):
+    '''Hashable key grouping glyphs drawn with the same style keyword arguments, which may hold unhashable values
+       such as the list of a line_dash.'''
+    return json.dumps(kwargs, sort_keys=True, default=repr)
+
+
+class BokehBackend(Backend):
+    '''Draws on a Bokeh figure. In buffered mode, points, arcs and segments are collected into columns and
+       drawn as a single glyph per style when the backend is flushed, shown or saved.'''
+
+    def __init__(self, buffered=False):
+        self._plot = bokeh.plotting.figure(width=600, height=600, min_border=50,
+                                           x_range=(-1, 1), y_range=(-1, 1), tools=['zoom_in', 'zoom_out'])
+        self._plot.toolbar.logo = None
+        self._buffered = buffered
+        self._points, self._segments, self._arcs = defaultdict(list), defaultdict(list), defaultdict(list)
+        self._styles = {}
+
+    @property
+    def plot(self):
+        '''The underlying Bokeh figure.'''
+        return self._plot
+
+    def _buffer(self, buffers, kwargs, row):
+        '''Appends a row to the buffer of its style, remembering the keyword arguments of the style.'''
+        key = _style_key(kwargs)
+        self._styles.setdefault(key, kwargs)
+        buffers[key].append(row)
+
+    def drawpoint(self, point, **kwargs):
+        if self._buffered:
+            self._buffer(self._points, kwargs, (point.x, point.y))
+        else:
+            self._plot.scatter(point.x, point.y, marker='circle', **kwargs)
+
+    def drawsegment(self, start_point, end_point, **kwargs):
+        if self._buffered:
+            self._buffer(self._segments, kwargs, (start_point.x, start_point.y, end_point.x, end_point.y))
+        else:
+            self._plot.line(x=[start_point.x, end_point.x], y=[start_point.y, end_point.y], **kwargs)
+
+    def drawarc(self, center, radius, start_point, end_point, **kwargs):
+        if self._buffered:
+            self._buffer(self._arcs, kwargs, (center.x, center.y, radius,
+                                              start_point.x, start_point.y, end_point.x, end_point.y))
+        else:
+            (start_angle,), (end_angle,) = _arc_angles(np.array([center]), np.array([start_point]),
+                                                       np.array([end_point]))
+            self._plot.arc(x=center.x, y=center.y, radius=radius,
+                           start_angle=start_angle, end_angle=end_angle, **kwargs)
+
+    def drawcircle(self, center, radius, **kwargs):
+        self._plot.arc(x=center.x, y=center.y, radius=radius, start_angle=0.0, end_angle=2.0*math.pi, **kwargs)
+
+    def drawpoints(self, coordinates, **kwargs):
+        if len(coordinates):
+            source = bokeh.models.ColumnDataSource(data=dict(x=coordinates[:, 0], y=coordinates[:, 1]))
+            self._plot.scatter(x='x', y='y', marker='circle', source=source, **kwargs)
+
+    def drawsegments(self, start_coordinates, end_coordinates, **kwargs):
+        if len(start_coordinates):
+            source = bokeh.models.ColumnDataSource(data=dict(x0=start_coordinates[:, 0], y0=start_coordinates[:, 1],
+                                                             x1=end_coordinates[:, 0], y1=end_coordinates[:, 1]))
+            self._plot.segment(x0='x0', y0='y0', x1='x1', y1='y1', source=source, **kwargs)
+
+    def drawarcs(self, centers, radii, start_coordinates, end_coordinates, **kwargs):
+        if len(centers):
+            start_angles, end_angles = _arc_angles(centers, start_coordinates, end_coordinates)
+            source = bokeh.models.ColumnDataSource(data=dict(x=centers[:, 0], y=centers[:, 1], radius=radii,
+                                                             start_angle=start_angles, end_angle=end_angles))
+            self._plot.arc(x='x', y='y', radius='radius', start_angle='start_angle', end_angle='end_angle',
+                           source=source, **kwargs)
+
+    def flush(self):
+        '''Draws all buffered points, segments and arcs, with one glyph per style.'''
+        for key, points in self._points.items():
+            self.drawpoints(np.array(points), **self._styles[key])
+
+        for key, segments in self._segments.items():
+            segments = np.array(segments)
+            self.drawsegments(segments[:, 0:2], segments[:, 2:4], **self._styles[key])
+
+        for key, arcs in self._arcs.items():
+            arcs = np.array(arcs)
+            self.drawarcs(arcs[:, 0:2], arcs[:, 2], arcs[:, 3:5], arcs[:, 5:7], **self._styles[key])
+
+        self._points, self._segments, self._arcs = defaultdict(list), defaultdict(list), defaultdict(list)
+        self._styles = {}
+
+    def show(self):
+        self.flush()
+        bokeh.plotting.show(self._plot)
+
+    def save(self, filename):
+        self.flush()
+        bokeh.plotting.save(obj=self._plot, filename=filename)
@@ -0,0 +1,93 @@
+'''Dependency free SVG rendering backend, streaming every element to a file as it is drawn.'''
+
+import os
+import shutil
+import tempfile
+import webbrowser
+
+from . import Backend
+
+# Bokeh style keyword arguments and the SVG attributes they translate to
+STYLE_ATTRIBUTES = {'line_color': 'stroke', 'line_width': 'stroke-width', 'line_alpha': 'stroke-opacity',
+                    'line_dash': 'stroke-dasharray', 'fill_color': 'fill', 'fill_alpha': 'fill-opacity'}
+
+
+def _attributes(kwargs, default_fill='none'):
+    '''Translates style keyword arguments into a string of SVG attributes.'''
+    attributes = {'stroke': 'black', 'fill': default_fill}
+    for key, value in kwargs.items():
+        if key == 'color':
+            attributes['stroke'] = attributes['fill'] = value
+        elif key == 'alpha':
+            attributes['stroke-opacity'] = attributes['fill-opacity'] = value
+        elif key != 'size':
+            attributes[STYLE_ATTRIBUTES.get(key, key.replace('_', '-'))] = value
+    return ' '.join('{}="{}"'.format(key, value) for key, value in attributes.items())
+
+
+class SVGBackend(Backend):
+    '''Writes an SVG document of the given pixel size. Elements are written to the output as soon as they are drawn,
+       so no figure is kept in memory. The output may be a filename or a text file object; without one, the document
+       is spooled to a temporary file until it is saved.'''
+
+    def __init__(self, output=None, size=600, margin=10):
+        if output is None:
+            self._file, self._owns_file = tempfile.TemporaryFile(mode='w+'), True
+        elif isinstance(output, (str, os.PathLike)):
+            self._file, self._owns_file = open(output, 'w+'), True
+        else:
+            self._file, self._owns_file = output, False
+        self._scale, self._offset, self._closed = (size - 2 * margin) / 2.0, size / 2.0, False
+        self._file.write('<svg xmlns="http://www.w3.org/2000/svg" width="{0}" height="{0}" '
+                         'viewBox="0 0 {0} {0}">\n'.format(size))
+
+    def _transform(self, point):
+        '''Pixel coordinates of a disk Point, with the y axis pointing down.'''
+        return self._offset + self._scale * point.x, self._offset - self._scale * point.y
+
+    def drawpoint(self, point, **kwargs):
+        x, y = self._transform(point)
+        self._file.write('<circle cx="{:.3f}" cy="{:.3f}" r="{}" {}/>\n'.format(
+            x, y, kwargs.get('size', 4) / 2.0, _attributes(kwargs, default_fill='black')))
+
+    def drawsegment(self, start_point, end_point, **kwargs):
+        (x0, y0), (x1, y1) = self._transform(start_point), self._transform(end_point)
+        self._file.write('<line x1="{:.3f}" y1="{:.3f}" x2="{:.3f}" y2="{:.3f}" {}/>\n'.format(
+            x0, y0, x1, y1, _attributes(kwargs)))
+
+    def drawarc(self, center, radius, start_point, end_point, **kwargs):
+        (x0, y0), (x1, y1) = self._transform(start_point), self._transform(end_point)
+        # counter clockwise arcs in the disk become clockwise once the y axis is flipped, which SVG sweeps as 1
+        start, end = start_point - center, end_point - center
+        sweep = int(start.x * end.y > start.y * end.x)
+        self._file.write('<path d="M {:.3f} {:.3f} A {r:.3f} {r:.3f} 0 0 {} {:.3f} {:.3f}" {}/>\n'.format(
+            x0, y0, sweep, x1, y1, _attributes(kwargs), r=radius * self._scale))
+
+    def drawcircle(self, center, radius, **kwargs):
+        x, y = self._transform(center)
+        self._file.write('<circle cx="{:.3f}" cy="{:.3f}" r="{:.3f}" {}/>\n'.format(
+            x, y, radius * self._scale, _attributes(kwargs)))
+
+    def close(self):
+        '''Ends the SVG document.'''
+        if not self._closed:
+            self._file.write('</svg>\n')
+            self._file.flush()
+            self._closed = True
+
+    def save(self, filename=None):
+        '''Ends the document, copying it to the filename if given, and closes any file opened by the backend.'''
+        self.close()
+        if filename is not None:
+            self._file.seek(0)
+            with open(filename, 'w') as output:
+                shutil.copyfileobj(self._file, output)
+        if self._owns_file:
+            self._file.close()
+
+    def show(self):
+        '''Saves the document to a temporary file and opens it in a web browser.'''
+        handle, filename = tempfile.mkstemp(suffix='.svg')
+        os.close(handle)
+        self.save(filename)
+        webbrowser.open('file://' + os.path.abspath(filename))
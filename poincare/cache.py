@@ -0,0 +1,120 @@
+'''Module caching computed geometry on disk, keyed by a hash of the parameters it was computed from.
+
+   Every entry is a single .npy array file named after the SHA-256 of the parameters in canonical JSON, along with
+   the CACHE_VERSION, so that geometry cached by an earlier version of the library is not reused.
+   Entries are touched when read, and the least recently used ones are removed once the cache grows beyond
+   its maximal size. Entries are written to a temporary file and renamed into place, so that processes
+   sharing a cache never see a partial entry.'''
+
+import os
+import json
+import hashlib
+import tempfile
+
+import numpy as np
+
+DEFAULT_MAX_SIZE = 256 * 2**20
+# increase whenever the geometry computed for the same parameters changes, or its array layout does
+CACHE_VERSION = 2
+SUFFIX = '.npy'
+
+
+def default_path():
+    '''Returns $POINCARE_CACHE, or the poincare directory of the user cache directory.'''
+    if os.environ.get('POINCARE_CACHE'):
+        return os.environ['POINCARE_CACHE']
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'poincare')
+
+def cache_key(parameters, version=CACHE_VERSION):
+    '''Returns the hex digest identifying JSON serializable parameters, independent of the order of dict keys,
+       for a version of the cache.'''
+    canonical = json.dumps({'version': version, 'parameters': parameters}, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class GeometryCache(object):
+    '''Least recently used cache of arrays in a directory, holding at most max_size bytes.'''
+
+    def __init__(self, path=None, max_size=DEFAULT_MAX_SIZE):
+        self.path = default_path() if path is None else path
+        self.max_size = max_size
+        os.makedirs(self.path, exist_ok=True)
+
+    def _filename(self, key):
+        return os.path.join(self.path, key + SUFFIX)
+
+    def _entries(self):
+        '''Returns (last use, size, filename) of every entry.'''
+        entries = []
+        for entry in os.scandir(self.path):
+            if entry.name.endswith(SUFFIX) and not entry.name.startswith('.'):
+                try:
+                    status = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((status.st_mtime, status.st_size, entry.path))
+        return entries
+
+    def __len__(self):
+        return len(self._entries())
+
+    def __contains__(self, parameters):
+        return os.path.exists(self._filename(cache_key(parameters)))
+
+    def size(self):
+        '''Returns the total size of the entries in bytes.'''
+        return sum(size for _, size, _ in self._entries())
+
+    def get(self, parameters):
+        '''Returns the array cached for the parameters, memory mapped read only, or None.'''
+        filename = self._filename(cache_key(parameters))
+        try:
+            os.utime(filename)
+            return np.load(filename, mmap_mode='r')
+        except FileNotFoundError:
+            return None
+
+    def put(self, parameters, array):
+        '''Stores an array for the parameters, then evicts the least recently used other entries if needed.'''
+        filename = self._filename(cache_key(parameters))
+        handle, temporary = tempfile.mkstemp(suffix=SUFFIX, prefix='.', dir=self.path)
+        try:
+            with os.fdopen(handle, 'wb') as temporary_file:
+                np.save(temporary_file, np.ascontiguousarray(array))
+            os.replace(temporary, filename)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        self.evict(keep=filename)
+
+    def array(self, parameters, compute):
+        '''Returns the array cached for the parameters, calling compute() and caching its result on a miss.'''
+        array = self.get(parameters)
+        if array is None:
+            array = compute()
+            self.put(parameters, array)
+        return array
+
+    def evict(self, keep=None):
+        '''Removes the least recently used entries, other than the file named keep, until the cache fits.'''
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, filename in entries:
+            if total <= self.max_size:
+                break
+            if filename == keep:
+                continue
+            try:
+                os.unlink(filename)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        '''Removes every entry.'''
+        for _, _, filename in self._entries():
+            try:
+                os.unlink(filename)
+            except FileNotFoundError:
+                pass
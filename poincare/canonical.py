@@ -0,0 +1,158 @@
+'''Module canonicalizing points and hyperbolic lines up to a tolerance.
+   The same vertex or edge is usually constructed along several paths, with slightly different coordinates,
+   so that exact equality of the underlying namedtuples does not recognize them as equal.'''
+
+import math
+import itertools
+
+DEFAULT_TOLERANCE = 1e-9
+
+
+class _ToleranceSet(object):
+    '''Base class of sets whose items are equal if they are within a tolerance of each other.
+       The first item inserted is kept as the canonical representative of all items equal to it.
+       Subclasses implement find, canonical, discard and _empty.'''
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item):
+        return self.find(item) is not None
+
+    def __repr__(self):
+        return '{}({!r}, tolerance={!r})'.format(type(self).__name__, list(self), self.tolerance)
+
+    def add(self, item):
+        '''Inserts an item, unless an equal item is already in the set.'''
+        self.canonical(item)
+
+    def update(self, items):
+        '''Inserts all items.'''
+        for item in items:
+            self.canonical(item)
+
+    def copy(self):
+        '''Returns a new set with the same representatives and tolerance.'''
+        result = self._empty()
+        result.update(self)
+        return result
+
+    def union(self, other):
+        '''Returns a new set of the items in either set, keeping the representatives of the current set.'''
+        result = self.copy()
+        result.update(other)
+        return result
+
+    def intersection(self, other):
+        '''Returns a new set of the items of the current set equal to an item of the other one.'''
+        result = self._empty()
+        result.update(item for item in self if item in other)
+        return result
+
+    def difference(self, other):
+        '''Returns a new set of the items of the current set not equal to any item of the other one.'''
+        result = self._empty()
+        result.update(item for item in self if item not in other)
+        return result
+
+    def issubset(self, other):
+        '''Returns if every item of the current set is equal to an item of the other one.'''
+        return all(item in other for item in self)
+
+    __or__, __and__, __sub__, __le__ = union, intersection, difference, issubset
+
+
+class PointSet(_ToleranceSet):
+    '''Set of Points in which points closer than the tolerance are the same point.
+       Points are hashed on their coordinates quantized to the tolerance, and a lookup checks the neighbouring
+       cells as well, so that points on either side of a cell boundary are found.'''
+
+    def __init__(self, points=(), tolerance=DEFAULT_TOLERANCE):
+        '''Constructs the set from the given points.'''
+        if tolerance <= 0:
+            raise ValueError('Tolerance must be positive.')
+        self.tolerance = tolerance
+        self._cells = {}
+        self._items = {}
+        self.update(points)
+
+    def _empty(self):
+        return PointSet(tolerance=self.tolerance)
+
+    def _cell(self, point):
+        return (math.floor(point.x / self.tolerance), math.floor(point.y / self.tolerance))
+
+    def find(self, point):
+        '''Returns the representative of the point, or None if no point in the set is equal to it.'''
+        cell_x, cell_y = self._cell(point)
+        for dx, dy in itertools.product((0, -1, 1), repeat=2):
+            for candidate in self._cells.get((cell_x + dx, cell_y + dy), ()):
+                if math.hypot(candidate.x - point.x, candidate.y - point.y) <= self.tolerance:
+                    return candidate
+        return None
+
+    def canonical(self, point):
+        '''Returns the representative of the point, inserting the point as its own representative if it is new.'''
+        representative = self.find(point)
+        if representative is None:
+            self._cells.setdefault(self._cell(point), []).append(point)
+            self._items[point] = None
+            representative = point
+        return representative
+
+    def discard(self, point):
+        '''Removes the representative of the point, if any.'''
+        representative = self.find(point)
+        if representative is not None:
+            cell = self._cell(representative)
+            self._cells[cell].remove(representative)
+            if not self._cells[cell]:
+                del self._cells[cell]
+            del self._items[representative]
+
+
+class LineSet(_ToleranceSet):
+    '''Set of HyperbolicLines in which lines with equal end points, in either order, are the same line.
+       If 'geodesics' is set, lines on the same complete geodesic are the same line, compared by their ideal points
+       rather than by the centres of their circles, which are unbounded for lines close to a diameter.
+       The points are canonicalized in a PointSet, available as 'vertices', so lines are keyed on their
+       representatives.'''
+
+    def __init__(self, lines=(), tolerance=DEFAULT_TOLERANCE, geodesics=False):
+        '''Constructs the set from the given lines.'''
+        self.tolerance, self.geodesics = tolerance, geodesics
+        self.vertices = PointSet(tolerance=tolerance)
+        self._keys = {}
+        self._items = {}
+        self.update(lines)
+
+    def _empty(self):
+        return LineSet(tolerance=self.tolerance, geodesics=self.geodesics)
+
+    def _points(self, line):
+        return line.ideal_points if self.geodesics else line.end_points
+
+    def find(self, line):
+        '''Returns the representative of the line, or None if no line in the set is equal to it.'''
+        representatives = [self.vertices.find(point) for point in self._points(line)]
+        if None in representatives:
+            return None
+        return self._keys.get(frozenset(representatives))
+
+    def canonical(self, line):
+        '''Returns the representative of the line, inserting the line as its own representative if it is new.'''
+        key = frozenset(self.vertices.canonical(point) for point in self._points(line))
+        if key not in self._keys:
+            self._keys[key] = line
+            self._items[line] = None
+        return self._keys[key]
+
+    def discard(self, line):
+        '''Removes the representative of the line, if any. Its points stay in vertices.'''
+        representative = self.find(line)
+        if representative is not None:
+            del self._keys[frozenset(self.vertices.find(point) for point in self._points(representative))]
+            del self._items[representative]
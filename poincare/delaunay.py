@@ -0,0 +1,329 @@
+'''Module computing hyperbolic Delaunay triangulations and their dual Voronoi diagrams.
+
+   Hyperbolic circles of the Poincare Disk are the Euclidean circles inside the disk, so the hyperbolic Delaunay
+   triangulation of a set of points is the part of the Euclidean Delaunay triangulation of their disk coordinates
+   with an empty circle inside the disk. In the Klein model the same diagram is a Euclidean power diagram.
+   The Euclidean triangulation is built incrementally in Hilbert curve order, which keeps every insertion local
+   and the whole construction O(n log n) in practice, and the hyperbolic part is then selected at once.'''
+
+import math
+
+import numpy as np
+
+from . hyperbolic import HyperbolicLine, HyperbolicPoint
+from . arrays import HyperbolicPointArray, _coordinate_array
+from . polygon import HyperbolicPolygon
+
+# corners of a triangle around the unit disk, with an inscribed circle of radius 2
+SUPER_TRIANGLE = ((4.0, 0.0), (-2.0, 2.0 * math.sqrt(3.0)), (-2.0, -2.0 * math.sqrt(3.0)))
+
+
+def _hilbert_order(coordinates, bits=16):
+    '''Returns the permutation sorting (N, 2) coordinates along a Hilbert curve over their bounding box.'''
+    side = 2**bits
+    lower = coordinates.min(axis=0)
+    span = max(float(np.max(coordinates.max(axis=0) - lower)), 1e-300)
+    x, y = ((coordinates - lower) / span * (side - 1)).astype(np.int64).T
+    distance = np.zeros(len(coordinates), dtype=np.int64)
+    s = side // 2
+    while s > 0:
+        rx, ry = (x & s) > 0, (y & s) > 0
+        distance += s * s * ((3 * rx) ^ ry)
+        flip = ~ry & rx
+        x, y = np.where(flip, side - 1 - x, x), np.where(flip, side - 1 - y, y)
+        x, y = np.where(ry, x, y), np.where(ry, y, x)
+        s //= 2
+    return np.argsort(distance, kind='stable')
+
+def _euclidean_delaunay(coordinates, order):
+    '''Bowyer-Watson triangulation of distinct points inside the unit disk, inserted in the given order, together
+       with the three corners of SUPER_TRIANGLE, numbered N, N + 1 and N + 2.
+       Returns the (T, 3) counter clockwise triangles and the (T, 3) triangles opposite each of their corners.'''
+    n = len(coordinates)
+    xs = coordinates[:, 0].tolist() + [corner[0] for corner in SUPER_TRIANGLE]
+    ys = coordinates[:, 1].tolist() + [corner[1] for corner in SUPER_TRIANGLE]
+    vertices, neighbors = [n, n + 1, n + 2], [-1, -1, -1]
+    # circumcircles as center x, center y and squared radius
+    circles = [(0.0, 0.0, 16.0)]
+    alive = [True]
+    edges_of = ((0, 1, 2), (1, 2, 0), (2, 0, 1))
+    last = 0
+
+    for i in order.tolist():
+        px, py = xs[i], ys[i]
+
+        # walk towards the point from the last triangle created
+        t = last
+        while True:
+            a, b, c = vertices[3*t:3*t + 3]
+            if (xs[c] - xs[b]) * (py - ys[b]) < (ys[c] - ys[b]) * (px - xs[b]):
+                t = neighbors[3*t]
+            elif (xs[a] - xs[c]) * (py - ys[c]) < (ys[a] - ys[c]) * (px - xs[c]):
+                t = neighbors[3*t + 1]
+            elif (xs[b] - xs[a]) * (py - ys[a]) < (ys[b] - ys[a]) * (px - xs[a]):
+                t = neighbors[3*t + 2]
+            else:
+                break
+
+        # remove the triangles whose circumcircle contains the point, collecting the edges around the cavity.
+        # Edges the point does not strictly see are crossed as well, keeping the cavity star shaped.
+        alive[t] = False
+        stack, boundary = [t], []
+        while stack:
+            u = stack.pop()
+            for k, k1, k2 in edges_of:
+                o = neighbors[3*u + k]
+                if o >= 0:
+                    if not alive[o]:
+                        continue
+                    a, b = vertices[3*u + k1], vertices[3*u + k2]
+                    center_x, center_y, squared_radius = circles[o]
+                    if (center_x - px)**2 + (center_y - py)**2 < squared_radius or \
+                            (xs[b] - xs[a]) * (py - ys[a]) <= (ys[b] - ys[a]) * (px - xs[a]):
+                        alive[o] = False
+                        stack.append(o)
+                        continue
+                else:
+                    a, b = vertices[3*u + k1], vertices[3*u + k2]
+                boundary.append((a, b, o, u))
+
+        # fan the cavity from the point
+        first = len(alive)
+        starting, ending = {}, {}
+        new = first
+        for a, b, o, u in boundary:
+            vertices += (i, a, b)
+            neighbors += (o, -1, -1)
+            bx, by, cx, cy = xs[a] - px, ys[a] - py, xs[b] - px, ys[b] - py
+            d = 2.0 * (bx * cy - by * cx)
+            if d == 0.0:
+                circles.append((px, py, math.inf))
+            else:
+                b2, c2 = bx * bx + by * by, cx * cx + cy * cy
+                ux, uy = (cy * b2 - by * c2) / d, (bx * c2 - cx * b2) / d
+                circles.append((px + ux, py + uy, ux * ux + uy * uy))
+            alive.append(True)
+            starting[a] = ending[b] = new
+            if o >= 0:
+                neighbors[3*o + neighbors[3*o:3*o + 3].index(u)] = new
+            new += 1
+        for new, (a, b, o, u) in enumerate(boundary, first):
+            neighbors[3*new + 1] = starting[b]
+            neighbors[3*new + 2] = ending[a]
+        last = first
+
+    alive = np.array(alive)
+    renumbered = np.full(len(alive) + 1, -1, dtype=np.intp)
+    renumbered[:-1][alive] = np.arange(np.count_nonzero(alive))
+    triangles = np.array(vertices, dtype=np.intp).reshape(-1, 3)[alive]
+    neighbors = renumbered[np.array(neighbors, dtype=np.intp).reshape(-1, 3)[alive]]
+    return triangles, neighbors
+
+def _circumcircles(corners):
+    '''Euclidean circumcenters and radii of (T, 3, 2) triangle corners.'''
+    b, c = corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0]
+    d = 2.0 * (b[:, 0] * c[:, 1] - b[:, 1] * c[:, 0])
+    b2, c2 = np.sum(b**2, axis=1), np.sum(c**2, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        offsets = np.stack([c[:, 1] * b2 - b[:, 1] * c2, b[:, 0] * c2 - c[:, 0] * b2], axis=1) / d[:, np.newaxis]
+    return corners[:, 0] + offsets, np.hypot(offsets[:, 0], offsets[:, 1])
+
+def _hyperbolic_centers(centers, radii):
+    '''Hyperbolic centers of Euclidean circles inside the disk, which lie on the diameter through their
+       Euclidean centers, halfway between the nearest and the farthest points of the circles.'''
+    norms = np.hypot(centers[:, 0], centers[:, 1])
+    signed = np.tanh(0.5 * (np.arctanh(norms - radii) + np.arctanh(norms + radii)))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        directions = np.where(norms[:, np.newaxis] > 0.0, centers / norms[:, np.newaxis], 0.0)
+    return directions * signed[:, np.newaxis]
+
+def _to_origin(points, anchors):
+    '''Mobius translations z -> (z - a) / (1 - conj(a) z) of complex points, moving the anchors to the origin.'''
+    return (points - anchors) / (1.0 - np.conj(anchors) * points)
+
+def _from_origin(points, anchors):
+    return (points + anchors) / (1.0 + np.conj(anchors) * points)
+
+def _bisector_ideal_points(p, q):
+    '''Ideal points of the perpendicular bisectors of complex points p and q, on the left and on the right of the
+       direction from p to q. With p moved to the origin, the bisector crosses the diameter towards q at right
+       angles, at the hyperbolic midpoint m, and ends at angles acos(2 |m| / (1 + |m|^2)) on either side.'''
+    moved = _to_origin(q, p)
+    norms = np.abs(moved)
+    midpoints = norms / (1.0 + np.sqrt(1.0 - norms**2))
+    angles = np.arccos(2.0 * midpoints / (1.0 + midpoints**2))
+    directions = moved / norms
+    return _from_origin(directions * np.exp(1j * angles), p), _from_origin(directions * np.exp(-1j * angles), p)
+
+def _csr(rows, columns, row_count):
+    '''Sorts (row, column) pairs into compressed sparse row arrays (indptr, indices).'''
+    order = np.lexsort((columns, rows))
+    indptr = np.zeros(row_count + 1, dtype=np.intp)
+    np.cumsum(np.bincount(rows, minlength=row_count), out=indptr[1:])
+    return indptr, columns[order]
+
+
+class DelaunayTriangulation(object):
+    '''Hyperbolic Delaunay triangulation of points of the Poincare Disk: the triangles and edges having an empty
+       hyperbolic circle through their corners. Repeated points are only triangulated once, at their first index.
+
+       triangles  - (T, 3) point indices of the triangles, counter clockwise
+       neighbors  - (T, 3) indices of the triangles across the edges opposite each corner, -1 for none
+       edges      - (E, 2) point indices of the edges
+       edge_triangles - (E, 2) triangles on the left and on the right of every edge, -1 for none'''
+
+    def __init__(self, points):
+        '''Triangulates a Point, an iterable of Points, a HyperbolicPointArray or an (N, 2) array of points.'''
+        coordinates = _coordinate_array(points)
+        if not np.all(np.sum(coordinates**2, axis=1) < 1.0):
+            raise ValueError('Points must be inside the unit disk.')
+        self.points = HyperbolicPointArray(coordinates)
+        n = len(coordinates)
+
+        _, first_indices = np.unique(coordinates, axis=0, return_index=True)
+        if n == 0:
+            triangles, neighbors = np.empty((0, 3), dtype=np.intp), np.empty((0, 3), dtype=np.intp)
+        else:
+            triangles, neighbors = _euclidean_delaunay(coordinates, first_indices[_hilbert_order(
+                coordinates[first_indices])])
+        all_coordinates = np.concatenate([coordinates, SUPER_TRIANGLE])
+        centers, radii = _circumcircles(all_coordinates[triangles])
+
+        # every Euclidean edge once, with the triangles on its left and on its right
+        real = np.all(triangles < n, axis=1)
+        slots = np.argwhere((neighbors < 0) | (np.arange(len(triangles))[:, np.newaxis] < neighbors))
+        left, corner = slots[:, 0], slots[:, 1]
+        right = neighbors[left, corner]
+        edges = np.stack([triangles[left, (corner + 1) % 3], triangles[left, (corner + 2) % 3]], axis=1)
+        real_edges = np.all(edges < n, axis=1)
+        edges, left, right = edges[real_edges], left[real_edges], right[real_edges]
+
+        # an edge is hyperbolic if some circle through its ends, centered on its bisector between the centers
+        # of the circumcircles on either side, lies inside the disk, where |center| + radius < 1
+        p, q = coordinates[edges[:, 0]], coordinates[edges[:, 1]]
+        half_lengths = 0.5 * np.hypot(*(q - p).T)
+        along = (q - p) / (2.0 * half_lengths[:, np.newaxis])
+        normals = np.stack([-along[:, 1], along[:, 0]], axis=1)
+        midpoints = 0.5 * (p + q)
+        origin_along, origin_normal = np.sum(-midpoints * along, axis=1), np.sum(-midpoints * normals, axis=1)
+        lower = np.where(right >= 0, np.sum((centers[right] - midpoints) * normals, axis=1), -np.inf)
+        upper = np.sum((centers[left] - midpoints) * normals, axis=1)
+        # the sum of the distances to the origin and to an end is smallest where the bisector meets the segment
+        # from the origin to the end on the other side of it
+        best = np.clip(origin_normal * half_lengths / (np.abs(origin_along) + half_lengths),
+                       np.minimum(lower, upper), np.maximum(lower, upper))
+        edge_reach = np.hypot(origin_along, best - origin_normal) + np.hypot(half_lengths, best)
+
+        hyperbolic_triangles = real & (np.hypot(centers[:, 0], centers[:, 1]) + radii < 1.0)
+        hyperbolic_edges = (edge_reach < 1.0) | hyperbolic_triangles[left] | \
+            np.where(right >= 0, hyperbolic_triangles[right], False)
+
+        renumbered = np.full(len(triangles) + 1, -1, dtype=np.intp)
+        renumbered[:-1][hyperbolic_triangles] = np.arange(np.count_nonzero(hyperbolic_triangles))
+        self.triangles = triangles[hyperbolic_triangles]
+        self.neighbors = renumbered[neighbors[hyperbolic_triangles]]
+        self.edges = edges[hyperbolic_edges]
+        self.edge_triangles = renumbered[np.stack([left, right], axis=1)[hyperbolic_edges]]
+        self._circumcircles = centers[hyperbolic_triangles], radii[hyperbolic_triangles]
+
+    def __len__(self):
+        return len(self.triangles)
+
+    def edge_lines(self):
+        '''Returns the edges as a list of HyperbolicLines.'''
+        coordinates = self.points.coordinates
+        return [HyperbolicLine(HyperbolicPoint(x0, y0), HyperbolicPoint(x1, y1))
+                for (x0, y0), (x1, y1) in zip(coordinates[self.edges[:, 0]].tolist(),
+                                              coordinates[self.edges[:, 1]].tolist())]
+
+    def polygons(self):
+        '''Returns the triangles as a list of HyperbolicPolygons.'''
+        coordinates = self.points.coordinates
+        return [HyperbolicPolygon([HyperbolicPoint(x, y) for x, y in corners])
+                for corners in coordinates[self.triangles].tolist()]
+
+    def point_neighbors(self):
+        '''Returns the points joined to every point by an edge, as compressed sparse row arrays (indptr, indices):
+           the neighbors of point i are indices[indptr[i]:indptr[i + 1]], in increasing order.'''
+        rows = np.concatenate([self.edges[:, 0], self.edges[:, 1]])
+        columns = np.concatenate([self.edges[:, 1], self.edges[:, 0]])
+        return _csr(rows, columns, len(self.points))
+
+    def circumcenters(self):
+        '''Returns the hyperbolic centers of the circumcircles of the triangles, as a HyperbolicPointArray.'''
+        return HyperbolicPointArray(_hyperbolic_centers(*self._circumcircles))
+
+    def voronoi(self, ray_length=10.0):
+        '''Returns the dual VoronoiDiagram.'''
+        return VoronoiDiagram(self, ray_length)
+
+
+class VoronoiDiagram(object):
+    '''Hyperbolic Voronoi diagram of points of the Poincare Disk, dual to their DelaunayTriangulation.
+
+       vertices       - HyperbolicPointArray of the vertices, the circumcenters of the Delaunay triangles
+       ridge_points   - (E, 2) indices of the two points every ridge separates, the Delaunay edges
+       ridge_vertices - (E, 2) vertices at the ends of the ridges, -1 where a ridge runs to the boundary
+       ideal_points   - (E, 2, 2) coordinates of the ends of the ridges on the boundary, NaN at vertices
+       bounded        - (N,) boolean mask of the points with a bounded cell'''
+
+    def __init__(self, triangulation, ray_length=10.0):
+        '''Constructs the diagram of a DelaunayTriangulation. Ridges running to the boundary are drawn as lines
+           ending ray_length away from their vertex, or from the midpoint of their points if they have none.'''
+        self.triangulation, self.ray_length = triangulation, ray_length
+        self.vertices = triangulation.circumcenters()
+        self.ridge_points = triangulation.edges
+        # the left triangle of an edge ends the ridge on the left of the edge, which is its second end
+        self.ridge_vertices = triangulation.edge_triangles[:, ::-1].copy()
+
+        z = triangulation.points.to_complex()
+        left_ideal, right_ideal = _bisector_ideal_points(z[self.ridge_points[:, 0]], z[self.ridge_points[:, 1]])
+        ideal = np.stack([right_ideal, left_ideal], axis=1)
+        ideal[self.ridge_vertices >= 0] = complex(np.nan, np.nan)
+        self.ideal_points = np.stack([ideal.real, ideal.imag], axis=2)
+
+        open_ridges = np.any(self.ridge_vertices < 0, axis=1)
+        degrees = np.bincount(self.ridge_points.ravel(), minlength=len(z))
+        unbounded = np.bincount(self.ridge_points[open_ridges].ravel(), minlength=len(z))
+        self.bounded = (degrees > 0) & (unbounded == 0)
+
+    def regions(self):
+        '''Returns the vertices around every point, counter clockwise, as compressed sparse row arrays
+           (indptr, indices): the vertices of the cell of point i are indices[indptr[i]:indptr[i + 1]].'''
+        triangles = self.triangulation.triangles
+        coordinates = self.triangulation.points.coordinates
+        rows = triangles.ravel()
+        columns = np.repeat(np.arange(len(triangles)), 3)
+        centroids = np.mean(coordinates[triangles], axis=1)[columns] - coordinates[rows]
+        order = np.lexsort((np.arctan2(centroids[:, 1], centroids[:, 0]), rows))
+        indptr = np.zeros(len(coordinates) + 1, dtype=np.intp)
+        np.cumsum(np.bincount(rows, minlength=len(coordinates)), out=indptr[1:])
+        return indptr, columns[order]
+
+    def cells(self):
+        '''Returns the cells as a list holding a HyperbolicPolygon for every bounded cell, and None for the others.'''
+        indptr, indices = self.regions()
+        vertices = self.vertices.coordinates
+        return [HyperbolicPolygon([HyperbolicPoint(x, y) for x, y in vertices[indices[start:end]].tolist()])
+                if bounded else None
+                for start, end, bounded in zip(indptr[:-1].tolist(), indptr[1:].tolist(), self.bounded.tolist())]
+
+    def ridge_lines(self):
+        '''Returns the ridges as a list of HyperbolicLines, from the right to the left of the points they separate
+           in ridge_points. Ends on the boundary are moved in along the ridge, to ray_length from the other end
+           if it is a vertex, or from the midpoint of the two points.'''
+        z = self.triangulation.points.to_complex()
+        p, q = z[self.ridge_points[:, 0]], z[self.ridge_points[:, 1]]
+        moved = _to_origin(q, p)
+        midpoints = _from_origin(moved / (1.0 + np.sqrt(1.0 - np.abs(moved)**2)), p)
+
+        # the -1 of ends on the boundary picks the NaN appended to the vertices
+        ends = np.append(self.vertices.to_complex(), np.nan)[self.ridge_vertices]
+        ideal = self.ideal_points[:, :, 0] + 1j * self.ideal_points[:, :, 1]
+        anchors = np.where(np.isnan(ends[:, ::-1]), midpoints[:, np.newaxis], ends[:, ::-1])
+        with np.errstate(invalid='ignore'):
+            towards = _to_origin(ideal, anchors)
+            clipped = _from_origin(math.tanh(self.ray_length / 2.0) * towards / np.abs(towards), anchors)
+        ends = np.where(np.isnan(ends), clipped, ends)
+        return [HyperbolicLine(HyperbolicPoint(a.real, a.imag), HyperbolicPoint(b.real, b.imag))
+                for a, b in ends.tolist()]
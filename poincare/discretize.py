@@ -0,0 +1,150 @@
+'''Module converting geodesics, circles and polygons into polylines, for consumers which cannot draw arcs.
+
+   Polylines are returned as flat (P, 2) coordinate arrays with (C + 1,) offsets, polyline i being
+   coordinates[offsets[i]:offsets[i + 1]]. Arcs are sampled with as few points as keep every chord within
+   max_error of the arc, in the Euclidean units of the disk, so that large and nearly straight arcs get few points.'''
+
+import math
+from collections import namedtuple, OrderedDict
+
+import numpy as np
+
+from . euclidean import Circle
+from . arrays import CircleArray
+
+DEFAULT_MAX_ERROR = 1e-3
+
+
+class Polylines(namedtuple('Polylines', 'coordinates offsets')):
+    '''Polylines stored as a flat (P, 2) coordinate array and (C + 1,) offsets into it.'''
+
+    def polyline(self, index):
+        '''Returns the (n, 2) coordinates of a single polyline.'''
+        return self.coordinates[self.offsets[index]:self.offsets[index + 1]]
+
+    def polyline_count(self):
+        return len(self.offsets) - 1
+
+
+class PolylineCache(object):
+    '''Least recently used cache of geodesic polylines, keyed on the end points of the geodesic and the maximal
+       error, so that equal lines constructed separately share their polyline.'''
+
+    def __init__(self, maxsize=65536):
+        self.maxsize = maxsize
+        self._polylines = OrderedDict()
+
+    def __len__(self):
+        return len(self._polylines)
+
+    def get(self, key):
+        '''Returns the cached polyline, or None.'''
+        polyline = self._polylines.get(key)
+        if polyline is not None:
+            self._polylines.move_to_end(key)
+        return polyline
+
+    def put(self, key, polyline):
+        self._polylines[key] = polyline
+        self._polylines.move_to_end(key)
+        while len(self._polylines) > self.maxsize:
+            self._polylines.popitem(last=False)
+
+    def clear(self):
+        self._polylines.clear()
+
+DEFAULT_CACHE = PolylineCache()
+
+
+def _offsets(counts):
+    return np.concatenate([[0], np.cumsum(counts)]).astype(np.intp)
+
+def _sample(centers, radii, start_angles, sweeps, max_error):
+    '''Samples arcs evenly, each with the fewest segments whose sagitta r (1 - cos(step / 2)) is at most max_error.
+       Arcs with an infinite radius are left with a single segment. Returns the polylines with NaN coordinates,
+       for the caller to fill in exactly where it knows better, and the curve and step of every sample.'''
+    with np.errstate(invalid='ignore', divide='ignore'):
+        max_steps = 2.0 * np.arccos(np.clip(1.0 - max_error / radii, -1.0, 1.0))
+        counts = np.where(np.isinf(radii), 1, np.maximum(1, np.ceil(np.abs(sweeps) / max_steps))).astype(np.intp)
+    offsets = _offsets(counts + 1)
+    curves = np.repeat(np.arange(len(counts)), counts + 1)
+    fractions = (np.arange(offsets[-1]) - offsets[curves]) / counts[curves]
+
+    coordinates = np.full((offsets[-1], 2), np.nan)
+    arc_samples = np.isfinite(radii[curves])
+    angles = start_angles[curves[arc_samples]] + sweeps[curves[arc_samples]] * fractions[arc_samples]
+    arc_radii = radii[curves[arc_samples]]
+    coordinates[arc_samples] = centers[curves[arc_samples]] + \
+        arc_radii[:, np.newaxis] * np.stack([np.cos(angles), np.sin(angles)], axis=1)
+    return Polylines(coordinates, offsets), curves, fractions
+
+def _discretize_lines(lines, max_error):
+    '''Vectorized polylines of HyperbolicLines, starting and ending exactly at their end points.'''
+    starts = np.array([line.end_points[0] for line in lines], dtype=np.float64).reshape(-1, 2)
+    ends = np.array([line.end_points[1] for line in lines], dtype=np.float64).reshape(-1, 2)
+    centers, radii = np.zeros((len(lines), 2)), np.full(len(lines), np.inf)
+    for index, line in enumerate(lines):
+        if not line.is_a_straight_line:
+            circle = line.representation()
+            centers[index], radii[index] = circle.center, circle.radius
+
+    start_angles = np.arctan2(starts[:, 1] - centers[:, 1], starts[:, 0] - centers[:, 0])
+    sweeps = np.arctan2(ends[:, 1] - centers[:, 1], ends[:, 0] - centers[:, 0]) - start_angles
+    sweeps = (sweeps + math.pi) % (2.0 * math.pi) - math.pi
+    polylines, curves, fractions = _sample(centers, radii, start_angles, sweeps, max_error)
+
+    straight_samples = np.isinf(radii[curves])
+    polylines.coordinates[straight_samples] = starts[curves[straight_samples]] + fractions[straight_samples, None] * \
+        (ends - starts)[curves[straight_samples]]
+    polylines.coordinates[polylines.offsets[:-1]] = starts
+    polylines.coordinates[polylines.offsets[1:] - 1] = ends
+    return polylines
+
+def discretize_lines(lines, max_error=DEFAULT_MAX_ERROR, cache=DEFAULT_CACHE):
+    '''Returns Polylines of HyperbolicLines, from their first to their second end point.
+       Polylines of lines seen before are taken from the cache, and only the others are computed, at once.
+       Pass cache=None to skip the cache.'''
+    lines = list(lines)
+    if cache is None:
+        return _discretize_lines(lines, max_error)
+
+    keys = [(line.end_points, max_error) for line in lines]
+    pieces = [cache.get(key) for key in keys]
+    missing = [index for index, piece in enumerate(pieces) if piece is None]
+    if missing:
+        computed = _discretize_lines([lines[index] for index in missing], max_error)
+        for position, index in enumerate(missing):
+            # copied, so that cached polylines do not keep the whole batch alive
+            pieces[index] = computed.polyline(position).copy()
+            cache.put(keys[index], pieces[index])
+
+    coordinates = np.concatenate(pieces) if pieces else np.empty((0, 2))
+    return Polylines(coordinates, _offsets([len(piece) for piece in pieces]))
+
+def discretize_circles(circles, max_error=DEFAULT_MAX_ERROR):
+    '''Returns closed Polylines of Circles or of a CircleArray, such as HyperbolicPoint.hyperbolic_circle returns.
+       Every polyline starts and ends at the rightmost point of its circle.'''
+    if isinstance(circles, Circle):
+        circles = [circles]
+    if not isinstance(circles, CircleArray):
+        circles = CircleArray.from_circles(circles)
+    radii = np.array(circles.radii, dtype=np.float64)
+    polylines, _, _ = _sample(circles.centers, radii, np.zeros(len(radii)), np.full(len(radii), 2.0 * math.pi),
+                              max_error)
+    polylines.coordinates[polylines.offsets[1:] - 1] = polylines.coordinates[polylines.offsets[:-1]]
+    return polylines
+
+def discretize_polygons(polygons, max_error=DEFAULT_MAX_ERROR, cache=DEFAULT_CACHE):
+    '''Returns closed Polylines of the boundaries of HyperbolicPolygons, starting and ending at their first vertex.'''
+    polygons = list(polygons)
+    edges = discretize_lines([edge for polygon in polygons for edge in polygon.edges()], max_error, cache)
+    # every edge after the first of a polygon starts at the end of the previous one
+    keep = np.ones(len(edges.coordinates), dtype=bool)
+    edge_counts = [len(polygon) for polygon in polygons]
+    first_edges = _offsets(edge_counts)[:-1]
+    repeated_starts = np.delete(edges.offsets[:-1], first_edges)
+    keep[repeated_starts] = False
+
+    lengths = np.diff(edges.offsets) - 1
+    point_counts = np.add.reduceat(lengths, first_edges) + 1 if polygons else np.zeros(0, dtype=np.intp)
+    return Polylines(edges.coordinates[keep], _offsets(point_counts))
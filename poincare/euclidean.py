@@ -1,7 +1,10 @@
 '''Module containing Euclidean constructions, Poine, Line and Circle.'''
 
 import math
+import decimal
+import itertools
 from numbers import Real
+from fractions import Fraction
 from collections import namedtuple
 
 class Point(namedtuple('Point', 'x y')):
@@ -24,22 +27,26 @@ class Point(namedtuple('Point', 'x y')):
 
     def rotated_point(self, anchor, angle):
         '''Return the point's location after rotation by the angle around an anchor point.'''
-        difference = self - anchor
-        rotated = Point(difference.x * math.cos(angle) - difference.y * math.sin(angle) + anchor.x,
-                        difference.x * math.sin(angle) + difference.y * math.cos(angle) + anchor.y)
-        return rotated
+        cosine, sine = math.cos(angle), math.sin(angle)
+        dx, dy = self.x - anchor.x, self.y - anchor.y
+        return _make_point(Point, dx * cosine - dy * sine + anchor.x, dx * sine + dy * cosine + anchor.y)
+
+    def __complex__(self):
+        return complex(self.x, self.y)
 
     def __add__(self, other):
-        return type(self)(self.x + other.x, self.y + other.y)
+        return _make_point(type(self), self.x + other.x, self.y + other.y)
 
     def __sub__(self, other):
-        return type(self)(self.x - other.x, self.y - other.y)
+        return _make_point(type(self), self.x - other.x, self.y - other.y)
 
     def __mul__(self, other):
-        if isinstance(other, type(self)):
+        if type(other) is float or type(other) is int:
+            return _make_point(type(self), self.x * other, self.y * other)
+        elif isinstance(other, type(self)):
             return self.x * other.x + self.y * other.y
         elif isinstance(other, Real):
-            return type(self)(self.x * other, self.y * other)
+            return _make_point(type(self), self.x * other, self.y * other)
         else:
             raise NotImplementedError
 
@@ -48,10 +55,14 @@ class Point(namedtuple('Point', 'x y')):
 
     def __truediv__(self, other):
         if isinstance(other, Real):
-            return type(self)(self.x / other, self.y / other)
+            return _make_point(type(self), self.x / other, self.y / other)
         else:
             raise NotImplementedError
 
+def _make_point(cls, x, y):
+    '''Builds a Point, or an instance of a subclass, from two coordinates without the argument checks of __new__.'''
+    return tuple.__new__(cls, (x, y))
+
 
 class Line(namedtuple('Line', 'a b c')):
     '''2D Euclidean line class, based on namedtuple with fields a, b and c.
@@ -98,14 +109,15 @@ class Line(namedtuple('Line', 'a b c')):
 
     def rotated_line(self, anchor, angle):
         '''Returns a line rotated counter clockwise by the given angle around an anchor point.'''
+        # The normal n = a + ib turns with the line, n' = n exp(i angle), and c = Re(conj(n) z) follows from the
+        # anchor staying in place. Coefficients are scaled as for the line through the two rotated points at
+        # x = 0, 1 or y = 0, 1 of the original line, dividing by a or -b.
         a, b, c = self
-        if abs(a) > abs(b):
-            point_a, point_b = Point(c / a, 0), Point((c - b) / a, 1)
-        else:
-            point_a, point_b = Point(0, c / b), Point(1, (c - a) / b)
-
-        point_a, point_b = point_a.rotated_point(anchor, angle), point_b.rotated_point(anchor, angle)
-        return Line(point_a, point_b)
+        scale = a if abs(a) > abs(b) else -b
+        cosine, sine = math.cos(angle) / scale, math.sin(angle) / scale
+        rotated_a, rotated_b = a * cosine - b * sine, a * sine + b * cosine
+        x, y = anchor.x, anchor.y
+        return _make_line(Line, rotated_a, rotated_b, (c - a * x - b * y) / scale + rotated_a * x + rotated_b * y)
 
     def angle_between(self, other):
         '''Returns angle in radians between two Lines, between 0 and pi'''
@@ -113,10 +125,17 @@ class Line(namedtuple('Line', 'a b c')):
         dot_product = (a1 * a2 + b1 * b2) / math.sqrt((a1**2 + b1**2) * (a2**2 + b2**2))
         return math.acos(dot_product)
 
+def _make_line(cls, a, b, c):
+    '''Builds a Line, or an instance of a subclass, from its three coefficients without the argument checks of
+       __new__.'''
+    return tuple.__new__(cls, (a, b, c))
+
 
 class Circle(object):
     '''Class for euclidean circle objects.'''
 
+    __slots__ = ('center', 'radius')
+
     def __init__(self, center, radius):
         '''Constructs a Circle using a center Point and the radius.'''
         self.center, self.radius = center, radius
@@ -148,60 +167,285 @@ class Circle(object):
         return lines_to_centers[0].angle_between(lines_to_centers[1])
 
 
-def _circle_circle_intersection(circle1, circle2):
-    '''Returns list of intersection points between the circle and circles.'''
+# Kinds of intersections
+NO_INTERSECTION, SINGLE_POINT, TANGENT = 'none', 'single_point', 'tangent'
+TWO_POINTS, COINCIDENT = 'two_points', 'coincident'
+
+# Discriminants smaller than this, relative to the magnitude of their terms, are recomputed exactly
+CONDITION_THRESHOLD = 1e-9
+DECIMAL_PRECISION = 40
+
+
+class Intersection(namedtuple('Intersection', 'kind points')):
+    '''Typed intersection result, based on a namedtuple with the kind of intersection and a list of Points.
+       The list holds no points for none and coincident, one for a single point or a tangent, and two otherwise.'''
+
+
+def _decimal_sqrt(value):
+    '''Square root of a non negative Fraction, computed in high precision and rounded to a float.'''
+    with decimal.localcontext() as context:
+        context.prec = DECIMAL_PRECISION
+        return float((decimal.Decimal(value.numerator) / decimal.Decimal(value.denominator)).sqrt())
+
+def _circle_circle_kernel(circle1, circle2):
+    '''Returns the kind and the list of intersection points between two circles.'''
     x0, y0, r0 = circle1.center.x, circle1.center.y, circle1.radius
     x1, y1, r1 = circle2.center.x, circle2.center.y, circle2.radius
 
     center_distance_sq = (x0 - x1)**2 + (y0 - y1)**2
-    x_intersection_first_term = 0.5 * (x0 + x1) + 0.5 * (x0 - x1)*(r1**2 - r0**2) / center_distance_sq
-    y_intersection_first_term = 0.5 * (y0 + y1) + 0.5 * (y0 - y1)*(r1**2 - r0**2) / center_distance_sq
-
-    try:
-        x_intersection_second_term = 0.5 * (y1 - y0) / center_distance_sq * \
-            math.sqrt(((r1 + r0)**2 - center_distance_sq) * (center_distance_sq - (r1 - r0)**2))
-        y_intersection_second_term = 0.5 * (x1 - x0) / center_distance_sq * \
-            math.sqrt(((r1 + r0)**2 - center_distance_sq) * (center_distance_sq - (r1 - r0)**2))
-
+    outer_term, inner_term = (r1 + r0)**2 - center_distance_sq, center_distance_sq - (r1 - r0)**2
+    discriminant = outer_term * inner_term
+    scale = ((r1 + r0)**2 + center_distance_sq) * (center_distance_sq + (r1 - r0)**2)
+
+    if abs(discriminant) <= CONDITION_THRESHOLD * scale:
+        x0, y0, r0, x1, y1, r1 = [Fraction(value) for value in (x0, y0, r0, x1, y1, r1)]
+        center_distance_sq = (x0 - x1)**2 + (y0 - y1)**2
+        if center_distance_sq == 0:
+            return COINCIDENT if r0 == r1 else NO_INTERSECTION, []
+        discriminant = ((r1 + r0)**2 - center_distance_sq) * (center_distance_sq - (r1 - r0)**2)
+        if discriminant < 0:
+            return NO_INTERSECTION, []
+
+        x_intersection_first_term = float((x0 + x1) / 2 + (x0 - x1)*(r1**2 - r0**2) / center_distance_sq / 2)
+        y_intersection_first_term = float((y0 + y1) / 2 + (y0 - y1)*(r1**2 - r0**2) / center_distance_sq / 2)
+        if discriminant == 0:
+            return TANGENT, [Point(x_intersection_first_term, y_intersection_first_term)]
+
+        root = _decimal_sqrt(discriminant)
+        x_intersection_second_term = float((y1 - y0) / center_distance_sq / 2) * root
+        y_intersection_second_term = float((x1 - x0) / center_distance_sq / 2) * root
         point1 = Point(x_intersection_first_term + x_intersection_second_term,
                        y_intersection_first_term - y_intersection_second_term)
         point2 = Point(x_intersection_first_term - x_intersection_second_term,
                        y_intersection_first_term + y_intersection_second_term)
-        return [point1, point2]
-
-    except ValueError:
-        return []
-
-def _circle_line_intersection(circle, line):
-    '''Returns list of intersection points between the circle and other lines.'''
+        return TWO_POINTS, [point1, point2]
+    elif discriminant < 0:
+        return NO_INTERSECTION, []
+
+    # with d = (c1 - c0) / 2|c1 - c0|^2 the points are c0 + d (|c1 - c0|^2 + r0^2 - r1^2) -/+ i d sqrt(D)
+    scale = 0.5 / center_distance_sq
+    dx, dy = (x1 - x0) * scale, (y1 - y0) * scale
+    along = center_distance_sq + r0 * r0 - r1 * r1
+    x_foot, y_foot = x0 + dx * along, y0 + dy * along
+    root = math.sqrt(discriminant)
+    return TWO_POINTS, [_make_point(Point, x_foot + dy * root, y_foot - dx * root),
+                        _make_point(Point, x_foot - dy * root, y_foot + dx * root)]
+
+def _circle_line_kernel(circle, line):
+    '''Returns the kind and the list of intersection points between a circle and a line.'''
     x0, y0, r0 = circle.center.x, circle.center.y, circle.radius
     a, b, c = line.a, line.b, line.c
 
-    try:
+    norm_sq = a**2 + b**2
+    c = c - a * x0 - b * y0
+    discriminant = r0**2 * norm_sq - c**2
+    scale = r0**2 * norm_sq + c**2
+
+    if abs(discriminant) <= CONDITION_THRESHOLD * scale:
+        x0, y0, r0, a, b, c = [Fraction(value) for value in (x0, y0, r0, line.a, line.b, line.c)]
+        norm_sq = a**2 + b**2
+        if norm_sq == 0:
+            return NO_INTERSECTION, []
         c = c - a * x0 - b * y0
-        root_term = math.sqrt(r0**2 * (a**2 + b**2) - c**2) / (a**2 + b**2)
-        x = [a * c / (a**2 + b**2) + b * root_term, a * c / (a**2 + b**2) - b * root_term]
-        y = [b * c / (a**2 + b**2) - a * root_term, b * c / (a**2 + b**2) + a * root_term]
-        return [Point(x0 + x[0], y0 + y[0]), Point(x0 + x[1], y0 + y[1])]
+        discriminant = r0**2 * norm_sq - c**2
+        if discriminant < 0:
+            return NO_INTERSECTION, []
+
+        x_foot, y_foot = float(x0 + a * c / norm_sq), float(y0 + b * c / norm_sq)
+        if discriminant == 0:
+            return TANGENT, [Point(x_foot, y_foot)]
+
+        root_term = _decimal_sqrt(discriminant) / float(norm_sq)
+        a, b = float(a), float(b)
+        return TWO_POINTS, [Point(x_foot + b * root_term, y_foot - a * root_term),
+                            Point(x_foot - b * root_term, y_foot + a * root_term)]
+    elif discriminant < 0:
+        return NO_INTERSECTION, []
+
+    # with n = a + ib the points are c0 + n c / |n|^2 -/+ i n sqrt(D) / |n|^2
+    c = c / norm_sq
+    x_foot, y_foot = x0 + a * c, y0 + b * c
+    root_term = math.sqrt(discriminant) / norm_sq
+    return TWO_POINTS, [_make_point(Point, x_foot + b * root_term, y_foot - a * root_term),
+                        _make_point(Point, x_foot - b * root_term, y_foot + a * root_term)]
+
+def _line_line_kernel(line1, line2):
+    '''Returns the kind and the list of intersection points between two lines.'''
+    a1, b1, c1 = line1
+    a2, b2, c2 = line2
+
+    determinant = a2 * b1 - b2 * a1
+    if abs(determinant) <= CONDITION_THRESHOLD * (abs(a2 * b1) + abs(b2 * a1)):
+        a1, b1, c1, a2, b2, c2 = [Fraction(value) for value in (a1, b1, c1, a2, b2, c2)]
+        determinant = a2 * b1 - b2 * a1
+        if determinant == 0:
+            coincident = a1 * c2 == a2 * c1 and b1 * c2 == b2 * c1 and (a1, b1) != (0, 0) and (a2, b2) != (0, 0)
+            return COINCIDENT if coincident else NO_INTERSECTION, []
+        return SINGLE_POINT, [Point(float((c2 * b1 - b2 * c1) / determinant),
+                                    float((a2 * c1 - a1 * c2) / determinant))]
+
+    x_intersect = (c2 * b1 - b2 * c1) / determinant
+    if abs(b2) > abs(b1):
+        y_intersect = (c2 - a2 * x_intersect) / b2
+    else:
+        y_intersect = (c1 - a1 * x_intersect) / b1
+    return SINGLE_POINT, [Point(x_intersect, y_intersect)]
+
+
+def circle_circle_intersection(circle1, circle2):
+    '''Returns the typed Intersection between two circles.'''
+    return Intersection(*_circle_circle_kernel(circle1, circle2))
+
+def circle_line_intersection(circle, line):
+    '''Returns the typed Intersection between a circle and a line.'''
+    return Intersection(*_circle_line_kernel(circle, line))
+
+def line_line_intersection(line1, line2):
+    '''Returns the typed Intersection between two lines.'''
+    return Intersection(*_line_line_kernel(line1, line2))
 
-    except ValueError:
-        return []
+def _circle_circle_intersection(circle1, circle2):
+    '''Returns list of intersection points between the circle and circles.
+       A tangent point is returned twice.'''
+    kind, points = _circle_circle_kernel(circle1, circle2)
+    return points * 2 if kind is TANGENT else points
+
+def _circle_line_intersection(circle, line):
+    '''Returns list of intersection points between the circle and other lines.
+       A tangent point is returned twice.'''
+    kind, points = _circle_line_kernel(circle, line)
+    return points * 2 if kind is TANGENT else points
 
 def _line_line_intersection(line1, line2):
     '''Returns the intersection Point between lines.
        if the lines are parallel or identical, and empty list is returned.'''
-    a1, b1, c1 = line1
-    a2, b2, c2 = line2
+    return _line_line_kernel(line1, line2)[1]
 
-    try:
-        x_intersect = (c2 * b1 - b2 * c1) / (a2 * b1 - b2 * a1)
 
-        if abs(b2) > abs(b1):
-            y_intersect = (c2 - a2 * x_intersect) / b2
-        else:
-            y_intersect = (c1 - a1 * x_intersect) / b1
-        return [Point(x_intersect, y_intersect)]
+# Bulk intersections
+
+# Covering boxes are grown by this much, so that touching shapes share a cell
+BOX_PADDING = 1e-9
 
-    except ZeroDivisionError:
-        return []
 
+def _clip_line(line, bounds):
+    '''Returns the end points of the segment of a line inside bounds (x_min, y_min, x_max, y_max), or None.'''
+    a, b, c = line
+    norm_sq = a**2 + b**2
+    if norm_sq == 0:
+        return None
+    x, y, dx, dy = a * c / norm_sq, b * c / norm_sq, b, -a
+    t_min, t_max = -math.inf, math.inf
+    for origin, direction, low, high in ((x, dx, bounds[0], bounds[2]), (y, dy, bounds[1], bounds[3])):
+        if direction == 0:
+            if not low <= origin <= high:
+                return None
+        else:
+            t0, t1 = sorted(((low - origin) / direction, (high - origin) / direction))
+            t_min, t_max = max(t_min, t0), min(t_max, t1)
+    if t_min > t_max:
+        return None
+    return Point(x + t_min * dx, y + t_min * dy), Point(x + t_max * dx, y + t_max * dy)
+
+def _clip_circle(circle, bounds):
+    '''Returns the arcs (start_angle, sweep) of a circle inside bounds (x_min, y_min, x_max, y_max).
+       The circle is split at its crossings with the lines through the sides of the bounds, and the pieces whose
+       middle lies inside the bounds are kept.'''
+    x_min, y_min, x_max, y_max = bounds
+    (x, y), radius = circle.center, circle.radius
+    angles = []
+    for offset, horizontal in ((x_min - x, False), (x_max - x, False), (y_min - y, True), (y_max - y, True)):
+        if abs(offset) <= radius:
+            across = math.sqrt((radius - offset) * (radius + offset))
+            for other in (across, -across):
+                angle = math.atan2(offset, other) if horizontal else math.atan2(other, offset)
+                angles.append(angle % (2 * math.pi))
+    if not angles:
+        inside = x_min <= x + radius <= x_max and y_min <= y <= y_max
+        return [(0.0, 2 * math.pi)] if inside else []
+
+    angles.sort()
+    arcs = []
+    for start, end in zip(angles, angles[1:] + [angles[0] + 2 * math.pi]):
+        middle = (start + end) / 2.0
+        middle_x, middle_y = x + radius * math.cos(middle), y + radius * math.sin(middle)
+        if end > start and x_min <= middle_x <= x_max and y_min <= middle_y <= y_max:
+            arcs.append((start, end - start))
+    return arcs
+
+def _segment_boxes(start, end, cell_size):
+    '''Returns boxes (x_min, y_min, x_max, y_max) covering a segment, each about a cell long.'''
+    pieces = max(1, math.ceil(start.distance(end) / cell_size))
+    xs = [start.x + (end.x - start.x) * i / pieces for i in range(pieces + 1)]
+    ys = [start.y + (end.y - start.y) * i / pieces for i in range(pieces + 1)]
+    return [(min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+            for x0, x1, y0, y1 in zip(xs, xs[1:], ys, ys[1:])]
+
+def _arc_boxes(center, radius, start_angle, sweep, cell_size):
+    '''Returns boxes covering the arc of a circle from start_angle over sweep radians, each about a cell long.
+       Every piece of the arc lies within its sagitta of its chord, so the box of the chord is grown by it.'''
+    pieces = max(1, math.ceil(radius * abs(sweep) / cell_size))
+    step = sweep / pieces
+    sagitta = radius * (1.0 - math.cos(step / 2.0))
+    xs = [center.x + radius * math.cos(start_angle + i * step) for i in range(pieces + 1)]
+    ys = [center.y + radius * math.sin(start_angle + i * step) for i in range(pieces + 1)]
+    return [(min(x0, x1) - sagitta, min(y0, y1) - sagitta, max(x0, x1) + sagitta, max(y0, y1) + sagitta)
+            for x0, x1, y0, y1 in zip(xs, xs[1:], ys, ys[1:])]
+
+def _candidate_pairs(shape_boxes, bounds, cell_size):
+    '''Buckets shapes, given as lists of covering boxes, into a grid of square cells over the bounds.
+       Returns the set of index pairs (i, j), i < j, of shapes sharing at least one cell.'''
+    x_min, y_min, x_max, y_max = bounds
+    cells = {}
+    for index, boxes in enumerate(shape_boxes):
+        covered = set()
+        for box_x_min, box_y_min, box_x_max, box_y_max in boxes:
+            box_x_min, box_y_min = max(box_x_min - BOX_PADDING, x_min), max(box_y_min - BOX_PADDING, y_min)
+            box_x_max, box_y_max = min(box_x_max + BOX_PADDING, x_max), min(box_y_max + BOX_PADDING, y_max)
+            if box_x_min > box_x_max or box_y_min > box_y_max:
+                continue
+            covered.update(itertools.product(
+                range(int((box_x_min - x_min) // cell_size), int((box_x_max - x_min) // cell_size) + 1),
+                range(int((box_y_min - y_min) // cell_size), int((box_y_max - y_min) // cell_size) + 1)))
+        for cell in covered:
+            cells.setdefault(cell, []).append(index)
+
+    pairs = set()
+    for members in cells.values():
+        pairs.update(itertools.combinations(members, 2))
+    return pairs
+
+def _default_cell_size(bounds, count):
+    '''Cell size splitting the bounds into about as many cells as there are shapes.'''
+    return max(bounds[2] - bounds[0], bounds[3] - bounds[1]) / max(1, math.ceil(math.sqrt(count)))
+
+def _intersection_kernel(first, second):
+    '''Returns the kind and the list of intersection points between two Lines or Circles.'''
+    if isinstance(first, Line):
+        return _line_line_kernel(first, second) if isinstance(second, Line) else _circle_line_kernel(second, first)
+    return _circle_line_kernel(first, second) if isinstance(second, Line) else _circle_circle_kernel(first, second)
+
+def all_intersections(shapes, bounds=(-1.0, -1.0, 1.0, 1.0), cell_size=None):
+    '''Returns a list of (i, j, Point) of every intersection inside bounds (x_min, y_min, x_max, y_max)
+       between the Lines and Circles in shapes, given by their indices i < j.
+       Shapes are clipped to the bounds and bucketed into a grid of cells, and only shapes sharing a cell are
+       intersected, so that the cost follows the number of intersections rather than the number of pairs.
+       Tangent points are listed once, coincident shapes not at all.'''
+    shapes = list(shapes)
+    cell_size = cell_size or _default_cell_size(bounds, len(shapes))
+    shape_boxes = []
+    for shape in shapes:
+        if isinstance(shape, Line):
+            segment = _clip_line(shape, bounds)
+            shape_boxes.append([] if segment is None else _segment_boxes(*segment, cell_size))
+        else:
+            shape_boxes.append([box for start_angle, sweep in _clip_circle(shape, bounds)
+                                for box in _arc_boxes(shape.center, shape.radius, start_angle, sweep, cell_size)])
+
+    x_min, y_min, x_max, y_max = bounds
+    intersections = []
+    for i, j in sorted(_candidate_pairs(shape_boxes, bounds, cell_size)):
+        for point in _intersection_kernel(shapes[i], shapes[j])[1]:
+            if x_min <= point.x <= x_max and y_min <= point.y <= y_max:
+                intersections.append((i, j, point))
+    return intersections
@@ -1,13 +1,31 @@
 
 import math
+import cmath
 from numbers import Real
-from . euclidean import Point, Line, Circle
+from collections import namedtuple
+from . import instrumentation
+from . euclidean import Point, Line, Circle, _make_point, _segment_boxes, _arc_boxes, _candidate_pairs, \
+    _default_cell_size, _intersection_kernel
 
 
 def unit_circle():
     '''Returns the unit circle, the representation of the Poincare Disk.'''
     return Circle(Point(0, 0), 1)
 
+def _distance(x1, y1, x2, y2):
+    '''Closed form hyperbolic distance, 2 * asinh(|p - q| / sqrt((1 - |p|^2)(1 - |q|^2))),
+       which is the arccosh formula written to stay accurate for nearby points.'''
+    conformal_factor = (1.0 - x1**2 - y1**2) * (1.0 - x2**2 - y2**2)
+    return 2.0 * math.asinh(math.hypot(x1 - x2, y1 - y2) / math.sqrt(conformal_factor))
+
+def _angle(z1, z2, z3):
+    '''Closed form angle at z2 between the geodesics to z1 and z3, given as complex numbers.
+       The isometry z -> (z - z2) / (1 - conj(z2) z) moves z2 to the origin without rotating it,
+       where geodesics are diameters and the angle is simply the difference of arguments.'''
+    w1 = (z1 - z2) / (1.0 - z2.conjugate() * z1)
+    w3 = (z3 - z2) / (1.0 - z2.conjugate() * z3)
+    return abs(cmath.phase(w3 * w1.conjugate()))
+
 class HyperbolicPoint(Point):
     '''Class for points on the Poincare disk inheriting from the euclidean Point class.'''
 
@@ -19,14 +37,20 @@ class HyperbolicPoint(Point):
         else:
             raise NotImplementedError
 
+    @staticmethod
+    def from_complex(z):
+        '''Returns the HyperbolicPoint at the position of a complex number.'''
+        return _make_point(HyperbolicPoint, float(z.real), float(z.imag))
+
     def euclidean_distance_to_origin(self):
         '''Euclidean distance to the origin of the Poincare Disk.'''
         return Point.distance_to_origin(self)
 
     def inverse(self):
         '''Inverse point in respect with the Poincare Disk.'''
-        distance = self.euclidean_distance_to_origin()
-        return HyperbolicPoint(self.x / distance**2, self.y / distance**2)
+        x, y = self
+        squared_norm = x * x + y * y
+        return _make_point(HyperbolicPoint, x / squared_norm, y / squared_norm)
 
     def distance_to_origin(self):
         '''Hyperbolic distance to the origin.'''
@@ -36,26 +60,39 @@ class HyperbolicPoint(Point):
         '''Checks if point is actually in the Poincare Disc'''
         return self.euclidean_distance_to_origin() < 1.0
 
-    def distance(self, other):
-        '''Returns the hyperbolic distance between two points in the Poincare Disk.'''
-        try:
-            return HyperbolicLine(self, other).length()
-        except IndexError:
-            return 0.0
+    def distance(self, other, geometric=False):
+        '''Returns the hyperbolic distance between two points in the Poincare Disk.
+           By default the closed form arccosh formula is used, setting 'geometric' measures the
+           cross ratio of the HyperbolicLine through both points instead.'''
+        if geometric:
+            try:
+                return HyperbolicLine(self, other).length()
+            except IndexError:
+                instrumentation.record_fallback('hyperbolic.HyperbolicPoint.distance')
+                return 0.0
+        return _distance(self.x, self.y, other.x, other.y)
 
     def polar_line(self):
         '''Returns the polar line of a point, defined as the locus of all arc centers passing through the point.'''
         return Line(2.0*self.x, 2.0*self.y, 1.0 + self.x**2 + self.y**2)
 
     @staticmethod
-    def angle_between_three_points(point_1, point_2, point_3):
+    def angle_between_three_points(point_1, point_2, point_3, geometric=False):
         '''Returns the angle in radians formed between point 1, point 2 and point 3.
-           Returned angle will be in between zero and pi.'''
-        a, b, c = point_1.distance(point_2), point_2.distance(point_3), point_1.distance(point_3)
+           Returned angle will be in between zero and pi.
+           By default the angle is measured after moving point 2 to the origin, setting 'geometric'
+           uses the hyperbolic law of cosines on the three side lengths instead.'''
+        if not geometric:
+            return _angle(complex(*point_1), complex(*point_2), complex(*point_3))
+
+        a = point_1.distance(point_2, geometric=True)
+        b = point_2.distance(point_3, geometric=True)
+        c = point_1.distance(point_3, geometric=True)
         cos_angle = (math.cosh(a) * math.cosh(b) - math.cosh(c)) / math.sinh(a) / math.sinh(b)
         try:
             return math.acos(cos_angle)
         except ValueError:
+            instrumentation.record_fallback('hyperbolic.HyperbolicPoint.angle_between_three_points')
             if c < a:
                 return 0.0
             else:
@@ -80,22 +117,42 @@ class HyperbolicPoint(Point):
 class HyperbolicLine(object):
     '''Class for lines in hyperblic space, as represented by the Poincare Disk Model
        Internally stores objects of the form 'k(x^2 + y^2) - 2 x0 x - 2 y0 y + k', where 'k'' is either 1 or 0.
-       the value of 'not k' may be retrieved using the attribute 'is_a_straight_line'.'''
+       the value of 'not k' may be retrieved using the attribute 'is_a_straight_line'.
+       Lines are immutable, and their derived geometry is computed on first access and cached.'''
+
+    __slots__ = ('_end_points', '_is_a_straight_line', '_x0', '_y0',
+                 '_representation', '_ideal_points', '_length', '_tangent_directions')
 
     def __init__(self, point_a, point_b):
         '''Constructs a HyperbolicLine between two Points.'''
         if not point_a.is_in_unit_disk() or not point_b.is_in_unit_disk():
             raise ValueError('Points must be inside the unit disk.')
-        self._end_points = [HyperbolicPoint(point_a), HyperbolicPoint(point_b)]
-        self._is_a_straight_line = False
+        point_a = point_a if type(point_a) is HyperbolicPoint else HyperbolicPoint(point_a)
+        point_b = point_b if type(point_b) is HyperbolicPoint else HyperbolicPoint(point_b)
+        _set = object.__setattr__
+        _set(self, '_end_points', (point_a, point_b))
         if Line(point_a, point_b).distance_to_origin() < 1e-9:
-            self._is_a_straight_line = True
+            _set(self, '_is_a_straight_line', True)
             if point_a.distance_to_origin() > point_b.distance_to_origin():
-                self._x0, self._y0 = point_a.y, -point_a.x
+                x0, y0 = point_a.y, -point_a.x
             else:
-                self._x0, self._y0 = point_b.y, -point_b.x
+                x0, y0 = point_b.y, -point_b.x
         else:
-            self._x0, self._y0 = point_a.polar_line().intersection(point_b.polar_line())[0]
+            _set(self, '_is_a_straight_line', False)
+            x0, y0 = point_a.polar_line().intersection(point_b.polar_line())[0]
+        _set(self, '_x0', x0)
+        _set(self, '_y0', y0)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('HyperbolicLine objects are immutable.')
+
+    def __reduce__(self):
+        return (HyperbolicLine, self._end_points)
+
+    def _cache(self, name, value):
+        '''Stores a lazily computed value, returning it.'''
+        object.__setattr__(self, name, value)
+        return value
 
     @property
     def is_a_straight_line(self):
@@ -107,24 +164,68 @@ class HyperbolicLine(object):
         '''Get end points defining the line.'''
         return self._end_points
 
-    def length(self):
-        '''Return hyperbolic length of line as defined by it's end points.'''
-        p, q = self.end_points
-        if p == q:
-            return 0.0
+    @property
+    def ideal_points(self):
+        '''Get the two points where the line meets the boundary of the disk,
+           the first one lying beyond the first end point.'''
+        try:
+            return self._ideal_points
+        except AttributeError:
+            return self._cache('_ideal_points', self._find_ideal_points())
+
+    def _find_ideal_points(self):
+        p, q = self._end_points
         a, b = self.representation().intersection(unit_circle())
         if Point.distance(a, q) < Point.distance(a, p):
             a, b = b, a
-        ratio = (Point.distance(a, q) * Point.distance(p, b)) / (Point.distance(a, p) * Point.distance(q, b))
-        return math.log(ratio)
+        return a, b
+
+    @property
+    def tangent_directions(self):
+        '''Get the unit tangent vectors of the line at its two end points, both pointing from the first end point
+           towards the second one.'''
+        try:
+            return self._tangent_directions
+        except AttributeError:
+            p, q = self._end_points
+            chord = Point(q.x - p.x, q.y - p.y)
+            if p == q:
+                directions = (Point(0.0, 0.0), Point(0.0, 0.0))
+            elif self._is_a_straight_line:
+                directions = (chord / chord.distance_to_origin(),) * 2
+            else:
+                # arcs are shorter than half circles, so the tangents point along the chord
+                directions = []
+                for end_point in (p, q):
+                    radial = end_point - Point(self._x0, self._y0)
+                    tangent = Point(-radial.y, radial.x) / Point.distance_to_origin(radial)
+                    directions.append(tangent if tangent * chord > 0 else tangent * -1.0)
+                directions = tuple(directions)
+            return self._cache('_tangent_directions', directions)
+
+    def length(self):
+        '''Return hyperbolic length of line as defined by it's end points.'''
+        try:
+            return self._length
+        except AttributeError:
+            p, q = self._end_points
+            if p == q:
+                return self._cache('_length', 0.0)
+            # only cache the ideal points if they were asked for, to keep lines small
+            a, b = self._ideal_points if hasattr(self, '_ideal_points') else self._find_ideal_points()
+            ratio = (Point.distance(a, q) * Point.distance(p, b)) / (Point.distance(a, p) * Point.distance(q, b))
+            return self._cache('_length', math.log(ratio))
 
     def representation(self):
-        '''Get arc representation as either a circle or a line.'''
-        if self._is_a_straight_line:
-            return Line(self._x0, self._y0, 0)
-        else:
+        '''Get arc representation as either a circle or a line.
+           The returned object is cached and shared, and must not be modified.'''
+        try:
+            return self._representation
+        except AttributeError:
+            if self._is_a_straight_line:
+                return self._cache('_representation', Line(self._x0, self._y0, 0))
             radius = math.sqrt(self._x0**2 + self._y0**2 - 1.0)
-            return Circle(Point(self._x0, self._y0), radius)
+            return self._cache('_representation', Circle(Point(self._x0, self._y0), radius))
 
     def intersection(self, other):
         '''Return intersection point between hyperbolic lines.
@@ -139,9 +240,19 @@ class HyperbolicLine(object):
         else:
             return HyperbolicPoint(intersection_points)
 
-    def line_at_angle(self, angle, length):
+    def line_at_angle(self, angle, length, geometric=False):
         '''Returns a line starting from the end point of the current line, having the prescribed length,
-           and meeting the existing line at the specified angle.'''
+           and meeting the existing line at the specified angle.
+           By default the new end point is placed by a Mobius translation of the end point to the origin,
+           setting 'geometric' intersects rotated arcs with a hyperbolic circle instead.'''
+
+        if not geometric:
+            anchor = self.end_points[1]
+            from_origin = Mobius.translation_from_origin(anchor)
+            backwards = complex(*from_origin.inverse()(self.end_points[0]))
+            direction = -backwards / abs(backwards) * cmath.rect(1.0, angle)
+            end_point = from_origin(HyperbolicPoint.from_complex(math.tanh(length / 2.0) * direction))
+            return HyperbolicLine(anchor, end_point)
 
         # move angle to range [-pi, pi]
         while angle > math.pi:
@@ -182,4 +293,119 @@ class HyperbolicLine(object):
             formed_angle = HyperbolicPoint.angle_between_three_points(self.end_points[0], self.end_points[1], end_point)
             if abs(formed_angle + abs(angle) - math.pi) < 1.0e-5:
                 return HyperbolicLine(anchor, end_point)
-                
\ No newline at end of file
+
+
+class Mobius(namedtuple('Mobius', 'a b')):
+    '''Class for orientation preserving isometries of the Poincare Disk, based on a namedtuple with fields a and b.
+       Represents the Mobius transformation z -> (a z + b) / (conj(b) z + conj(a)), that is the complex matrix
+       [[a, b], [conj(b), conj(a)]], normalized to |a|^2 - |b|^2 = 1 so that the unit disk is mapped onto itself.'''
+
+    def __new__(cls, a=1.0, b=0.0):
+        a, b = complex(a), complex(b)
+        determinant = abs(a)**2 - abs(b)**2
+        if determinant <= 0.0:
+            raise ValueError('Transformation does not preserve the unit disk.')
+        scale = math.sqrt(determinant)
+        return super().__new__(cls, a / scale, b / scale)
+
+    @staticmethod
+    def identity():
+        '''Returns the identity transformation.'''
+        return Mobius(1.0, 0.0)
+
+    @staticmethod
+    def translation_from_origin(point):
+        '''Returns the translation moving the origin to the point, along the diameter through the point.'''
+        return Mobius(1.0, complex(*point))
+
+    @staticmethod
+    def translation(point_a, point_b, distance=None):
+        '''Returns the translation along the geodesic from point a towards point b, by the given hyperbolic
+           distance. If no distance is given, point a is moved onto point b.'''
+        from_origin = Mobius.translation_from_origin(point_a)
+        direction = complex(*from_origin.inverse()(point_b))
+        if distance is not None and direction != 0.0:
+            direction *= math.tanh(distance / 2.0) / abs(direction)
+        return from_origin @ Mobius.translation_from_origin(HyperbolicPoint.from_complex(direction)) @ \
+            from_origin.inverse()
+
+    @staticmethod
+    def rotation(angle, center=None):
+        '''Returns the counter clockwise rotation by the angle around the center point, the origin by default.'''
+        rotation = Mobius(cmath.rect(1.0, angle / 2.0), 0.0)
+        if center is None:
+            return rotation
+        from_origin = Mobius.translation_from_origin(center)
+        return from_origin @ rotation @ from_origin.inverse()
+
+    def compose(self, other):
+        '''Returns the transformation applying other first and then the current transformation.'''
+        a1, b1 = self
+        a2, b2 = other
+        return Mobius(a1 * a2 + b1 * b2.conjugate(), a1 * b2 + b1 * a2.conjugate())
+
+    def __matmul__(self, other):
+        return self.compose(other)
+
+    def inverse(self):
+        '''Returns the inverse transformation.'''
+        return Mobius(self.a.conjugate(), -self.b)
+
+    def apply_complex(self, z):
+        '''Applies the transformation to a complex number, or to a NumPy array of complex numbers.'''
+        a, b = self
+        return (a * z + b) / (b.conjugate() * z + a.conjugate())
+
+    def apply(self, other):
+        '''Applies the transformation to a Point, a HyperbolicLine or a HyperbolicPointArray.'''
+        if isinstance(other, Point):
+            return HyperbolicPoint.from_complex(self.apply_complex(complex(*other)))
+        elif isinstance(other, HyperbolicLine):
+            return HyperbolicLine(*[self.apply(end_point) for end_point in other.end_points])
+        elif hasattr(other, 'to_complex'):
+            return type(other).from_complex(self.apply_complex(other.to_complex()))
+        else:
+            raise NotImplementedError
+
+    def __call__(self, other):
+        return self.apply(other)
+
+
+# Points on a geodesic arc see its end points at an angle of at least pi / 2, up to this tolerance
+ARC_TOLERANCE = 1e-12
+
+def _geodesic_boxes(line, start, end, cell_size):
+    '''Returns boxes covering the part of a HyperbolicLine's representation between two of its points.'''
+    if line.is_a_straight_line:
+        return _segment_boxes(start, end, cell_size)
+    center, radius = line.representation().center, line.representation().radius
+    start_angle = math.atan2(start.y - center.y, start.x - center.x)
+    sweep = math.atan2(end.y - center.y, end.x - center.x) - start_angle
+    sweep = (sweep + math.pi) % (2 * math.pi) - math.pi
+    return _arc_boxes(center, radius, start_angle, sweep, cell_size)
+
+def _on_arc(point, start, end):
+    '''Returns if a point on a geodesic lies between two of its points, geodesic arcs being less than half circles.'''
+    return (start.x - point.x) * (end.x - point.x) + (start.y - point.y) * (end.y - point.y) <= ARC_TOLERANCE
+
+def all_intersections(lines, segments=True, cell_size=None):
+    '''Returns a list of (i, j, HyperbolicPoint) of every intersection between the HyperbolicLines,
+       given by their indices i < j.
+       By default lines are the segments between their end points, otherwise the complete geodesics through them
+       are intersected, as in HyperbolicLine.intersection. Lines are bucketed into a grid of cells over the disk
+       and only lines sharing a cell are intersected.'''
+    lines = list(lines)
+    bounds = (-1.0, -1.0, 1.0, 1.0)
+    cell_size = cell_size or _default_cell_size(bounds, len(lines))
+    arcs = [line.end_points if segments else line.ideal_points for line in lines]
+    line_boxes = [_geodesic_boxes(line, start, end, cell_size) for line, (start, end) in zip(lines, arcs)]
+
+    intersections = []
+    for i, j in sorted(_candidate_pairs(line_boxes, bounds, cell_size)):
+        for point in _intersection_kernel(lines[i].representation(), lines[j].representation())[1]:
+            if point.x**2 + point.y**2 >= 1.0:
+                continue
+            if segments and not (_on_arc(point, *arcs[i]) and _on_arc(point, *arcs[j])):
+                continue
+            intersections.append((i, j, HyperbolicPoint(*point)))
+    return intersections
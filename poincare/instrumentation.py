@@ -0,0 +1,140 @@
+'''Opt-in instrumentation counting and timing calls to the core geometry functions.
+
+   Instrumentation works by replacing the functions with counting wrappers while it is enabled, and putting
+   the originals back when it is disabled, so that it costs nothing at all when not in use.
+   A call is degenerate if its result matches the predicate of its target, if it raises, or if it took a
+   fallback path reported through record_fallback.'''
+
+import time
+import inspect
+import importlib
+import functools
+from contextlib import contextmanager
+
+
+def _empty(result):
+    return not result
+
+def _none(result):
+    return result is None
+
+# (module, class or None for module level functions, function, predicate marking a degenerate result or None)
+TARGETS = [('euclidean', None, '_circle_circle_intersection', _empty),
+           ('euclidean', None, '_circle_line_intersection', _empty),
+           ('euclidean', None, '_line_line_intersection', _empty),
+           ('euclidean', 'Point', 'rotated_point', None),
+           ('euclidean', 'Line', 'rotated_line', None),
+           ('euclidean', 'Line', 'distance_to_point', None),
+           ('euclidean', 'Circle', 'angle_between', None),
+           ('hyperbolic', 'HyperbolicPoint', 'distance', None),
+           ('hyperbolic', 'HyperbolicPoint', 'angle_between_three_points', None),
+           ('hyperbolic', 'HyperbolicPoint', 'hyperbolic_circle', None),
+           ('hyperbolic', 'HyperbolicPoint', 'polar_line', None),
+           ('hyperbolic', 'HyperbolicPoint', 'inverse', None),
+           ('hyperbolic', 'HyperbolicLine', '__init__', None),
+           ('hyperbolic', 'HyperbolicLine', 'length', None),
+           ('hyperbolic', 'HyperbolicLine', 'representation', None),
+           ('hyperbolic', 'HyperbolicLine', 'intersection', _none),
+           ('hyperbolic', 'HyperbolicLine', 'line_at_angle', _none),
+           ('hyperbolic', 'Mobius', 'apply', None),
+           ('poincaredisk', 'PoincareDiskModel', 'drawpoint', None),
+           ('poincaredisk', 'PoincareDiskModel', 'drawline', None),
+           ('poincaredisk', 'PoincareDiskModel', 'drawtiling', None)]
+
+# name -> [calls, total seconds, degenerate results], times include nested instrumented calls
+_statistics = {}
+# name -> number of fallback paths taken, only counted while enabled
+_fallbacks = {}
+_originals = []
+_callback = None
+
+
+def _wrap(name, function, degenerate):
+    '''Returns a wrapper of the function recording its calls under the name.'''
+    counters = _statistics.setdefault(name, [0, 0.0, 0])
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        fallbacks = _fallbacks.get(name, 0)
+        is_degenerate = True
+        start = time.perf_counter()
+        try:
+            result = function(*args, **kwargs)
+            is_degenerate = degenerate is not None and degenerate(result)
+            return result
+        finally:
+            elapsed = time.perf_counter() - start
+            is_degenerate = is_degenerate or _fallbacks.get(name, 0) != fallbacks
+            counters[0] += 1
+            counters[1] += elapsed
+            counters[2] += is_degenerate
+            if _callback is not None:
+                _callback(name, elapsed, is_degenerate)
+    return wrapper
+
+def record_fallback(name):
+    '''Marks the current call of the instrumented function with the name as degenerate, to be called from
+       fallback paths that do not show in the result, such as swallowed exceptions.'''
+    if _originals:
+        _fallbacks[name] = _fallbacks.get(name, 0) + 1
+
+def is_enabled():
+    '''Returns if instrumentation is currently enabled.'''
+    return bool(_originals)
+
+def enable(callback=None):
+    '''Starts counting and timing calls to the instrumented functions.
+       The optional callback is called after every call, including calls that raise, with the function name,
+       the elapsed seconds and whether the call was degenerate, such as an empty intersection.'''
+    global _callback
+    _callback = callback
+    if is_enabled():
+        return
+    for module_name, class_name, function_name, degenerate in TARGETS:
+        module = importlib.import_module('.' + module_name, __package__)
+        owner = module if class_name is None else getattr(module, class_name)
+        original = inspect.getattr_static(owner, function_name)
+        name = '.'.join(filter(None, [module_name, class_name, function_name]))
+        if isinstance(original, staticmethod):
+            replacement = staticmethod(_wrap(name, original.__func__, degenerate))
+        else:
+            replacement = _wrap(name, original, degenerate)
+        _originals.append((owner, function_name, original))
+        setattr(owner, function_name, replacement)
+
+def disable():
+    '''Restores the original functions. Collected statistics are kept until reset.'''
+    global _callback
+    while _originals:
+        owner, function_name, original = _originals.pop()
+        setattr(owner, function_name, original)
+    _callback = None
+
+def reset():
+    '''Clears the collected statistics.'''
+    for counters in _statistics.values():
+        counters[:] = [0, 0.0, 0]
+    _fallbacks.clear()
+
+def statistics():
+    '''Returns a dictionary of the calls, total seconds, mean seconds and degenerate results per called function.'''
+    return {name: {'calls': calls, 'total': total, 'mean': total / calls, 'degenerate': degenerate}
+            for name, (calls, total, degenerate) in _statistics.items() if calls}
+
+def report():
+    '''Returns the statistics as a table, sorted by total time.'''
+    lines = ['{:<52} {:>10} {:>12} {:>12} {:>10}'.format('function', 'calls', 'total [s]', 'mean [us]', 'degenerate')]
+    for name, entry in sorted(statistics().items(), key=lambda item: -item[1]['total']):
+        lines.append('{:<52} {:>10} {:>12.6f} {:>12.3f} {:>10}'.format(
+            name, entry['calls'], entry['total'], entry['mean'] * 1e6, entry['degenerate']))
+    return '\n'.join(lines)
+
+@contextmanager
+def instrumented(callback=None):
+    '''Context manager enabling instrumentation with freshly reset statistics, disabling it on exit.'''
+    reset()
+    enable(callback)
+    try:
+        yield
+    finally:
+        disable()
@@ -0,0 +1,129 @@
+'''Module converting between the Poincare Disk, the hyperboloid and the Klein models, with core operations on
+   the hyperboloid.
+
+   Hyperboloid points are (..., 3) arrays of (x, y, t) on the sheet x^2 + y^2 - t^2 = -1, t > 0, under the
+   Minkowski product <u, v> = u_x v_x + u_y v_y - u_t v_t. Disk coordinates crowd against the boundary, where
+   1 - |z|^2 cancels and points a small angle apart round onto the same boundary point. Hyperboloid coordinates
+   grow instead, and keep points around the same circle apart at any radius, so constructions should stay on the
+   hyperboloid and only be projected to the disk for output. Points along the same ray still lose their radial
+   separation far out, as x and t agree in their leading digits.
+   Geodesics are the planes through the origin, stored as their unit spacelike normals, and isometries are
+   3x3 Lorentz matrices.'''
+
+import numpy as np
+
+MINKOWSKI_METRIC = np.diag([1.0, 1.0, -1.0])
+
+
+def _squared_norm(coordinates):
+    return np.sum(np.square(coordinates), axis=-1)
+
+def disk_to_hyperboloid(coordinates):
+    '''Converts (..., 2) disk coordinates to (..., 3) hyperboloid coordinates.'''
+    coordinates = np.asarray(coordinates, dtype=np.float64)
+    squared_norm = _squared_norm(coordinates)
+    factor = 1.0 / (1.0 - squared_norm)
+    return np.concatenate([2.0 * factor[..., None] * coordinates, ((1.0 + squared_norm) * factor)[..., None]], axis=-1)
+
+def hyperboloid_to_disk(points):
+    '''Projects (..., 3) hyperboloid coordinates to (..., 2) disk coordinates.'''
+    points = np.asarray(points, dtype=np.float64)
+    return points[..., :2] / (1.0 + points[..., 2:])
+
+def disk_to_klein(coordinates):
+    '''Converts (..., 2) disk coordinates to (..., 2) Klein coordinates, in which geodesics are straight chords.'''
+    coordinates = np.asarray(coordinates, dtype=np.float64)
+    return 2.0 * coordinates / (1.0 + _squared_norm(coordinates))[..., None]
+
+def klein_to_disk(coordinates):
+    '''Converts (..., 2) Klein coordinates to (..., 2) disk coordinates.'''
+    coordinates = np.asarray(coordinates, dtype=np.float64)
+    return coordinates / (1.0 + np.sqrt(1.0 - _squared_norm(coordinates)))[..., None]
+
+def hyperboloid_to_klein(points):
+    '''Projects (..., 3) hyperboloid coordinates to (..., 2) Klein coordinates.'''
+    points = np.asarray(points, dtype=np.float64)
+    return points[..., :2] / points[..., 2:]
+
+def klein_to_hyperboloid(coordinates):
+    '''Converts (..., 2) Klein coordinates to (..., 3) hyperboloid coordinates.'''
+    coordinates = np.asarray(coordinates, dtype=np.float64)
+    t = 1.0 / np.sqrt(1.0 - _squared_norm(coordinates))
+    return np.concatenate([coordinates * t[..., None], t[..., None]], axis=-1)
+
+
+def minkowski_dot(u, v):
+    '''Minkowski product of (..., 3) arrays.'''
+    u, v = np.asarray(u, dtype=np.float64), np.asarray(v, dtype=np.float64)
+    return u[..., 0] * v[..., 0] + u[..., 1] * v[..., 1] - u[..., 2] * v[..., 2]
+
+def project(points):
+    '''Moves points back onto the hyperboloid by recomputing t from x and y, undoing accumulated rounding.'''
+    points = np.array(points, dtype=np.float64)
+    points[..., 2] = np.sqrt(1.0 + _squared_norm(points[..., :2]))
+    return points
+
+def distance(u, v):
+    '''Hyperbolic distances between hyperboloid points, either as 2 asinh(|u - v| / 2) from the Minkowski norm of
+       their difference or as acosh(-<u, v>). The first is used where its rounding error relative to the result,
+       about |u - v|^2 in the Euclidean norm, is the smaller one, that of the second being about 2 u_t v_t.'''
+    u, v = np.asarray(u, dtype=np.float64), np.asarray(v, dtype=np.float64)
+    difference = u - v
+    near = 2.0 * np.arcsinh(np.sqrt(np.maximum(minkowski_dot(difference, difference), 0.0)) / 2.0)
+    far = np.arccosh(np.maximum(-minkowski_dot(u, v), 1.0))
+    return np.where(_squared_norm(difference) < 2.0 * u[..., 2] * v[..., 2], near, far)
+
+def geodesic(u, v):
+    '''Returns the unit normals of the geodesics through pairs of hyperboloid points, Minkowski orthogonal to both.
+       The normal of a geodesic far from the origin has large components but a unit norm, so the norm is taken
+       from the identity <u x v, u x v> = <u, v>^2 - 1 = sinh(d)^2 rather than summed from the components.'''
+    normals = np.cross(u, v) @ MINKOWSKI_METRIC
+    return normals / np.sinh(distance(u, v))[..., None]
+
+def intersection(normal_a, normal_b):
+    '''Returns the hyperboloid points where pairs of geodesics, given by their normals, intersect.
+       Pairs of geodesics which do not intersect, or only at or beyond the boundary, give NaN coordinates.'''
+    points = np.cross(normal_a, normal_b) @ MINKOWSKI_METRIC
+    # -<a x b, a x b> = 1 - <a, b>^2 for unit normals, the squared sine of the angle between the geodesics
+    squared_norm = 1.0 - minkowski_dot(normal_a, normal_b)**2
+    with np.errstate(invalid='ignore', divide='ignore'):
+        scale = np.where(squared_norm > 0.0, np.sign(points[..., 2]) / np.sqrt(squared_norm), np.nan)
+    return points * scale[..., None]
+
+def signed_distance(points, normal):
+    '''Signed hyperbolic distances of hyperboloid points from a geodesic, positive on the side its normal points to.'''
+    return np.arcsinh(minkowski_dot(points, normal))
+
+
+def translation(point):
+    '''Lorentz boost moving the origin (0, 0, 1) to a hyperboloid point along the geodesic between them.'''
+    x, y, t = np.asarray(point, dtype=np.float64)
+    return np.array([[1.0 + x * x / (1.0 + t), x * y / (1.0 + t), x],
+                     [x * y / (1.0 + t), 1.0 + y * y / (1.0 + t), y],
+                     [x, y, t]])
+
+def rotation(angle):
+    '''Lorentz matrix rotating counter clockwise by the angle around the origin.'''
+    cos, sin = np.cos(angle), np.sin(angle)
+    return np.array([[cos, -sin, 0.0], [sin, cos, 0.0], [0.0, 0.0, 1.0]])
+
+def reflection(normal):
+    '''Lorentz matrix reflecting across a geodesic, given by its unit normal.'''
+    normal = np.asarray(normal, dtype=np.float64)
+    return np.eye(3) - 2.0 * np.outer(normal, normal @ MINKOWSKI_METRIC)
+
+def from_mobius(mobius):
+    '''Lorentz matrix of a Mobius transformation of the disk.
+       A disk point z corresponds to the Hermitian matrix [[t - 1, w], [conj(w), t + 1]] / 2, with w = x + iy,
+       on which the transformation acts by congruence, M X M^*. The constant part is invariant, leaving the
+       linear action on (x, y, t).'''
+    matrix = np.array([[mobius.a, mobius.b], [np.conj(mobius.b), np.conj(mobius.a)]])
+    columns = []
+    for x, y, t in np.eye(3):
+        image = matrix @ np.array([[t, x + 1j * y], [x - 1j * y, t]]) @ matrix.conj().T / 2.0
+        columns.append([2.0 * image[0, 1].real, 2.0 * image[0, 1].imag, (image[0, 0] + image[1, 1]).real])
+    return np.array(columns).T
+
+def apply(matrix, points):
+    '''Applies a Lorentz matrix, or a (..., 3, 3) stack of them, to (..., 3) hyperboloid coordinates.'''
+    return np.einsum('...ij,...j->...i', np.asarray(matrix, dtype=np.float64), np.asarray(points, dtype=np.float64))
@@ -0,0 +1,87 @@
+'''Module computing blocked, multi threaded pairwise hyperbolic distances between sets of points.'''
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from . arrays import _coordinate_array
+
+DEFAULT_BLOCK_SIZE = 512
+
+
+def _distance_block(coordinates_a, factors_a, coordinates_b, factors_b):
+    '''Hyperbolic distances between every pair of points in two blocks, given their conformal factors 1 - |p|^2.'''
+    squared_difference = np.subtract.outer(coordinates_a[:, 0], coordinates_b[:, 0])**2
+    squared_difference += np.subtract.outer(coordinates_a[:, 1], coordinates_b[:, 1])**2
+    squared_difference /= np.multiply.outer(factors_a, factors_b)
+    distances = np.arcsinh(np.sqrt(squared_difference, out=squared_difference), out=squared_difference)
+    distances *= 2.0
+    return distances
+
+def _blocks(size, block_size):
+    '''Splits a range of the given size into slices of at most block_size.'''
+    return [slice(start, min(start + block_size, size)) for start in range(0, size, block_size)]
+
+def _map_blocks(function, row_blocks, workers):
+    '''Calls the function on every block of rows, spread over a pool of threads.'''
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(row_blocks) == 1:
+        return [function(rows) for rows in row_blocks]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, row_blocks))
+
+
+def pairwise_distances(points_a, points_b=None, out=None, block_size=DEFAULT_BLOCK_SIZE, workers=None):
+    '''Returns the (N, M) matrix of hyperbolic distances between two sets of points, or within one set.
+       The matrix is computed in blocks of block_size x block_size on a pool of threads, and written into
+       'out' if given. 'out' may be an array, a numpy.memmap, or a filename to memory map the result to.'''
+    coordinates_a = _coordinate_array(points_a)
+    coordinates_b = coordinates_a if points_b is None else _coordinate_array(points_b)
+    factors_a, factors_b = 1.0 - np.sum(coordinates_a**2, axis=1), 1.0 - np.sum(coordinates_b**2, axis=1)
+
+    shape = (len(coordinates_a), len(coordinates_b))
+    if out is None:
+        out = np.empty(shape)
+    elif isinstance(out, (str, os.PathLike)):
+        out = np.memmap(out, dtype=np.float64, mode='w+', shape=shape)
+    elif out.shape != shape:
+        raise ValueError('Output must be of shape {}.'.format(shape))
+
+    column_blocks = _blocks(shape[1], block_size)
+    def fill_rows(rows):
+        for columns in column_blocks:
+            out[rows, columns] = _distance_block(coordinates_a[rows], factors_a[rows],
+                                                 coordinates_b[columns], factors_b[columns])
+
+    _map_blocks(fill_rows, _blocks(shape[0], block_size), workers)
+    return out
+
+def nearest_k(points_a, points_b, k, block_size=DEFAULT_BLOCK_SIZE, workers=None):
+    '''Returns (N, k) arrays of indices into points_b and hyperbolic distances of the k points nearest to every
+       point in points_a, nearest first. Only one block of the distance matrix per thread is kept in memory.'''
+    coordinates_a, coordinates_b = _coordinate_array(points_a), _coordinate_array(points_b)
+    factors_a, factors_b = 1.0 - np.sum(coordinates_a**2, axis=1), 1.0 - np.sum(coordinates_b**2, axis=1)
+    k = min(k, len(coordinates_b))
+    column_blocks = _blocks(len(coordinates_b), block_size)
+
+    def nearest_in_rows(rows):
+        best_indices = np.empty((len(coordinates_a[rows]), 0), dtype=np.intp)
+        best_distances = np.empty((len(coordinates_a[rows]), 0))
+        for columns in column_blocks:
+            distances = _distance_block(coordinates_a[rows], factors_a[rows],
+                                        coordinates_b[columns], factors_b[columns])
+            indices = np.broadcast_to(np.arange(columns.start, columns.stop), distances.shape)
+            best_distances = np.concatenate([best_distances, distances], axis=1)
+            best_indices = np.concatenate([best_indices, indices], axis=1)
+            if best_distances.shape[1] > k:
+                keep = np.argpartition(best_distances, k - 1, axis=1)[:, :k]
+                best_distances = np.take_along_axis(best_distances, keep, axis=1)
+                best_indices = np.take_along_axis(best_indices, keep, axis=1)
+        order = np.argsort(best_distances, axis=1)
+        return np.take_along_axis(best_indices, order, axis=1), np.take_along_axis(best_distances, order, axis=1)
+
+    results = _map_blocks(nearest_in_rows, _blocks(len(coordinates_a), block_size), workers)
+    if not results:
+        return np.empty((0, k), dtype=np.intp), np.empty((0, k))
+    return np.concatenate([result[0] for result in results]), np.concatenate([result[1] for result in results])
@@ -0,0 +1,120 @@
+'''Module describing stellated star patterns of the Poincare Disk, and building them on a pool of processes.
+
+   Patterns are small picklable descriptions. Every pattern splits into independent Star components, which are
+   built in separate processes and merged back in the order of the patterns and their components, so the lines
+   are the same, in the same order, whatever the number of workers.'''
+
+import os
+import math
+import concurrent.futures
+from collections import namedtuple
+
+from . hyperbolic import HyperbolicLine, HyperbolicPoint
+
+
+def stellated_star_lines(baseline, side_num, theta, rotation=0):
+    '''Returns a list of hyperbolic lines creating a stellated star.
+       baseline - Hyperbolic line starting at one corner and ending at the center
+       side_num - The number of sides in the star
+       theta    - The angle of stellation, smaller angles give more accute angles.
+       rotation - Allows rotation of the star relative to the original baseline.
+    '''
+    radii = []
+    for i in range(side_num):
+        radii.append(baseline.line_at_angle(2 * i * math.pi / side_num + rotation, baseline.length()))
+
+    stellations = []
+    for i in range(side_num):
+        stellations.append(radii[i].line_at_angle(math.pi - theta, 5))
+        stellations.append(radii[(i + 1) % side_num].line_at_angle(math.pi + theta, 5))
+
+    stellation_lines = []
+    for i in range(side_num):
+        stellation_intersection1 = stellations[2*i].intersection(stellations[(2*i + 1) % (2 * side_num)])
+        stellation_intersection2 = stellations[2*i].intersection(stellations[(2*i + 3) % (2 * side_num)])
+
+        stellation_lines += [HyperbolicLine(stellation_intersection1, radii[i].end_points[1]),
+                             HyperbolicLine(stellation_intersection1, radii[(i + 1) % side_num].end_points[1]),
+                             HyperbolicLine(stellation_intersection2, radii[i].end_points[1]),
+                             HyperbolicLine(stellation_intersection2, radii[(i + 2) % side_num].end_points[1])]
+    return stellation_lines
+
+
+class Star(namedtuple('Star', 'baseline side_num theta rotation')):
+    '''Stellated star with side_num points, around the end of the baseline and through its start.
+       The smaller the stellation angle theta, the sharper the points.'''
+
+    def __new__(cls, baseline, side_num, theta, rotation=0.0):
+        return super(Star, cls).__new__(cls, baseline, side_num, theta, rotation)
+
+    def components(self):
+        '''Returns the independent parts of the pattern, the star itself.'''
+        return [self]
+
+    def lines(self, workers=1):
+        '''Returns the lines of the star, built like build does. A star is a single component, so it is always built
+           in this process whatever the number of workers.'''
+        return build([self], workers)[0]
+
+
+class Rosette(namedtuple('Rosette', 'major_side_num minor_side_num theta')):
+    '''Islamic rosette pattern around the origin, with a "major" star surrounded by major_side_num "minor" stars.
+       The minor stars touch the major star and each of their neighbours.'''
+
+    def radius_lengths(self):
+        '''Returns the hyperbolic radii of the bounding circles of the major and of the minor stars.'''
+        minor_cosh = math.cos(math.pi / self.major_side_num) / math.sin(2 * math.pi / self.minor_side_num)
+        if minor_cosh < 1.0:
+            raise ValueError('Minor stars with {} sides do not fit around a major star with {} sides.'.format(
+                self.minor_side_num, self.major_side_num))
+        minor_radius_length = math.acosh(minor_cosh)
+        major_radius_length = math.acosh(1 / math.tan(math.pi / self.major_side_num) /
+                                         math.tan(2 * math.pi / self.minor_side_num)) - minor_radius_length
+        return major_radius_length, minor_radius_length
+
+    def components(self):
+        '''Returns the major star followed by the minor stars, counter clockwise from the positive x axis.'''
+        major_radius_length, minor_radius_length = self.radius_lengths()
+        baseline = HyperbolicLine(HyperbolicPoint(math.tanh(major_radius_length / 2.0), 0), HyperbolicPoint(0, 0))
+        stars = [Star(baseline, self.major_side_num, self.theta)]
+        for i in range(self.major_side_num):
+            center_angle = 2 * i * math.pi / self.major_side_num
+            minor_center = baseline.line_at_angle(center_angle, major_radius_length + minor_radius_length).end_points[1]
+            minor_radius = baseline.line_at_angle(center_angle, major_radius_length).end_points[1]
+            stars.append(Star(HyperbolicLine(minor_radius, minor_center), self.minor_side_num, self.theta,
+                              math.pi / self.minor_side_num))
+        return stars
+
+    def lines(self, workers=1):
+        '''Returns the lines of all the stars, built on a pool of worker processes if workers is not one.'''
+        return build([self], workers)[0]
+
+
+def _star_lines(star):
+    return stellated_star_lines(*star)
+
+def build(patterns, workers=None):
+    '''Returns a list of lines for every pattern. The components of all the patterns are built together on a pool
+       of worker processes, one per core by default, and their lines concatenated in order. With a single worker
+       or a single component everything is built in this process.'''
+    components = [pattern.components() for pattern in patterns]
+    stars = [star for pattern_stars in components for star in pattern_stars]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(stars) <= 1:
+        star_lines = [_star_lines(star) for star in stars]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(workers, len(stars))) as executor:
+            star_lines = list(executor.map(_star_lines, stars, chunksize=max(1, len(stars) // (4 * workers))))
+
+    pattern_lines, position = [], 0
+    for pattern_stars in components:
+        lines = []
+        for star_index in range(position, position + len(pattern_stars)):
+            lines += star_lines[star_index]
+        pattern_lines.append(lines)
+        position += len(pattern_stars)
+    return pattern_lines
+
+def sweep(pattern, thetas, workers=None):
+    '''Returns a list of lines for the pattern at every stellation angle in thetas, built like build does.'''
+    return build([pattern._replace(theta=theta) for theta in thetas], workers)
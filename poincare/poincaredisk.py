@@ -1,39 +1,77 @@
-
-import math
-import bokeh.plotting
-
+from . euclidean import Point
 from . hyperbolic import HyperbolicLine, HyperbolicPoint
+from . backends import Backend, get_backend
+from . canonical import LineSet
+
+def _point_style(kwargs):
+    '''Style of the point a line collapses into, drawn in the color of the line.'''
+    return {'color': kwargs['line_color']} if 'line_color' in kwargs else {}
 
 class PoincareDiskModel():
-    def __init__(self):
-        self._plot = bokeh.plotting.figure(plot_width=600, plot_height=600, min_border=50,
-                                           x_range=(-1, 1), y_range=(-1, 1), tools=['zoom_in', 'zoom_out'], logo=None)
-        self._plot.arc(x=0.0, y=0.0, radius=1.0, start_angle=0.0, end_angle=2.0*math.pi)
+    def __init__(self, backend='bokeh', resolution=None, pixel_threshold=1.0, collapse=True, deduplicate=False,
+                 **kwargs):
+        '''Constructs the model on a rendering backend, given by name or as a Backend instance.
+           Keyword arguments are passed on to a backend given by name, such as 'buffered' for Bokeh or 'output' for
+           SVG, and are rejected for a Backend instance, which is already configured.
+           If a resolution, the number of pixels across the disk, is given, lines whose Euclidean extent is below
+           pixel_threshold pixels are collapsed into a single point, or skipped if 'collapse' is not set.
+           If 'deduplicate' is set, lines with the same end points as a line drawn before are skipped.'''
+        if isinstance(backend, Backend) and kwargs:
+            raise TypeError('Backend options {} cannot be applied to a Backend instance.'.format(sorted(kwargs)))
+        self._backend = backend if isinstance(backend, Backend) else get_backend(backend)(**kwargs)
+        self._min_extent = None if resolution is None else pixel_threshold * 2.0 / resolution
+        self._collapse = collapse
+        self._drawn_lines = LineSet() if deduplicate else None
+        self._backend.drawcircle(Point(0.0, 0.0), 1.0)
+
+    @property
+    def min_extent(self):
+        '''Euclidean extent below which lines are not drawn as lines, None if no resolution was given.'''
+        return self._min_extent
+
+    @property
+    def deduplicate(self):
+        '''Whether lines with the same end points as a line drawn before are skipped.'''
+        return self._drawn_lines is not None
+
+    @property
+    def backend(self):
+        '''The rendering backend.'''
+        return self._backend
 
     def drawpoint(self, point, **kwargs):
-        self._plot.circle(point.x, point.y, **kwargs)
+        self._backend.drawpoint(point, **kwargs)
 
     def drawline(self, hyperbolic_line, **kwargs):
-        if hyperbolic_line.is_a_straight_line:
-            self._plot.line(x=[hyperbolic_line.end_points[i].x for i in range(2)],
-                            y=[hyperbolic_line.end_points[i].y for i in range(2)], **kwargs)
+        if self._drawn_lines is not None:
+            if hyperbolic_line in self._drawn_lines:
+                return
+            self._drawn_lines.add(hyperbolic_line)
+        start_point, end_point = hyperbolic_line.end_points
+        # geodesic arcs are at most half circles, so their extent is bounded by the distance between the end points
+        if self._min_extent is not None and Point.distance(start_point, end_point) < self._min_extent:
+            if self._collapse:
+                self._backend.drawpoint((start_point + end_point) / 2, size=1, **_point_style(kwargs))
+        elif hyperbolic_line.is_a_straight_line:
+            self._backend.drawsegment(start_point, end_point, **kwargs)
         else:
             circle = hyperbolic_line.representation()
-            start_angle = (hyperbolic_line.end_points[0] - circle.center).azimuth()
-            end_angle = (hyperbolic_line.end_points[1] - circle.center).azimuth()
-            start_angle, end_angle = [angle if angle > 0 else angle + 2*math.pi for angle in [start_angle, end_angle]]
-            start_angle, end_angle = min(start_angle, end_angle), max(start_angle, end_angle)
-            if abs(end_angle - start_angle) > math.pi:
-                start_angle, end_angle = end_angle, start_angle
-
-            self._plot.arc(x=hyperbolic_line.representation().center.x,
-                           y=hyperbolic_line.representation().center.y,
-                           radius=hyperbolic_line.representation().radius,
-                           start_angle=start_angle, end_angle=end_angle, **kwargs)
+            self._backend.drawarc(circle.center, circle.radius, start_point, end_point, **kwargs)
+
+    def drawtiling(self, tiling, max_depth, **kwargs):
+        '''Draws the edges of a RegularTiling up to the given depth.
+           With a resolution set, tiles whose bounding circle is below the pixel threshold are culled with
+           everything beyond them.'''
+        min_radius = None if self._min_extent is None else self._min_extent / 2.0
+        for edge in tiling.edges(max_depth, min_radius):
+            self.drawline(edge, **kwargs)
+
+    def flush(self):
+        '''Draws anything buffered by the backend.'''
+        self._backend.flush()
 
     def show(self):
-        bokeh.plotting.show(self._plot)
+        self._backend.show()
 
     def save(self, filename):
-        bokeh.plotting.save(obj=self._plot, filename=filename)
-
+        self._backend.save(filename)
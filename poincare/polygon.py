@@ -0,0 +1,134 @@
+'''Module containing geodesic polygons of the Poincare Disk and batched point in polygon queries.
+
+   Orientation, convexity and containment are decided in the Klein model, where geodesics are straight chords,
+   so that the Euclidean tests on the Klein images of the vertices hold for the hyperbolic polygon.'''
+
+import math
+import cmath
+
+import numpy as np
+
+from . hyperbolic import HyperbolicPoint, HyperbolicLine
+from . arrays import _coordinate_array
+from . models import disk_to_klein
+from . spatial import HyperbolicKDTree
+
+
+def _crossings(klein_points, klein_vertices):
+    '''Boolean mask of the (N, 2) Klein points inside the polygon with the (n, 2) Klein vertices, by counting the
+       edges crossed by a ray from every point in the positive x direction.'''
+    x, y = klein_points[:, 0:1], klein_points[:, 1:2]
+    x0, y0 = klein_vertices[:, 0], klein_vertices[:, 1]
+    x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+    straddles = (y0 > y) != (y1 > y)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        crossing_x = x0 + (y - y0) * (x1 - x0) / (y1 - y0)
+    return np.count_nonzero(straddles & (x < crossing_x), axis=1) % 2 == 1
+
+
+class HyperbolicPolygon(object):
+    '''Polygon of the Poincare Disk bounded by geodesic edges between consecutive vertices.'''
+
+    def __init__(self, vertices):
+        '''Constructs a polygon from a sequence of at least three Points, in either orientation.'''
+        vertices = tuple(vertex if type(vertex) is HyperbolicPoint else HyperbolicPoint(vertex) for vertex in vertices)
+        if len(vertices) < 3:
+            raise ValueError('A polygon needs at least three vertices.')
+        if not all(vertex.is_in_unit_disk() for vertex in vertices):
+            raise ValueError('Vertices must be inside the unit disk.')
+        self._vertices = vertices
+        self._klein_vertices = disk_to_klein(np.array(vertices))
+        self._bounding_circle = None
+
+    @staticmethod
+    def from_lines(lines):
+        '''Constructs a polygon from a closed chain of HyperbolicLines, each starting where the previous one ends.'''
+        return HyperbolicPolygon([line.end_points[0] for line in lines])
+
+    @property
+    def vertices(self):
+        return self._vertices
+
+    def __len__(self):
+        return len(self._vertices)
+
+    def edges(self):
+        '''Returns the edges as a list of HyperbolicLines.'''
+        return [HyperbolicLine(p, q) for p, q in zip(self._vertices, self._vertices[1:] + self._vertices[:1])]
+
+    def is_counter_clockwise(self):
+        '''Returns if the vertices run counter clockwise, from the signed area of the polygon in the Klein model.'''
+        x, y = self._klein_vertices[:, 0], self._klein_vertices[:, 1]
+        return float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y)) > 0.0
+
+    def is_convex(self):
+        '''Returns if the polygon is convex, which it is exactly when its Klein image is.'''
+        edges = np.roll(self._klein_vertices, -1, axis=0) - self._klein_vertices
+        turns = edges[:, 0] * np.roll(edges[:, 1], -1) - edges[:, 1] * np.roll(edges[:, 0], -1)
+        return bool(np.all(turns >= 0.0) or np.all(turns <= 0.0))
+
+    def angles(self):
+        '''Returns the interior angles at the vertices, between zero and two pi.
+           Every vertex is moved to the origin, where the edges leave along straight rays, and the angle is
+           measured from the next edge to the previous one, counter clockwise for a counter clockwise polygon.'''
+        sign = 1.0 if self.is_counter_clockwise() else -1.0
+        angles = []
+        for previous, vertex, following in zip(self._vertices[-1:] + self._vertices[:-1], self._vertices,
+                                               self._vertices[1:] + self._vertices[:1]):
+            z1, z2, z3 = complex(*previous), complex(*vertex), complex(*following)
+            w1 = (z1 - z2) / (1.0 - z2.conjugate() * z1)
+            w3 = (z3 - z2) / (1.0 - z2.conjugate() * z3)
+            angles.append((sign * cmath.phase(w1 * w3.conjugate())) % (2.0 * math.pi))
+        return angles
+
+    def area(self):
+        '''Returns the hyperbolic area, the angle defect (n - 2) pi minus the sum of the interior angles.'''
+        return (len(self._vertices) - 2) * math.pi - math.fsum(self.angles())
+
+    def perimeter(self):
+        '''Returns the hyperbolic length of the boundary.'''
+        return math.fsum(p.distance(q) for p, q in zip(self._vertices, self._vertices[1:] + self._vertices[:1]))
+
+    def centroid(self):
+        '''Returns the hyperbolic barycenter of the vertices, the normalized sum of their hyperboloid positions,
+           which is the Einstein midpoint in the Klein model.'''
+        weights = 1.0 / np.sqrt(1.0 - np.sum(self._klein_vertices**2, axis=1))
+        klein_centroid = weights @ self._klein_vertices / np.sum(weights)
+        x, y = klein_centroid / (1.0 + math.sqrt(1.0 - float(np.dot(klein_centroid, klein_centroid))))
+        return HyperbolicPoint(float(x), float(y))
+
+    def bounding_circle(self):
+        '''Returns the hyperbolic center and radius of a circle containing the polygon, centered at the centroid.
+           Hyperbolic disks are convex, so the disk containing the vertices contains the whole polygon.'''
+        if self._bounding_circle is None:
+            center = self.centroid()
+            self._bounding_circle = center, max(center.distance(vertex) for vertex in self._vertices)
+        return self._bounding_circle
+
+    def contains(self, points):
+        '''Returns a boolean mask of the points inside the polygon, given as a Point, an iterable of Points,
+           a HyperbolicPointArray or an (N, 2) array. Points outside the bounding circle are rejected before the
+           edges are tested.'''
+        coordinates = _coordinate_array(points)
+        center, radius = self.bounding_circle()
+        circle = center.hyperbolic_circle(radius)
+        inside = np.sum((coordinates - circle.center)**2, axis=1) <= circle.radius**2
+        candidates = np.flatnonzero(inside)
+        inside[candidates] = _crossings(disk_to_klein(coordinates[candidates]), self._klein_vertices)
+        return inside
+
+
+def locate(points, polygons):
+    '''Returns for every point the index of the first polygon containing it, or -1 if there is none.
+       The points are indexed in a HyperbolicKDTree, so that every polygon only tests the points within its
+       bounding circle.'''
+    coordinates = _coordinate_array(points)
+    tree = HyperbolicKDTree(coordinates)
+    polygon_indices = np.full(len(coordinates), -1, dtype=np.intp)
+    for index, polygon in enumerate(polygons):
+        center, radius = polygon.bounding_circle()
+        candidates, _ = tree.within(center, radius)
+        candidates = candidates[polygon_indices[candidates] < 0]
+        inside = _crossings(disk_to_klein(coordinates[candidates]), polygon._klein_vertices)
+        polygon_indices[candidates[inside]] = index
+    return polygon_indices
@@ -0,0 +1,115 @@
+'''Module rendering pattern and tiling specs to files, as read from JSON or TOML files by python -m poincare.
+
+   A spec is a dictionary such as
+
+   {"pattern": {"type": "rosette", "major_side_num": 9, "minor_side_num": 9, "theta": 0.3},
+    "model": {"resolution": 600, "deduplicate": true},
+    "style": {"line_color": "navy"},
+    "backend": "svg", "backend_options": {"size": 600},
+    "output": "rosette.svg"}
+
+   'pattern' is a rosette (major_side_num, minor_side_num, theta), a star (side_num, theta, radius, the
+   hyperbolic distance of its points from the origin, and optionally rotation) or a tiling (p, q, depth and
+   optionally tolerance). 'model' holds PoincareDiskModel options, 'style' the keyword arguments of drawline and
+   'backend_options' those of the backend, which is 'svg' unless given. Only 'pattern' and 'output' are required.
+
+   The lines of a pattern only depend on the pattern, and for tilings on the resolution, so they are cached
+   under these parameters alone and changing anything else only redraws them. They are cached as the columns
+   the backends draw, end points, centers and radii, so that a re-render does not rebuild any HyperbolicLine.'''
+
+import os
+import json
+import math
+import concurrent.futures
+
+import numpy as np
+
+from . hyperbolic import HyperbolicLine, HyperbolicPoint
+from . tiling import RegularTiling
+from . patterns import Star, Rosette
+from . poincaredisk import PoincareDiskModel
+
+
+def load_specs(filename):
+    '''Returns the list of specs in a .json or .toml file, holding either one spec or a list of them under
+       'specs'. Relative outputs are taken relative to the directory of the file.'''
+    if filename.endswith('.toml'):
+        import tomllib
+        with open(filename, 'rb') as spec_file:
+            document = tomllib.load(spec_file)
+    else:
+        with open(filename) as spec_file:
+            document = json.load(spec_file)
+    specs = document['specs'] if 'specs' in document else [document]
+    directory = os.path.dirname(os.path.abspath(filename))
+    return [dict(spec, output=os.path.join(directory, spec['output'])) for spec in specs]
+
+
+def _pattern_lines(pattern, min_radius=None):
+    '''Returns the lines of a pattern description, as a list of HyperbolicLines.'''
+    kind = pattern['type']
+    if kind == 'rosette':
+        return Rosette(pattern['major_side_num'], pattern['minor_side_num'], pattern['theta']).lines()
+    if kind == 'star':
+        baseline = HyperbolicLine(HyperbolicPoint(math.tanh(pattern['radius'] / 2.0), 0), HyperbolicPoint(0, 0))
+        return Star(baseline, pattern['side_num'], pattern['theta'], pattern.get('rotation', 0.0)).lines()
+    if kind == 'tiling':
+        tiling = RegularTiling(pattern['p'], pattern['q'], pattern.get('tolerance', 1e-4))
+        return list(tiling.edges(pattern['depth'], min_radius))
+    raise ValueError('Unknown pattern type {!r}, available types are rosette, star and tiling.'.format(kind))
+
+def lines_to_array(lines):
+    '''Returns the (M, 7) array of the x0, y0, x1, y1 end points of HyperbolicLines followed by the x, y and radius
+       of the circles they are arcs of, with NaN centers and infinite radii for straight lines, as in a Scene.'''
+    rows = []
+    for line in lines:
+        (x0, y0), (x1, y1) = line.end_points
+        if line.is_a_straight_line:
+            rows.append((x0, y0, x1, y1, math.nan, math.nan, math.inf))
+        else:
+            circle = line.representation()
+            rows.append((x0, y0, x1, y1, circle.center.x, circle.center.y, circle.radius))
+    return np.array(rows, dtype=np.float64).reshape(-1, 7)
+
+def array_to_lines(array):
+    '''Returns the HyperbolicLines between the end points in an array of lines_to_array.'''
+    return [HyperbolicLine(HyperbolicPoint(x0, y0), HyperbolicPoint(x1, y1))
+            for x0, y0, x1, y1 in array[:, 0:4].tolist()]
+
+def draw_array(model, array, **style):
+    '''Draws the lines of an array of lines_to_array on a PoincareDiskModel, passing the segments and the arcs to
+       the columnar drawing methods of its backend at once. Lines only go through drawline, one by one, if the
+       model deduplicates or culls them.'''
+    if model.deduplicate or model.min_extent is not None:
+        for line in array_to_lines(array):
+            model.drawline(line, **style)
+        return
+    straight = np.isinf(array[:, 6])
+    segments, arcs = array[straight], array[~straight]
+    model.backend.drawsegments(segments[:, 0:2], segments[:, 2:4], **style)
+    model.backend.drawarcs(arcs[:, 4:6], arcs[:, 6], arcs[:, 0:2], arcs[:, 2:4], **style)
+
+def render(spec, cache=None):
+    '''Renders a spec to its output file, taking the geometry of the pattern from a GeometryCache if given.
+       Returns the output filename.'''
+    backend = spec.get('backend', 'svg')
+    model = PoincareDiskModel(backend=backend, **dict(spec.get('model', {}), **spec.get('backend_options', {})))
+    pattern = spec['pattern']
+    # the resolution only changes which tiles are culled
+    min_radius = None if model.min_extent is None or pattern['type'] != 'tiling' else model.min_extent / 2.0
+    compute = lambda: lines_to_array(_pattern_lines(pattern, min_radius))
+    array = compute() if cache is None else cache.array({'pattern': pattern, 'min_radius': min_radius}, compute)
+
+    draw_array(model, array, **spec.get('style', {}))
+    model.save(spec['output'])
+    return spec['output']
+
+def render_all(specs, cache=None, workers=None):
+    '''Renders specs on a pool of worker processes, one per core by default, sharing the cache.
+       Returns the output filenames in the order of the specs.'''
+    specs = list(specs)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(specs) <= 1:
+        return [render(spec, cache) for spec in specs]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=min(workers, len(specs))) as executor:
+        return list(executor.map(render, specs, [cache] * len(specs)))
@@ -0,0 +1,177 @@
+'''Module containing vectorized Riemannian operations of the Poincare Disk, for optimizing and clustering
+   embeddings of points in the disk.
+
+   Points are (..., 2) arrays of disk coordinates and tangent vectors (..., 2) arrays of Euclidean components,
+   measured at the point they are attached to, where the metric is lambda^2 times the Euclidean one with the
+   conformal factor lambda = 2 / (1 - |x|^2).'''
+
+import numpy as np
+
+from . hyperbolic import HyperbolicPoint
+from . arrays import HyperbolicPointArray, _coordinate_array
+from . models import disk_to_klein, klein_to_disk
+from . pairwise import _distance_block, _blocks, _map_blocks
+
+DEFAULT_EPSILON = 1e-5
+ASSIGNMENT_BLOCK_SIZE = 65536
+
+
+def _squared_norm(coordinates):
+    return np.sum(np.square(coordinates), axis=-1, keepdims=True)
+
+def conformal_factor(x):
+    '''Returns the (..., 1) conformal factors 2 / (1 - |x|^2) of the metric at the points.'''
+    return 2.0 / (1.0 - _squared_norm(np.asarray(x, dtype=np.float64)))
+
+def mobius_add(x, y):
+    '''Returns the Mobius sums x (+) y, the image of y under the isometry moving the origin to x.'''
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    xy, xx, yy = np.sum(x * y, axis=-1, keepdims=True), _squared_norm(x), _squared_norm(y)
+    return ((1.0 + 2.0 * xy + yy) * x + (1.0 - xx) * y) / (1.0 + 2.0 * xy + xx * yy)
+
+def distance(x, y):
+    '''Returns the (...) hyperbolic distances 2 artanh |(-x) (+) y|, as HyperbolicPoint.distance does.'''
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    squared_difference = np.sum(np.square(x - y), axis=-1)
+    conformal_factors = (1.0 - np.sum(np.square(x), axis=-1)) * (1.0 - np.sum(np.square(y), axis=-1))
+    return 2.0 * np.arcsinh(np.sqrt(squared_difference / conformal_factors))
+
+def exp_map(x, v):
+    '''Returns the points reached from the points x along the geodesics with initial velocities v, after unit
+       time: x (+) tanh(lambda_x |v| / 2) v / |v|.'''
+    x, v = np.asarray(x, dtype=np.float64), np.asarray(v, dtype=np.float64)
+    norms = np.sqrt(_squared_norm(v))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        steps = np.where(norms > 0.0, np.tanh(0.5 * conformal_factor(x) * norms) / norms, 0.0) * v
+    return mobius_add(x, steps)
+
+def log_map(x, y):
+    '''Returns the tangent vectors at the points x of the geodesics reaching the points y after unit time, the
+       inverse of exp_map: 2 / lambda_x artanh |w| w / |w|, with w = (-x) (+) y.'''
+    x = np.asarray(x, dtype=np.float64)
+    w = mobius_add(-x, y)
+    norms = np.sqrt(_squared_norm(w))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scales = np.where(norms > 0.0, 2.0 / conformal_factor(x) * np.arctanh(norms) / norms, 0.0)
+    return scales * w
+
+def riemannian_gradient(x, euclidean_gradient):
+    '''Rescales Euclidean gradients of a function at the points x into its Riemannian gradients,
+       dividing them by the squared conformal factor (1 - |x|^2)^2 / 4.'''
+    return np.asarray(euclidean_gradient, dtype=np.float64) / np.square(conformal_factor(x))
+
+def project(x, epsilon=DEFAULT_EPSILON):
+    '''Returns the points moved back radially inside the disk, to a Euclidean norm of at most 1 - epsilon.'''
+    x = np.asarray(x, dtype=np.float64)
+    norms = np.sqrt(_squared_norm(x))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(norms > 1.0 - epsilon, x / norms * (1.0 - epsilon), x)
+
+def gradient_step(x, euclidean_gradient, learning_rate, epsilon=DEFAULT_EPSILON):
+    '''Returns the points after one step of Riemannian gradient descent along the Euclidean gradients,
+       projected back inside the disk.'''
+    return project(exp_map(x, -learning_rate * riemannian_gradient(x, euclidean_gradient)), epsilon)
+
+
+def _einstein_midpoints(coordinates, weights, labels, count):
+    '''Weighted hyperbolic barycenters of the points with every label, as normalized sums of their hyperboloid
+       positions, a close first guess of their Frechet means.'''
+    klein = disk_to_klein(coordinates)
+    weights = weights / np.sqrt(1.0 - np.sum(klein**2, axis=1))
+    totals = np.bincount(labels, weights, minlength=count)
+    sums = np.stack([np.bincount(labels, weights * klein[:, 0], minlength=count),
+                     np.bincount(labels, weights * klein[:, 1], minlength=count)], axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return klein_to_disk(np.where(totals[:, np.newaxis] > 0.0, sums / totals[:, np.newaxis], 0.0))
+
+def frechet_means(points, labels, count=None, weights=None, max_iterations=100, tolerance=1e-12):
+    '''Returns a HyperbolicPointArray of the Frechet means, the minimizers of the weighted sums of squared
+       distances, of the points with each label in range(count), all computed at once. Labels without points get
+       the origin. Every mean starts at the Einstein midpoint of its points and takes Riemannian Newton steps,
+       until no mean moves more than the tolerance. Half the squared distance to a point at distance d has the
+       Hessian 1 along the geodesic to the point and d coth d across it, so the Hessian of the sum is a 2x2 matrix
+       accumulated alongside the gradient, the sum of the log maps.'''
+    coordinates = _coordinate_array(points)
+    labels = np.asarray(labels, dtype=np.intp)
+    count = int(labels.max()) + 1 if count is None and len(labels) else count or 0
+    weights = np.ones(len(coordinates)) if weights is None else np.asarray(weights, dtype=np.float64)
+    sums = lambda values: np.bincount(labels, values, minlength=count)
+    means = _einstein_midpoints(coordinates, weights, labels, count)
+    for _ in range(max_iterations):
+        # tangent vectors in orthonormal components, whose lengths are the distances
+        tangents = log_map(means[labels], coordinates) * conformal_factor(means)[labels]
+        distances = np.hypot(tangents[:, 0], tangents[:, 1])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            across = np.where(distances > 1e-8, distances / np.tanh(distances), 1.0)
+            directions = np.where(distances[:, np.newaxis] > 0.0, tangents / distances[:, np.newaxis], 0.0)
+        along = weights * (1.0 - across)
+        gradient_x, gradient_y = sums(weights * tangents[:, 0]), sums(weights * tangents[:, 1])
+        hessian_xx = sums(along * directions[:, 0]**2) + sums(weights * across)
+        hessian_xy = sums(along * directions[:, 0] * directions[:, 1])
+        hessian_yy = hessian_xx - sums(along * (directions[:, 0]**2 - directions[:, 1]**2))
+        determinants = hessian_xx * hessian_yy - hessian_xy**2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            steps = np.stack([hessian_yy * gradient_x - hessian_xy * gradient_y,
+                              hessian_xx * gradient_y - hessian_xy * gradient_x], axis=1) / determinants[:, np.newaxis]
+        steps[~(determinants > 0.0)] = 0.0
+        updated = exp_map(means, steps / conformal_factor(means))
+        moved = distance(means, updated)
+        means = updated
+        if not np.any(moved > tolerance):
+            break
+    return HyperbolicPointArray(means)
+
+def frechet_mean(points, weights=None, max_iterations=100, tolerance=1e-12):
+    '''Returns the Frechet mean of points, as a HyperbolicPoint.'''
+    coordinates = _coordinate_array(points)
+    x, y = frechet_means(coordinates, np.zeros(len(coordinates), dtype=np.intp), 1, weights, max_iterations,
+                         tolerance).coordinates[0]
+    return HyperbolicPoint(float(x), float(y))
+
+def _nearest_centers(coordinates, centers, workers):
+    '''Returns the index of the nearest center and the distance to it of every point, computed in blocks of
+       points on a pool of threads.'''
+    factors, center_factors = 1.0 - np.sum(coordinates**2, axis=1), 1.0 - np.sum(centers**2, axis=1)
+
+    def nearest_in_rows(rows):
+        distances = _distance_block(coordinates[rows], factors[rows], centers, center_factors)
+        nearest = np.argmin(distances, axis=1)
+        return nearest, distances[np.arange(len(nearest)), nearest]
+
+    results = _map_blocks(nearest_in_rows, _blocks(len(coordinates), ASSIGNMENT_BLOCK_SIZE), workers)
+    return np.concatenate([result[0] for result in results]), np.concatenate([result[1] for result in results])
+
+def kmeans(points, k, max_iterations=100, seed=0, workers=None):
+    '''Clusters points into k clusters around Frechet means, minimizing the sum of squared hyperbolic distances.
+       Centers are seeded by k-means++, and points assigned to their nearest center in blocks on a pool of
+       threads, one per core by default. Empty clusters are reseeded at the point farthest from its
+       center. Returns the centers as a HyperbolicPointArray and the (N,) labels.'''
+    coordinates = _coordinate_array(points)
+    if not 0 < k <= len(coordinates):
+        raise ValueError('The number of clusters must be between 1 and the number of points.')
+    rng = np.random.default_rng(seed)
+    centers = coordinates[[rng.integers(len(coordinates))]]
+    squared_distances = distance(coordinates, centers[0])**2
+    for _ in range(1, k):
+        total = squared_distances.sum()
+        index = rng.choice(len(coordinates), p=squared_distances / total) if total > 0.0 else \
+            rng.integers(len(coordinates))
+        centers = np.concatenate([centers, coordinates[[index]]])
+        squared_distances = np.minimum(squared_distances, distance(coordinates, coordinates[index])**2)
+
+    labels = None
+    for _ in range(max_iterations):
+        updated_labels, nearest_distances = _nearest_centers(coordinates, centers, workers)
+        sizes = np.bincount(updated_labels, minlength=k)
+        empty = np.flatnonzero(sizes == 0).tolist()
+        for point in np.argsort(nearest_distances)[::-1].tolist():
+            if not empty:
+                break
+            if sizes[updated_labels[point]] > 1:
+                sizes[updated_labels[point]] -= 1
+                updated_labels[point] = empty.pop()
+        if labels is not None and np.array_equal(labels, updated_labels):
+            break
+        labels = updated_labels
+        centers = frechet_means(coordinates, labels, k).coordinates
+    return HyperbolicPointArray(centers), labels
@@ -0,0 +1,196 @@
+'''Module persisting drawn scenes in a columnar binary format.
+
+   A scene is a directory holding one raw little endian array file per column and a JSON manifest with the
+   column types, the row counts and the styles. Points, lines and circles are stored with the index of their style:
+
+   points.f8          (N, 2) point coordinates        point_styles.i4   (N,)
+   end_points.f8      (M, 4) x0, y0, x1, y1 of lines  line_styles.i4    (M,)
+   centers.f8         (M, 2) centers of the arcs      radii.f8          (M,) radii, inf for straight segments
+   circles.f8         (K, 3) x, y, radius of circles  circle_styles.i4  (K,)
+'''
+
+import os
+import json
+
+import numpy as np
+
+from . euclidean import Point
+from . hyperbolic import HyperbolicLine, HyperbolicPoint
+from . backends import Backend
+from . arrays import HyperbolicPointArray, CircleArray
+from . poincaredisk import PoincareDiskModel
+
+FORMAT_VERSION = 1
+MANIFEST = 'scene.json'
+
+# column name -> (dtype, shape of a row)
+COLUMNS = {'points': ('<f8', (2,)), 'point_styles': ('<i4', ()),
+           'end_points': ('<f8', (4,)), 'centers': ('<f8', (2,)), 'radii': ('<f8', ()), 'line_styles': ('<i4', ()),
+           'circles': ('<f8', (3,)), 'circle_styles': ('<i4', ())}
+
+
+def _filename(path, column):
+    dtype, _ = COLUMNS[column]
+    return os.path.join(path, '{}.{}'.format(column, dtype[1:]))
+
+
+class SceneWriter(Backend):
+    '''Backend streaming everything drawn on it into a scene directory, buffering at most buffer_size rows per
+       column in memory. Draw on it through a PoincareDiskModel, as in PoincareDiskModel(backend=SceneWriter(path)).
+       The manifest is only written when the writer is closed or saved, so an unfinished scene cannot be loaded.'''
+
+    def __init__(self, path, buffer_size=65536):
+        os.makedirs(path, exist_ok=True)
+        self._path, self._buffer_size = path, buffer_size
+        self._files = {column: open(_filename(path, column), 'wb') for column in COLUMNS}
+        self._buffers = {column: [] for column in COLUMNS}
+        self._counts = {column: 0 for column in COLUMNS}
+        self._styles, self._style_ids = [], {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def _style_id(self, kwargs):
+        '''Index of a style in the manifest, adding it on first use.'''
+        key = tuple(sorted(kwargs.items()))
+        if key not in self._style_ids:
+            self._style_ids[key] = len(self._styles)
+            self._styles.append(dict(kwargs))
+        return self._style_ids[key]
+
+    def _append(self, **rows):
+        for column, row in rows.items():
+            self._buffers[column].append(row)
+        if len(self._buffers[next(iter(rows))]) >= self._buffer_size:
+            self.flush()
+
+    def drawpoint(self, point, **kwargs):
+        self._append(points=(point.x, point.y), point_styles=self._style_id(kwargs))
+
+    def drawsegment(self, start_point, end_point, **kwargs):
+        self._append(end_points=(start_point.x, start_point.y, end_point.x, end_point.y),
+                     centers=(np.nan, np.nan), radii=np.inf, line_styles=self._style_id(kwargs))
+
+    def drawarc(self, center, radius, start_point, end_point, **kwargs):
+        self._append(end_points=(start_point.x, start_point.y, end_point.x, end_point.y),
+                     centers=(center.x, center.y), radii=radius, line_styles=self._style_id(kwargs))
+
+    def drawcircle(self, center, radius, **kwargs):
+        self._append(circles=(center.x, center.y, radius), circle_styles=self._style_id(kwargs))
+
+    def flush(self):
+        '''Writes the buffered rows to the column files.'''
+        for column, buffer in self._buffers.items():
+            if buffer:
+                self._files[column].write(np.array(buffer, dtype=COLUMNS[column][0]).tobytes())
+                self._counts[column] += len(buffer)
+                buffer.clear()
+
+    def close(self):
+        '''Writes the remaining rows and the manifest, and closes the column files.'''
+        if self._files is None:
+            return
+        self.flush()
+        for column_file in self._files.values():
+            column_file.close()
+        self._files = None
+        manifest = {'version': FORMAT_VERSION, 'styles': self._styles,
+                    'columns': {column: {'dtype': dtype, 'shape': [self._counts[column]] + list(shape)}
+                                for column, (dtype, shape) in COLUMNS.items()}}
+        with open(os.path.join(self._path, MANIFEST), 'w') as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+
+    def save(self, filename=None):
+        '''Closes the writer. The scene is always written to its own directory, so the filename is ignored.'''
+        self.close()
+
+
+class Scene(object):
+    '''Scene loaded from a directory written by a SceneWriter. Columns are memory mapped read only, so loading
+       costs nothing until the data is used, and the array properties wrap the mapped columns without copying.'''
+
+    def __init__(self, path):
+        with open(os.path.join(path, MANIFEST)) as manifest_file:
+            manifest = json.load(manifest_file)
+        if manifest['version'] != FORMAT_VERSION:
+            raise ValueError('Unsupported scene format version {}.'.format(manifest['version']))
+        self.styles = manifest['styles']
+        self._columns = {}
+        for column, description in manifest['columns'].items():
+            shape = tuple(description['shape'])
+            if shape[0] == 0:
+                self._columns[column] = np.empty(shape, dtype=description['dtype'])
+            else:
+                self._columns[column] = np.memmap(_filename(path, column), dtype=description['dtype'],
+                                                  mode='r', shape=shape)
+
+    def column(self, name):
+        '''Returns a raw column, as a read only memory mapped array.'''
+        return self._columns[name]
+
+    @property
+    def points(self):
+        '''The points, as a HyperbolicPointArray.'''
+        return HyperbolicPointArray(self._columns['points'])
+
+    @property
+    def point_styles(self):
+        return self._columns['point_styles']
+
+    @property
+    def end_points(self):
+        '''The start and end points of the lines, as two HyperbolicPointArrays.'''
+        end_points = self._columns['end_points']
+        return HyperbolicPointArray(end_points[:, 0:2]), HyperbolicPointArray(end_points[:, 2:4])
+
+    @property
+    def is_a_straight_line(self):
+        '''Boolean mask of the lines drawn as straight segments.'''
+        return np.isinf(self._columns['radii'])
+
+    @property
+    def arcs(self):
+        '''The circles of the lines drawn as arcs, as a CircleArray, with NaN centers for straight segments.'''
+        return CircleArray(self._columns['centers'], self._columns['radii'])
+
+    @property
+    def line_styles(self):
+        return self._columns['line_styles']
+
+    @property
+    def circles(self):
+        '''The full circles, as a CircleArray.'''
+        circles = self._columns['circles']
+        return CircleArray(circles[:, 0:2], circles[:, 2])
+
+    @property
+    def circle_styles(self):
+        return self._columns['circle_styles']
+
+    def draw(self, target):
+        '''Draws the scene on a PoincareDiskModel or a Backend, grouped by style rather than in the order it was
+           written. On a Backend the scene is replayed raw, passing everything drawn in a style to the columnar
+           drawing methods at once. On a PoincareDiskModel the recorded unit circle is skipped, as the model draws
+           its own, and lines go through drawline if the model deduplicates or culls them.'''
+        model = target if isinstance(target, PoincareDiskModel) else None
+        backend = target if model is None else model.backend
+        through_model = model is not None and (model.deduplicate or model.min_extent is not None)
+        circles, end_points, centers, radii = [self._columns[column] for column in
+                                               ('circles', 'end_points', 'centers', 'radii')]
+        straight = self.is_a_straight_line
+        for style_id, style in enumerate(self.styles):
+            for x, y, radius in circles[self.circle_styles == style_id].tolist():
+                if model is None or style or (x, y, radius) != (0.0, 0.0, 1.0):
+                    backend.drawcircle(Point(x, y), radius, **style)
+            backend.drawpoints(self._columns['points'][self.point_styles == style_id], **style)
+            selected = self.line_styles == style_id
+            if through_model:
+                for x0, y0, x1, y1 in end_points[selected].tolist():
+                    model.drawline(HyperbolicLine(HyperbolicPoint(x0, y0), HyperbolicPoint(x1, y1)), **style)
+                continue
+            segments, arcs = selected & straight, selected & ~straight
+            backend.drawsegments(end_points[segments, 0:2], end_points[segments, 2:4], **style)
+            backend.drawarcs(centers[arcs], radii[arcs], end_points[arcs, 0:2], end_points[arcs, 2:4], **style)
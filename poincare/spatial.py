@@ -0,0 +1,159 @@
+'''Module containing a spatial index of HyperbolicPoints for nearest neighbour and radius queries.'''
+
+import math
+import heapq
+
+import numpy as np
+
+from . arrays import _coordinate_array
+
+
+def _distance_argument(query, coordinates):
+    '''Returns sinh(d / 2)^2 for the hyperbolic distances d between a query point and the coordinates,
+       a monotone function of the distance that is cheaper to compare.'''
+    squared_difference = np.sum((coordinates - query)**2, axis=1)
+    return squared_difference / (1.0 - np.sum(coordinates**2, axis=1)) / (1.0 - np.dot(query, query))
+
+def _distance(distance_argument):
+    '''Converts sinh(d / 2)^2 back into the hyperbolic distance d.'''
+    return 2.0 * np.arcsinh(np.sqrt(distance_argument))
+
+
+class HyperbolicKDTree(object):
+    '''Spatial index of points in the Poincare Disk, answering queries in the hyperbolic metric.
+       Points are kept in a kd-tree over their Euclidean coordinates. A node is pruned using a lower bound
+       of the hyperbolic distance to its bounding box, which grows as the box approaches the boundary.
+       Inserted points are scanned from a buffer until it is large enough to rebuild the tree.'''
+
+    def __init__(self, points=(), leaf_size=32):
+        '''Constructs the tree in bulk from the given points.'''
+        self._leaf_size = leaf_size
+        self._coordinates = _coordinate_array(points).copy()
+        self._build()
+
+    def __len__(self):
+        return len(self._coordinates)
+
+    def _build(self):
+        '''Builds the tree over all points, splitting boxes at the median of their widest side.'''
+        self._order = np.arange(len(self._coordinates))
+        self._built_size = len(self._coordinates)
+        lower, upper, start, end, children = [], [], [], [], []
+
+        stack = [(0, self._built_size, -1, 0)]
+        while stack:
+            node_start, node_end, parent, side = stack.pop()
+            node = len(start)
+            if parent >= 0:
+                children[parent][side] = node
+            indices = self._order[node_start:node_end]
+            coordinates = self._coordinates[indices]
+            node_lower, node_upper = coordinates.min(axis=0, initial=1.0), coordinates.max(axis=0, initial=-1.0)
+            lower.append(node_lower)
+            upper.append(node_upper)
+            start.append(node_start)
+            end.append(node_end)
+            children.append([-1, -1])
+
+            if node_end - node_start > self._leaf_size:
+                dimension = int(np.argmax(node_upper - node_lower))
+                middle = (node_end - node_start) // 2
+                partition = np.argpartition(coordinates[:, dimension], middle)
+                self._order[node_start:node_end] = indices[partition]
+                stack.append((node_start, node_start + middle, node, 0))
+                stack.append((node_start + middle, node_end, node, 1))
+
+        self._lower, self._upper = np.array(lower).reshape(-1, 2), np.array(upper).reshape(-1, 2)
+        self._start, self._end, self._children = np.array(start), np.array(end), np.array(children).reshape(-1, 2)
+        closest_to_origin = np.clip(0.0, self._lower, self._upper)
+        self._boundary_factor = 1.0 - np.sum(closest_to_origin**2, axis=1)
+        self._sorted_coordinates = self._coordinates[self._order]
+
+    def _lower_bound(self, nodes, query, query_factor):
+        '''Lower bound of sinh(d / 2)^2 between the query point and any point in the nodes.'''
+        closest = np.clip(query, self._lower[nodes], self._upper[nodes])
+        return np.sum((closest - query)**2, axis=-1) / self._boundary_factor[nodes] / query_factor
+
+    def insert(self, points):
+        '''Inserts points, returning their indices. The tree is rebuilt once a quarter of the points are unindexed.'''
+        coordinates = _coordinate_array(points)
+        first_index = len(self._coordinates)
+        self._coordinates = np.concatenate([self._coordinates, coordinates])
+        if len(self._coordinates) - self._built_size > max(self._leaf_size, self._built_size // 4):
+            self._build()
+        return np.arange(first_index, len(self._coordinates))
+
+    def _buffered(self, query):
+        '''Returns indices and distance arguments of the points inserted since the last build.'''
+        indices = np.arange(self._built_size, len(self._coordinates))
+        return indices, _distance_argument(query, self._coordinates[indices])
+
+    def _within(self, query, radius):
+        threshold = math.sinh(radius / 2.0)**2
+        query_factor = 1.0 - np.dot(query, query)
+        ranges, stack = [], [0] if self._built_size else []
+        while stack:
+            node = stack.pop()
+            if self._lower_bound(node, query, query_factor) > threshold:
+                continue
+            left, right = self._children[node]
+            if left < 0:
+                ranges.append(np.arange(self._start[node], self._end[node]))
+            else:
+                stack += [left, right]
+
+        positions = np.concatenate(ranges) if ranges else np.arange(0)
+        indices, arguments = self._buffered(query)
+        indices = np.concatenate([self._order[positions], indices])
+        arguments = np.concatenate([_distance_argument(query, self._sorted_coordinates[positions]), arguments])
+        mask = arguments <= threshold
+        return indices[mask], _distance(arguments[mask])
+
+    def _knn(self, query, k):
+        query_factor = 1.0 - np.dot(query, query)
+        best_indices, best_arguments = self._buffered(query)
+        heap = [(0.0, 0)] if self._built_size else []
+        while heap:
+            bound, node = heapq.heappop(heap)
+            if len(best_arguments) >= k and bound > best_arguments.max():
+                break
+            left, right = self._children[node]
+            if left < 0:
+                positions = slice(self._start[node], self._end[node])
+                best_indices = np.concatenate([best_indices, self._order[positions]])
+                best_arguments = np.concatenate([best_arguments,
+                                                 _distance_argument(query, self._sorted_coordinates[positions])])
+                if len(best_arguments) > k:
+                    keep = np.argpartition(best_arguments, k - 1)[:k]
+                    best_indices, best_arguments = best_indices[keep], best_arguments[keep]
+            else:
+                for child, child_bound in zip((left, right), self._lower_bound([left, right], query, query_factor)):
+                    heapq.heappush(heap, (child_bound, child))
+
+        order = np.argsort(best_arguments)[:k]
+        return best_indices[order], _distance(best_arguments[order])
+
+    def within(self, point, radius):
+        '''Returns the indices and hyperbolic distances of all points within the hyperbolic radius of a point.'''
+        return self._within(_coordinate_array(point)[0], radius)
+
+    def knn(self, point, k):
+        '''Returns the indices and hyperbolic distances of the k points nearest to a point, nearest first.'''
+        return self._knn(_coordinate_array(point)[0], k)
+
+    def nearest(self, point):
+        '''Returns the index and hyperbolic distance of the point nearest to a point.'''
+        indices, distances = self.knn(point, 1)
+        return int(indices[0]), float(distances[0])
+
+    def query_within(self, points, radius):
+        '''Batched radius query, returning a list of (indices, distances) pairs, one per query point.'''
+        return [self._within(query, radius) for query in _coordinate_array(points)]
+
+    def query_knn(self, points, k):
+        '''Batched k nearest neighbours query, returning (M, k) arrays of indices and hyperbolic distances.'''
+        results = [self._knn(query, k) for query in _coordinate_array(points)]
+        k = min(k, len(self))
+        indices = np.array([result[0] for result in results], dtype=np.intp).reshape(-1, k)
+        distances = np.array([result[1] for result in results]).reshape(-1, k)
+        return indices, distances
@@ -0,0 +1,46 @@
+'''Test suite to test the vectorized point arrays against their scalar counterparts.'''
+
+import math
+
+from poincare.euclidean import Point
+from poincare.hyperbolic import HyperbolicPoint
+from poincare.arrays import PointArray, HyperbolicPointArray
+
+TEST_THRESHOLD = 10e-12
+APPROX_TEST_THRESHOLD = 10e-3
+
+POINTS = [HyperbolicPoint(0.1, -0.5), HyperbolicPoint(0.2, 0.6), HyperbolicPoint(0.4, 0.8), HyperbolicPoint(0, 0)]
+
+def test_point_array():
+    '''Test the PointArray class'''
+    points = PointArray.from_points([Point(5.0, 6), Point(1, 1)])
+    anchor = Point(5, 4.0)
+    assert points.to_points() == [Point(5.0, 6.0), Point(1.0, 1.0)]
+    assert abs(points.distance(anchor)[0] - 2.0) < TEST_THRESHOLD
+    assert abs((points * anchor)[0] - 49.0) < TEST_THRESHOLD
+    assert (points.rotated_point(anchor, math.pi / 2)[0] - Point(3, 4)).distance_to_origin() < TEST_THRESHOLD
+    assert ((points / 4)[1] - Point(0.25, 0.25)).distance_to_origin() < TEST_THRESHOLD
+
+def test_hyperbolic_point_array():
+    '''Test the HyperbolicPointArray class'''
+    points = HyperbolicPointArray.from_points(POINTS)
+    assert isinstance(points[0], HyperbolicPoint)
+    assert points.is_in_unit_disk().all()
+
+    for i, point in enumerate(POINTS):
+        assert abs(points.distance_to_origin()[i] - point.distance_to_origin()) < TEST_THRESHOLD
+        assert points.polar_line()[i] == point.polar_line()
+        circle = point.hyperbolic_circle(1)
+        assert abs(points.hyperbolic_circle(1).radii[i] - circle.radius) < TEST_THRESHOLD
+        assert (points.hyperbolic_circle(1)[i].center - circle.center).distance_to_origin() < TEST_THRESHOLD
+        assert abs(points.distance(POINTS[0])[i] - POINTS[0].distance(point)) < APPROX_TEST_THRESHOLD
+
+    assert abs(points.distance(points[::-1])[0] - 1.12519) < APPROX_TEST_THRESHOLD
+    assert (points[:3].inverse()[0] - POINTS[0].inverse()).distance_to_origin() < TEST_THRESHOLD
+
+if __name__ == '__main__':
+    print('Testing PointArray class...')
+    test_point_array()
+    print('Testing HyperbolicPointArray class...')
+    test_hyperbolic_point_array()
+    print('All tests passed successfully.')
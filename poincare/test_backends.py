@@ -0,0 +1,130 @@
+'''Test suite to test the rendering backends of the Poincare Disk model.'''
+
+import io
+import os
+import sys
+import math
+import subprocess
+
+import numpy as np
+
+from poincare.hyperbolic import HyperbolicLine, HyperbolicPoint
+from poincare.poincaredisk import PoincareDiskModel
+from poincare.backends.svg import SVGBackend
+from poincare.backends.bokeh_backend import _arc_angles
+
+TEST_THRESHOLD = 10e-12
+
+def test_arc_angles():
+    '''Test the vectorized arc angles against the arc end points'''
+    lines = [HyperbolicLine(HyperbolicPoint(0.1, -0.5), HyperbolicPoint(0.2, 0.6)),
+             HyperbolicLine(HyperbolicPoint(0.2, 0.6), HyperbolicPoint(0.1, -0.5)),
+             HyperbolicLine(HyperbolicPoint(-0.7, 0.1), HyperbolicPoint(-0.6, -0.2)),
+             HyperbolicLine(HyperbolicPoint(0.3, 0.3), HyperbolicPoint(0.5, -0.1))]
+    circles = [line.representation() for line in lines]
+    centers = np.array([circle.center for circle in circles])
+    start_angles, end_angles = _arc_angles(centers, np.array([line.end_points[0] for line in lines]),
+                                           np.array([line.end_points[1] for line in lines]))
+
+    for line, circle, start_angle, end_angle in zip(lines, circles, start_angles, end_angles):
+        arc_ends = [circle.center + HyperbolicPoint(math.cos(angle), math.sin(angle)) * circle.radius
+                    for angle in [start_angle, end_angle]]
+        assert min(arc_ends[0].distance(p) for p in line.end_points) < TEST_THRESHOLD
+        assert min(arc_ends[1].distance(p) for p in line.end_points) < TEST_THRESHOLD
+        # the arc runs counter clockwise from start to end and stays inside the disk
+        middle_angle = start_angle + ((end_angle - start_angle) % (2 * math.pi)) / 2
+        middle = circle.center + HyperbolicPoint(math.cos(middle_angle), math.sin(middle_angle)) * circle.radius
+        assert middle.distance_to_origin() < 1.0
+
+def test_svg_backend():
+    '''Test that the SVG backend streams one element per drawn object'''
+    output = io.StringIO()
+    model = PoincareDiskModel(backend='svg', output=output, size=200)
+    model.drawline(HyperbolicLine(HyperbolicPoint(0.1, -0.5), HyperbolicPoint(0.2, 0.6)), line_color='red')
+    assert '<path d="M 109.000 145.000 A' in output.getvalue()
+    model.drawline(HyperbolicLine(HyperbolicPoint(-0.5, 0), HyperbolicPoint(0.5, 0)))
+    model.drawpoint(HyperbolicPoint(0, 0), size=6)
+    model.save(None)
+
+    lines = output.getvalue().splitlines()
+    assert lines[0].startswith('<svg') and lines[-1] == '</svg>'
+    assert [line.split()[0] for line in lines[1:-1]] == ['<circle', '<path', '<line', '<circle']
+    assert 'stroke="red"' in lines[2] and 'r="3.0"' in lines[4]
+
+def test_backend_instance():
+    '''Test that a Backend instance is used as is, and that backend options given along with it are rejected'''
+    backend = SVGBackend(output=io.StringIO())
+    assert PoincareDiskModel(backend=backend).backend is backend
+    try:
+        PoincareDiskModel(backend=backend, size=200)
+    except TypeError:
+        pass
+    else:
+        assert False
+
+def test_culling():
+    '''Test that lines below a pixel are collapsed into points or skipped'''
+    lines = [HyperbolicLine(HyperbolicPoint(0.1, -0.5), HyperbolicPoint(0.2, 0.6)),
+             HyperbolicLine(HyperbolicPoint(0.99, 0), HyperbolicPoint(0.99, 0.001))]
+    for collapse, expected_elements in [(True, ['<circle', '<path', '<circle']), (False, ['<circle', '<path'])]:
+        output = io.StringIO()
+        model = PoincareDiskModel(backend='svg', output=output, resolution=500, collapse=collapse)
+        for line in lines:
+            model.drawline(line)
+        model.save(None)
+        assert [line.split()[0] for line in output.getvalue().splitlines()[1:-1]] == expected_elements
+
+def test_deduplication():
+    '''Test that lines already drawn, in either direction, are skipped'''
+    line = HyperbolicLine(HyperbolicPoint(0.1, -0.5), HyperbolicPoint(0.2, 0.6))
+    reversed_line = HyperbolicLine(HyperbolicPoint(0.2, 0.6 + 1e-12), HyperbolicPoint(0.1, -0.5))
+    for deduplicate, expected_elements in [(True, ['<circle', '<path']), (False, ['<circle', '<path', '<path'])]:
+        output = io.StringIO()
+        model = PoincareDiskModel(backend='svg', output=output, deduplicate=deduplicate)
+        model.drawline(line)
+        model.drawline(reversed_line)
+        model.save(None)
+        assert [line.split()[0] for line in output.getvalue().splitlines()[1:-1]] == expected_elements
+
+def test_buffered_bokeh_backend():
+    '''Test that the buffered Bokeh backend draws one glyph per kind and style when flushed'''
+    model = PoincareDiskModel(buffered=True)
+    for i in range(5):
+        model.drawline(HyperbolicLine(HyperbolicPoint(0.1 * i, -0.5), HyperbolicPoint(0.2, 0.6)), line_color='red')
+        model.drawline(HyperbolicLine(HyperbolicPoint(0.1 * i, -0.4), HyperbolicPoint(0.3, 0.5)), line_dash=[4, 4])
+        model.drawline(HyperbolicLine(HyperbolicPoint(-0.5, 0.1 * i), HyperbolicPoint(0.5, 0.1 * i)))
+        model.drawpoint(HyperbolicPoint(0.1 * i, 0), size=4)
+    # only the unit circle is drawn before flushing
+    assert len(model.backend.plot.renderers) == 1
+    model.flush()
+
+    glyphs = [(type(renderer.glyph).__name__, len(next(iter(renderer.data_source.data.values()))))
+              for renderer in model.backend.plot.renderers[1:]]
+    # the horizontal line through the origin is a segment, the other lines arcs in three styles
+    assert sorted(glyphs) == [('Arc', 4), ('Arc', 5), ('Arc', 5), ('Scatter', 5), ('Segment', 1)]
+    assert [renderer.glyph.line_dash for renderer in model.backend.plot.renderers].count([4, 4]) == 1
+    model.flush()
+    assert len(model.backend.plot.renderers) == 6
+
+def test_lazy_imports():
+    '''Test that importing the package imports neither NumPy nor a plotting library'''
+    script = 'import sys, poincare; print(sorted({"numpy", "bokeh"} & set(sys.modules)))'
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    assert subprocess.check_output([sys.executable, '-c', script], cwd=root).decode().strip() == '[]'
+
+if __name__ == '__main__':
+    print('Testing arc angles...')
+    test_arc_angles()
+    print('Testing SVG backend...')
+    test_svg_backend()
+    print('Testing backend instances...')
+    test_backend_instance()
+    print('Testing culling...')
+    test_culling()
+    print('Testing deduplication...')
+    test_deduplication()
+    print('Testing buffered Bokeh backend...')
+    test_buffered_bokeh_backend()
+    print('Testing lazy imports...')
+    test_lazy_imports()
+    print('All tests passed successfully.')
@@ -0,0 +1,58 @@
+'''Test suite to test the on disk geometry cache.'''
+
+import os
+import tempfile
+
+import numpy as np
+
+from poincare.cache import GeometryCache, cache_key, CACHE_VERSION
+
+def test_cache_key():
+    '''Test keys ignore the order of dict keys, but not the values'''
+    assert cache_key({'p': 7, 'q': 3}) == cache_key({'q': 3, 'p': 7})
+    assert cache_key({'p': 7, 'q': 3}) != cache_key({'p': 3, 'q': 7})
+    assert cache_key({'p': 7, 'q': 3}) != cache_key({'p': 7, 'q': 3}, CACHE_VERSION + 1)
+
+def test_get_and_put():
+    '''Test arrays are cached under their parameters and computed only on a miss'''
+    with tempfile.TemporaryDirectory() as path:
+        cache = GeometryCache(path)
+        assert cache.get({'p': 7}) is None
+        array = np.arange(12.0).reshape(3, 4)
+        calls = []
+        compute = lambda: calls.append(1) or array
+        for _ in range(3):
+            assert np.array_equal(cache.array({'p': 7}, compute), array)
+        assert len(calls) == 1 and len(cache) == 1 and {'p': 7} in cache
+        cache.clear()
+        assert len(cache) == 0
+
+def test_eviction():
+    '''Test the least recently used entries are evicted, keeping the entry just written'''
+    with tempfile.TemporaryDirectory() as path:
+        array = np.zeros((100, 4))
+        cache = GeometryCache(path, max_size=1)
+        entry_size = None
+        for index in range(3):
+            cache.put({'index': index}, array)
+            entry_size = entry_size or cache.size()
+        assert len(cache) == 1 and {'index': 2} in cache
+
+        cache = GeometryCache(path, max_size=3 * entry_size)
+        cache.clear()
+        for index in range(3):
+            cache.put({'index': index}, array)
+            os.utime(os.path.join(path, cache_key({'index': index}) + '.npy'), (index, index))
+        cache.get({'index': 0})
+        cache.put({'index': 3}, array)
+        assert {'index': 0} in cache and {'index': 1} not in cache
+        assert len(cache) == 3 and cache.size() <= cache.max_size
+
+if __name__ == '__main__':
+    print('Testing cache keys...')
+    test_cache_key()
+    print('Testing cached arrays...')
+    test_get_and_put()
+    print('Testing eviction...')
+    test_eviction()
+    print('All tests passed successfully.')
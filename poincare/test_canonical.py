@@ -0,0 +1,49 @@
+'''Test suite to test the canonicalization of points and lines.'''
+
+from poincare.euclidean import Point
+from poincare.hyperbolic import HyperbolicLine, HyperbolicPoint, Mobius
+from poincare.tiling import RegularTiling
+from poincare.canonical import PointSet, LineSet
+
+TEST_THRESHOLD = 10e-12
+
+def test_point_set():
+    '''Test insert-or-get and the set operations of points equal up to the tolerance'''
+    points = PointSet([Point(0.5, 0.5), Point(0.1, 0.2)], tolerance=1e-6)
+    # points on either side of a cell boundary are still found
+    assert points.canonical(Point(0.5 + 4e-7, 0.5 - 4e-7)) == Point(0.5, 0.5)
+    assert points.canonical(Point(0.1, 0.2 + 2e-6)) == Point(0.1, 0.2 + 2e-6)
+    assert len(points) == 3 and Point(0.1, 0.2 + 2.5e-6) in points and Point(0.3, 0.3) not in points
+
+    others = PointSet([Point(0.5, 0.5 + 1e-7), Point(0.7, 0.7)], tolerance=1e-6)
+    assert list(points & others) == [Point(0.5, 0.5)]
+    assert list(points - others) == [Point(0.1, 0.2), Point(0.1, 0.2 + 2e-6)]
+    assert len(points | others) == 4 and (points & others) <= others
+    points.discard(Point(0.5, 0.5 + 1e-7))
+    assert len(points) == 2 and Point(0.5, 0.5) not in points
+
+def test_line_set():
+    '''Test that tiling edges built from every tile are reduced to the edges of the tiling'''
+    tiling = RegularTiling(7, 3)
+    edges = [HyperbolicLine(polygon[k], polygon[(k + 1) % 7]) for polygon in tiling.polygons(3) for k in range(7)]
+    lines = LineSet(edges)
+    assert len(edges) == 595 and len(lines) == len(list(tiling.edges(3))) == 399
+    assert all(lines.canonical(edge) in lines for edge in edges)
+
+    p1, p2, p3 = HyperbolicPoint(0.1, -0.5), HyperbolicPoint(0.2, 0.6), HyperbolicPoint(-0.3, 0.1)
+    lines = LineSet([HyperbolicLine(p1, p2)])
+    assert HyperbolicLine(p2, p1) in lines and HyperbolicLine(p1, p3) not in lines
+    # points on a diameter, moved onto a curved geodesic
+    translation = Mobius.translation_from_origin(HyperbolicPoint(0.3, 0.4))
+    p1, p2, p3 = [translation(HyperbolicPoint(x, -x)) for x in (-0.5, 0.2, 0.6)]
+    geodesics = LineSet([HyperbolicLine(p1, p2)], geodesics=True)
+    assert HyperbolicLine(p3, p2) in geodesics
+    assert HyperbolicLine(p1, translation(HyperbolicPoint(0, 0.1))) not in geodesics
+    assert HyperbolicLine(p3, p2) not in LineSet([HyperbolicLine(p1, p2)])
+
+if __name__ == '__main__':
+    print('Testing PointSet class...')
+    test_point_set()
+    print('Testing LineSet class...')
+    test_line_set()
+    print('All tests passed successfully.')
@@ -0,0 +1,79 @@
+'''Test suite to test hyperbolic Delaunay triangulations and Voronoi diagrams.'''
+
+import numpy as np
+
+from poincare.hyperbolic import HyperbolicPoint
+from poincare.testing import random_points
+from poincare.delaunay import DelaunayTriangulation
+
+TEST_THRESHOLD = 10e-12
+
+def test_delaunay():
+    '''Test triangles have empty hyperbolic circumcircles and edges include every nearest neighbour'''
+    points = random_points(300)
+    triangulation = DelaunayTriangulation(points)
+    edges = set(map(tuple, np.sort(triangulation.edges, axis=1).tolist()))
+    for triangle, center in zip(triangulation.triangles, triangulation.circumcenters().coordinates):
+        distances = points.distance(center)
+        assert np.ptp(distances[triangle]) < 10e-9
+        assert distances.min() > distances[triangle].min() - 10e-9
+        assert all(tuple(sorted((triangle[k], triangle[(k + 1) % 3]))) in edges for k in range(3))
+
+    for index, point in enumerate(points.coordinates):
+        distances = points.distance(point)
+        distances[index] = np.inf
+        assert tuple(sorted((index, int(np.argmin(distances))))) in edges
+
+    for triangle, neighbors in zip(triangulation.triangles, triangulation.neighbors):
+        for k, neighbor in enumerate(neighbors):
+            if neighbor >= 0:
+                assert set(triangle) - {triangle[k]} <= set(triangulation.triangles[neighbor])
+
+    indptr, indices = triangulation.point_neighbors()
+    assert len(indices) == 2 * len(edges)
+    assert all(np.all(np.diff(indices[indptr[i]:indptr[i + 1]]) > 0) for i in range(len(points)))
+    assert all(polygon.is_counter_clockwise() for polygon in triangulation.polygons())
+
+def test_voronoi():
+    '''Test points lie in the cell of their nearest site, and ridges are equidistant from their sites'''
+    sites = random_points(200, seed=1)
+    voronoi = DelaunayTriangulation(sites).voronoi()
+    cells = voronoi.cells()
+    for point in random_points(1000, seed=2).coordinates:
+        site = int(np.argmin(sites.distance(point)))
+        if cells[site] is not None:
+            assert cells[site].contains(point[np.newaxis])[0]
+    assert 0 < np.count_nonzero(voronoi.bounded) < len(sites)
+
+    for line, (a, b) in zip(voronoi.ridge_lines(), voronoi.ridge_points):
+        for end_point in line.end_points:
+            assert abs(end_point.distance(sites[a]) - end_point.distance(sites[b])) < 10e-9
+    finite = voronoi.ridge_vertices >= 0
+    assert np.all(np.isnan(voronoi.ideal_points[finite]))
+    assert np.all(np.abs(np.hypot(*np.moveaxis(voronoi.ideal_points[~finite], -1, 0)) - 1.0) < TEST_THRESHOLD)
+
+def test_small_sets():
+    '''Test two points, repeated points and points too far apart to share a triangle'''
+    two = DelaunayTriangulation([HyperbolicPoint(0.5, 0.0), HyperbolicPoint(-0.5, 0.1)])
+    assert len(two) == 0 and two.edges.tolist() in ([[0, 1]], [[1, 0]])
+    voronoi = two.voronoi()
+    assert voronoi.ridge_vertices.tolist() == [[-1, -1]] and not np.any(voronoi.bounded)
+    assert len(voronoi.ridge_lines()) == 1
+
+    repeated = DelaunayTriangulation([HyperbolicPoint(0.1, 0.2), HyperbolicPoint(-0.3, 0.1),
+                                      HyperbolicPoint(0.1, 0.2), HyperbolicPoint(0.2, -0.4)])
+    assert len(repeated) == 1 and 2 not in repeated.triangles
+    assert len(DelaunayTriangulation([]).edges) == 0
+
+    # the circumcircle of the three points leaves the disk, as does every empty circle through the first two
+    far = DelaunayTriangulation([HyperbolicPoint(0.5, 0.6), HyperbolicPoint(0.5, -0.6), HyperbolicPoint(-0.1, 0.0)])
+    assert len(far) == 0 and sorted(map(sorted, far.edges.tolist())) == [[0, 2], [1, 2]]
+
+if __name__ == '__main__':
+    print('Testing Delaunay triangulations...')
+    test_delaunay()
+    print('Testing Voronoi diagrams...')
+    test_voronoi()
+    print('Testing small point sets...')
+    test_small_sets()
+    print('All tests passed successfully.')
@@ -0,0 +1,62 @@
+'''Test suite to test the discretization of geodesics, circles and polygons into polylines.'''
+
+import numpy as np
+
+from poincare.hyperbolic import HyperbolicLine, HyperbolicPoint
+from poincare.tiling import RegularTiling
+from poincare.polygon import HyperbolicPolygon
+from poincare.discretize import discretize_lines, discretize_circles, discretize_polygons, PolylineCache
+
+TEST_THRESHOLD = 10e-12
+
+def test_lines():
+    '''Test that polylines follow the arcs within the maximal error, from end point to end point'''
+    lines = list(RegularTiling(7, 3).edges(3)) + [HyperbolicLine(HyperbolicPoint(-0.5, 0), HyperbolicPoint(0.5, 0))]
+    for max_error in [1e-2, 1e-4]:
+        polylines = discretize_lines(lines, max_error, cache=None)
+        assert polylines.polyline_count() == len(lines) and polylines.offsets[-1] == len(polylines.coordinates)
+        for index, line in enumerate(lines):
+            polyline = polylines.polyline(index)
+            assert np.abs(polyline[0] - line.end_points[0]).max() < TEST_THRESHOLD
+            assert np.abs(polyline[-1] - line.end_points[1]).max() < TEST_THRESHOLD
+            if line.is_a_straight_line:
+                assert len(polyline) == 2
+                continue
+            circle = line.representation()
+            radii = np.hypot(*(polyline - circle.center).T)
+            chord_radii = np.hypot(*((polyline[1:] + polyline[:-1]) / 2 - circle.center).T)
+            assert np.abs(radii - circle.radius).max() < 10e-9
+            assert (circle.radius - chord_radii).max() <= max_error
+
+    cache = PolylineCache(maxsize=len(lines) - 1)
+    cached = discretize_lines(lines, 1e-4, cache)
+    assert len(cache) == len(lines) - 1
+    assert all(polyline.base is None for polyline in cache._polylines.values())
+    assert np.array_equal(cached.coordinates, discretize_lines(lines, 1e-4, cache).coordinates)
+
+def test_circles_and_polygons():
+    '''Test closed polylines of hyperbolic circles and of polygons'''
+    circles = [HyperbolicPoint(0.3, 0.2).hyperbolic_circle(0.5), HyperbolicPoint(0, 0).hyperbolic_circle(2.0)]
+    polylines = discretize_circles(circles, 1e-4)
+    for index, circle in enumerate(circles):
+        polyline = polylines.polyline(index)
+        assert np.array_equal(polyline[0], polyline[-1])
+        assert np.abs(np.hypot(*(polyline - circle.center).T) - circle.radius).max() < TEST_THRESHOLD
+
+    polygons = [HyperbolicPolygon(vertices) for vertices in RegularTiling(5, 4).polygons(1)]
+    rings = discretize_polygons(polygons, 1e-4)
+    edges = discretize_lines([edge for polygon in polygons for edge in polygon.edges()], 1e-4)
+    assert rings.polyline_count() == len(polygons)
+    assert len(rings.coordinates) == len(edges.coordinates) - sum(len(polygon) for polygon in polygons) + len(polygons)
+    for index, polygon in enumerate(polygons):
+        ring = rings.polyline(index)
+        assert np.array_equal(ring[0], ring[-1]) and np.abs(ring[0] - polygon.vertices[0]).max() < TEST_THRESHOLD
+        # the vertices of the polygon are all on the ring
+        assert all(np.hypot(*(ring - vertex).T).min() < TEST_THRESHOLD for vertex in polygon.vertices)
+
+if __name__ == '__main__':
+    print('Testing line discretization...')
+    test_lines()
+    print('Testing circle and polygon discretization...')
+    test_circles_and_polygons()
+    print('All tests passed successfully.')
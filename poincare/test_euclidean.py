@@ -2,8 +2,10 @@
 
 import math
 import itertools
+from fractions import Fraction
 
-from euclidean import Point, Line, Circle
+from poincare.euclidean import Point, Line, Circle, circle_circle_intersection, circle_line_intersection, \
+    line_line_intersection, all_intersections, NO_INTERSECTION, SINGLE_POINT, TANGENT, TWO_POINTS, COINCIDENT
 
 TEST_THRESHOLD = 10e-12
 APPROX_TEST_THRESHOLD = 10e-3
@@ -15,6 +17,7 @@ def test_point():
     assert abs(p1 * p2 - 49.0) < TEST_THRESHOLD
     assert (p1 / 4 - Point(1.25, 1.5)).distance_to_origin() < TEST_THRESHOLD
     assert (p1.rotated_point(p2, math.pi / 2) - Point(3, 4)).distance_to_origin() < TEST_THRESHOLD
+    assert complex(p1) == 5 + 6j and type(0.5 * p1) is Point
 
 def test_line():
     '''Test the euclidean Line class'''
@@ -28,6 +31,15 @@ def test_line():
     rotated_line = l1.rotated_line(p3, math.pi / 6)
     assert (rotated_line.intersection(l1)[0] - Point(0.0, 0.732)).distance_to_origin() < APPROX_TEST_THRESHOLD
 
+    for line in (Line(3, -1, 2), Line(0.5, 2, -1)):
+        a, b, c = line
+        if abs(a) > abs(b):
+            points = [Point(c / a, 0), Point((c - b) / a, 1)]
+        else:
+            points = [Point(0, c / b), Point(1, (c - a) / b)]
+        expected = Line(*[point.rotated_point(p3, 0.7) for point in points])
+        assert all(abs(x - y) < TEST_THRESHOLD for x, y in zip(line.rotated_line(p3, 0.7), expected))
+
 def test_circle():
     '''Test the euclidean Circle class'''
     p1, p2, p3 = Point(1, 1), Point(2, 4), Point(5, 3)
@@ -50,6 +62,56 @@ def test_circle():
             int(approx_intersection_points[i].distance(intersection_points[j]) < APPROX_TEST_THRESHOLD)
     assert (true_conditions[0][0] and true_conditions[1][1]) or (true_conditions[0][1] and true_conditions[1][0])
 
+def test_intersection_kinds():
+    '''Test the typed intersection results, including the exactly recomputed near degenerate cases'''
+    unit = Circle(Point(0, 0), 1)
+    assert circle_circle_intersection(unit, Circle(Point(3, 0), 1)).kind == NO_INTERSECTION
+    assert circle_circle_intersection(unit, Circle(Point(0, 0), 1)).kind == COINCIDENT
+    assert circle_circle_intersection(unit, Circle(Point(0, 0), 2)).kind == NO_INTERSECTION
+    assert circle_circle_intersection(unit, Circle(Point(1, 1), 1)).kind == TWO_POINTS
+    assert circle_circle_intersection(unit, Circle(Point(2, 0), 1)) == (TANGENT, [Point(1, 0)])
+    assert circle_circle_intersection(unit, Circle(Point(0.5, 0), 0.5)) == (TANGENT, [Point(1, 0)])
+    assert unit.intersection(Circle(Point(2, 0), 1)) == [Point(1, 0)] * 2
+
+    radius = 1 + 1e-12
+    near_tangent = circle_circle_intersection(unit, Circle(Point(2, 0), radius))
+    expected_height = math.sqrt(1 - ((5 - Fraction(radius)**2) / 4)**2)
+    assert near_tangent.kind == TWO_POINTS
+    assert abs(abs(near_tangent.points[0].y) - expected_height) < 1e-9 * expected_height
+
+    assert circle_line_intersection(unit, Line(1, 0, 1)) == (TANGENT, [Point(1, 0)])
+    assert circle_line_intersection(unit, Line(1, 0, 1.5)).kind == NO_INTERSECTION
+    assert circle_line_intersection(unit, Line(1, 1, 0)).kind == TWO_POINTS
+    near_tangent = circle_line_intersection(unit, Line(0, 1, 1 - 1e-14))
+    assert near_tangent.kind == TWO_POINTS and abs(near_tangent.points[0].y - (1 - 1e-14)) < TEST_THRESHOLD
+
+    assert line_line_intersection(Line(1, 1, 1), Line(2, 2, 2)).kind == COINCIDENT
+    assert line_line_intersection(Line(1, 1, 1), Line(2, 2, 3)).kind == NO_INTERSECTION
+    assert line_line_intersection(Line(1, 0, 1), Line(0, 1, 2)) == (SINGLE_POINT, [Point(1, 2)])
+    assert line_line_intersection(Line(1, 1, 1), Line(1, 1 + 1e-15, 2)).kind == SINGLE_POINT
+    assert Line(1, 1, 1).intersection(Line(2, 2, 2)) == []
+
+def test_all_intersections():
+    '''Compare bulk intersections of Lines and Circles against intersecting every pair'''
+    shapes = [Line(math.cos(angle), math.sin(angle), 0.3 * math.sin(3 * angle)) for angle in range(0, 40, 3)]
+    shapes += [Circle(Point(0.1 * math.cos(i), 0.1 * i - 1), 0.05 + 0.02 * i) for i in range(20)]
+    shapes += [Line(1, 0, 0.5), Circle(Point(1, 0), 0.5), Circle(Point(5, 5), 1)]
+    expected = [(i, j, point) for i, j in itertools.combinations(range(len(shapes)), 2)
+                for point in shapes[i].intersection(shapes[j]) if max(abs(point.x), abs(point.y)) <= 1]
+    # tangent points are listed twice by the pairwise intersection
+    expected = [entry for k, entry in enumerate(expected) if entry not in expected[:k]]
+    assert all_intersections(shapes) == expected
+    assert all_intersections(shapes, cell_size=0.01) == expected
+    assert all_intersections(shapes, bounds=(2, 2, 3, 3)) == []
+
+    # only the part of a huge circle inside the bounds is bucketed
+    for radius in (1e5, 1e9):
+        shapes = [Circle(Point(radius + 0.5, 0), radius), Line(0, 1, 0), Line(1, 1, 0.6)]
+        intersections = all_intersections(shapes)
+        assert [(i, j) for i, j, _ in intersections] == [(0, 1), (0, 2), (1, 2)]
+        assert (intersections[0][2] - Point(0.5, 0)).distance_to_origin() < TEST_THRESHOLD
+    assert all_intersections([Circle(Point(0, 0), 5), Line(1, 0, 0)]) == []
+
 if __name__ == '__main__':
     print('Testing euclidean Point class...')
     test_point()
@@ -57,4 +119,8 @@ if __name__ == '__main__':
     test_line()
     print('Testing euclidean Circle class...')
     test_circle()
+    print('Testing typed intersections...')
+    test_intersection_kinds()
+    print('Testing bulk intersections...')
+    test_all_intersections()
     print('All tests passed successfully.')
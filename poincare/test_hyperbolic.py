@@ -1,10 +1,16 @@
 '''Test suite to test functions of the hyperbolic objects.'''
 
 import math
-from hyperbolic import HyperbolicLine, HyperbolicPoint, unit_circle
+import pickle
+import itertools
+from poincare.euclidean import Point
+from poincare.hyperbolic import HyperbolicLine, HyperbolicPoint, Mobius, unit_circle, all_intersections
+from poincare.arrays import HyperbolicPointArray
+from poincare.tiling import RegularTiling
 
 TEST_THRESHOLD = 10e-12
 APPROX_TEST_THRESHOLD = 10e-3
+CLOSED_FORM_THRESHOLD = 10e-9
 
 def test_point():
     '''Test the hyperbolic Point class'''
@@ -15,6 +21,10 @@ def test_point():
     p1 = HyperbolicPoint(0.6, 0.1)
     assert abs(p1.hyperbolic_circle(1).radius - 0.31611) < APPROX_TEST_THRESHOLD
 
+    inverse = p1.inverse()
+    assert type(inverse) is HyperbolicPoint and abs(complex(inverse) - 1 / complex(p1).conjugate()) < TEST_THRESHOLD
+    assert type(HyperbolicPoint.from_complex(0.5j)) is HyperbolicPoint
+
 def test_line():
     '''Test the hyperbolic Line class'''
     p1, p2, p3 = HyperbolicPoint(0.1, -0.5), HyperbolicPoint(0.2, 0.6), HyperbolicPoint(0.4, 0.8)
@@ -29,9 +39,98 @@ def test_line():
     assert abs(p1.distance(p2) - 2.55828) < APPROX_TEST_THRESHOLD
     assert abs(p1.distance(p3) - 3.91378) < APPROX_TEST_THRESHOLD
 
+def test_closed_form_accuracy():
+    '''Compare the closed form distance and angle kernels against the geometric constructions'''
+    points = [HyperbolicPoint(0.1, -0.5), HyperbolicPoint(0.2, 0.6), HyperbolicPoint(0.4, 0.8),
+              HyperbolicPoint(-0.5, 0.1), HyperbolicPoint(0.0, 0.0), HyperbolicPoint(-0.9, -0.3)]
+    for p1, p2, p3 in itertools.permutations(points, 3):
+        assert abs(p1.distance(p2) - p1.distance(p2, geometric=True)) < CLOSED_FORM_THRESHOLD
+        assert abs(HyperbolicPoint.angle_between_three_points(p1, p2, p3) -
+                   HyperbolicPoint.angle_between_three_points(p1, p2, p3, geometric=True)) < CLOSED_FORM_THRESHOLD
+    assert points[0].distance(points[0]) == 0.0
+
+def test_mobius():
+    '''Test the Mobius isometries'''
+    p1, p2, p3 = HyperbolicPoint(0.1, -0.5), HyperbolicPoint(0.2, 0.6), HyperbolicPoint(-0.5, 0.1)
+    translation = Mobius.translation(p1, p2)
+    rotation = Mobius.rotation(math.pi / 3, p3)
+    assert translation(p1).distance(p2) < TEST_THRESHOLD
+    assert rotation(p3).distance(p3) < TEST_THRESHOLD
+    assert abs(Mobius.translation(p1, p2, 1.0)(p1).distance(p1) - 1.0) < TEST_THRESHOLD
+    assert abs(HyperbolicPoint.angle_between_three_points(p1, p3, rotation(p1)) - math.pi / 3) < TEST_THRESHOLD
+
+    isometry = translation @ rotation @ translation.inverse()
+    assert abs(isometry(p1).distance(isometry(p2)) - p1.distance(p2)) < TEST_THRESHOLD
+    assert (isometry.inverse() @ isometry)(p3).distance(p3) < TEST_THRESHOLD
+
+    points = isometry(HyperbolicPointArray.from_points([p1, p2, p3]))
+    assert all(isometry(p).distance(q) < TEST_THRESHOLD for p, q in zip([p1, p2, p3], points))
+    line = isometry(HyperbolicLine(p1, p2))
+    assert abs(line.length() - p1.distance(p2)) < APPROX_TEST_THRESHOLD
+
+def test_line_at_angle():
+    '''Compare line_at_angle built by Mobius translations against the geometric construction'''
+    baseline = HyperbolicLine(HyperbolicPoint(0.1, -0.5), HyperbolicPoint(0.2, 0.6))
+    for angle in [0.0, 0.3, -1.2, 1.0, 2.5, 4.0]:
+        line = baseline.line_at_angle(angle, 1.5)
+        reference = baseline.line_at_angle(angle, 1.5, geometric=True)
+        assert line.end_points[1].distance(reference.end_points[1]) < CLOSED_FORM_THRESHOLD
+
+def test_line_caching():
+    '''Test the immutable HyperbolicLine and its cached derived geometry'''
+    p1, p2, p3 = HyperbolicPoint(0.1, -0.5), HyperbolicPoint(0.2, 0.6), HyperbolicPoint(0.4, 0.8)
+    l1, l2 = HyperbolicLine(p1, p2), HyperbolicLine(p2, p3)
+    assert l1.representation() is l1.representation()
+    assert l1.length() == l1.length() == HyperbolicLine(p1, p2).length()
+    assert all(abs(Point.distance_to_origin(ideal_point) - 1.0) < TEST_THRESHOLD for ideal_point in l1.ideal_points)
+    assert Point.distance(l1.ideal_points[0], p1) < Point.distance(l1.ideal_points[0], p2)
+
+    backwards, forwards = l1.tangent_directions[1] * -1.0, l2.tangent_directions[0]
+    assert abs(math.acos(backwards * forwards) - HyperbolicPoint.angle_between_three_points(p1, p2, p3)) < 10e-9
+    straight_line = HyperbolicLine(HyperbolicPoint(-0.5, 0), HyperbolicPoint(0.5, 0))
+    assert straight_line.tangent_directions == (Point(1.0, 0.0), Point(1.0, 0.0))
+
+    try:
+        l1.foo = 1
+        assert False
+    except AttributeError:
+        pass
+    copy = pickle.loads(pickle.dumps(l1))
+    assert copy.end_points == l1.end_points and copy.length() == l1.length()
+
+def test_all_intersections():
+    '''Compare bulk intersections of HyperbolicLines against intersecting every pair'''
+    points = [HyperbolicPoint(0.9 * math.cos(2.4 * i) * math.sin(i), 0.9 * math.sin(2.4 * i)) for i in range(60)]
+    lines = [HyperbolicLine(p, q) for p, q in zip(points, points[1:])]
+    expected = [(i, j) for i, j in itertools.combinations(range(len(lines)), 2)
+                if lines[i].intersection(lines[j]) is not None]
+    assert [(i, j) for i, j, _ in all_intersections(lines, segments=False)] == expected
+
+    for i, j, point in all_intersections(lines):
+        for line in (lines[i], lines[j]):
+            p, q = line.end_points
+            assert abs(p.distance(point) + point.distance(q) - line.length()) < CLOSED_FORM_THRESHOLD
+    # consecutive segments meet at their shared end points
+    assert {(i, i + 1) for i in range(len(lines) - 1)} <= {(i, j) for i, j, _ in all_intersections(lines)}
+
+    # edges of a tiling never cross, they only meet at the vertices
+    edges = list(RegularTiling(7, 3).edges(2))
+    for i, j, point in all_intersections(edges):
+        assert min(Point.distance(point, end_point) for end_point in edges[i].end_points) < CLOSED_FORM_THRESHOLD
+        assert min(Point.distance(point, end_point) for end_point in edges[j].end_points) < CLOSED_FORM_THRESHOLD
+
 if __name__ == '__main__':
     print('Testing HyperbolicPoint class...')
     test_point()
     print('Testing HyperbolicLine class...')
     test_line()
+    print('Testing closed form kernels...')
+    test_closed_form_accuracy()
+    print('Testing Mobius class...')
+    test_mobius()
+    test_line_at_angle()
+    print('Testing HyperbolicLine caching...')
+    test_line_caching()
+    print('Testing bulk intersections...')
+    test_all_intersections()
     print('All tests passed successfully.')
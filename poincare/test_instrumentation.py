@@ -0,0 +1,75 @@
+'''Test suite to test the opt-in instrumentation of the geometry functions.'''
+
+import math
+
+from poincare import instrumentation
+from poincare.euclidean import Point, Circle
+from poincare.hyperbolic import HyperbolicLine, HyperbolicPoint
+
+def test_counters():
+    '''Test call counts and degenerate results'''
+    p1, p2, p3 = HyperbolicPoint(0.1, -0.5), HyperbolicPoint(0.2, 0.6), HyperbolicPoint(-0.5, 0.1)
+    with instrumentation.instrumented():
+        line = HyperbolicLine(p1, p2)
+        line.line_at_angle(1.0, 0.5)
+        p1.distance(p2)
+        HyperbolicPoint.angle_between_three_points(p1, p2, p3)
+        Circle(Point(0, 0), 1).intersection(Circle(Point(5, 0), 1))
+        Circle(Point(0, 0), 1).intersection(Circle(Point(1, 0), 1))
+
+    statistics = instrumentation.statistics()
+    assert statistics['hyperbolic.HyperbolicLine.__init__']['calls'] == 2
+    assert statistics['hyperbolic.HyperbolicLine.line_at_angle']['calls'] == 1
+    assert statistics['hyperbolic.HyperbolicPoint.angle_between_three_points']['calls'] == 1
+    assert statistics['euclidean._circle_circle_intersection'] == \
+        dict(statistics['euclidean._circle_circle_intersection'], calls=2, degenerate=1)
+    assert 'hyperbolic.HyperbolicLine.__init__' in instrumentation.report()
+
+def test_degenerate_paths():
+    '''Test that calls raising or taking a swallowed fallback are counted as degenerate'''
+    p1, p2, p3 = HyperbolicPoint(-0.01, 0), HyperbolicPoint(0, 0), HyperbolicPoint(0.005, 0)
+    calls = []
+    with instrumentation.instrumented(callback=lambda *args: calls.append(args)):
+        # collinear points, the law of cosines overshoots -1
+        assert HyperbolicPoint.angle_between_three_points(p1, p2, p3, geometric=True) == math.pi
+        assert p1.distance(p1, geometric=True) == 0.0
+        try:
+            HyperbolicLine(p1, p1)
+        except IndexError:
+            pass
+        HyperbolicPoint.angle_between_three_points(p1, p2, p3, geometric=True)
+
+    statistics = instrumentation.statistics()
+    assert statistics['hyperbolic.HyperbolicPoint.angle_between_three_points'] == \
+        dict(statistics['hyperbolic.HyperbolicPoint.angle_between_three_points'], calls=2, degenerate=2)
+    assert statistics['hyperbolic.HyperbolicPoint.distance']['degenerate'] == 1
+    # constructing a line between equal points raises, both inside distance and directly
+    assert statistics['hyperbolic.HyperbolicLine.__init__']['degenerate'] == 2
+    assert [call[2] for call in calls if call[0] == 'hyperbolic.HyperbolicPoint.distance'] == \
+        [False] * 3 + [True] + [False] * 3
+
+def test_disabled():
+    '''Test that disabling restores the original functions and stops counting'''
+    original_distance, original_angle = HyperbolicPoint.distance, HyperbolicPoint.angle_between_three_points
+    calls = []
+    with instrumentation.instrumented(callback=lambda *args: calls.append(args)):
+        assert instrumentation.is_enabled()
+        assert HyperbolicPoint.distance is not original_distance
+        HyperbolicPoint(0, 0).distance(HyperbolicPoint(0.5, 0))
+
+    assert not instrumentation.is_enabled()
+    assert HyperbolicPoint.distance is original_distance
+    assert HyperbolicPoint.angle_between_three_points is original_angle
+    assert [call[0] for call in calls] == ['hyperbolic.HyperbolicPoint.distance']
+
+    HyperbolicPoint(0, 0).distance(HyperbolicPoint(0.5, 0))
+    assert instrumentation.statistics()['hyperbolic.HyperbolicPoint.distance']['calls'] == 1
+
+if __name__ == '__main__':
+    print('Testing instrumentation counters...')
+    test_counters()
+    print('Testing degenerate paths...')
+    test_degenerate_paths()
+    print('Testing disabled instrumentation...')
+    test_disabled()
+    print('All tests passed successfully.')
@@ -0,0 +1,73 @@
+'''Test suite to test the hyperboloid and Klein models against the Poincare Disk.'''
+
+import math
+
+import numpy as np
+
+from poincare.hyperbolic import HyperbolicLine, HyperbolicPoint, Mobius
+from poincare.arrays import HyperbolicPointArray
+from poincare import models
+
+TEST_THRESHOLD = 10e-12
+
+POINTS = [HyperbolicPoint(0.1, -0.5), HyperbolicPoint(0.2, 0.6), HyperbolicPoint(0.4, 0.8), HyperbolicPoint(-0.3, 0.1)]
+
+def test_conversions():
+    '''Test the conversions between the models round trip and land on the hyperboloid'''
+    points = HyperbolicPointArray.from_points(POINTS)
+    hyperboloid, klein = points.to_hyperboloid(), points.to_klein()
+    assert np.abs(models.minkowski_dot(hyperboloid, hyperboloid) + 1.0).max() < TEST_THRESHOLD
+    for converted in [HyperbolicPointArray.from_hyperboloid(hyperboloid), HyperbolicPointArray.from_klein(klein)]:
+        assert np.abs(converted.coordinates - points.coordinates).max() < TEST_THRESHOLD
+    assert np.abs(models.hyperboloid_to_klein(hyperboloid) - klein).max() < TEST_THRESHOLD
+    assert np.abs(models.klein_to_hyperboloid(klein) - hyperboloid).max() < TEST_THRESHOLD
+
+def test_hyperboloid_operations():
+    '''Test distances, geodesics, intersections and isometries on the hyperboloid against the disk'''
+    hyperboloid = HyperbolicPointArray.from_points(POINTS).to_hyperboloid()
+    assert abs(models.distance(hyperboloid[0], hyperboloid[1]) - POINTS[0].distance(POINTS[1])) < TEST_THRESHOLD
+
+    normals = models.geodesic(hyperboloid[[0, 2]], hyperboloid[[1, 3]])
+    assert np.abs(models.minkowski_dot(normals, hyperboloid[[0, 2]])).max() < TEST_THRESHOLD
+    crossing = models.hyperboloid_to_disk(models.intersection(normals[0], normals[1]))
+    expected = HyperbolicLine(POINTS[0], POINTS[1]).intersection(HyperbolicLine(POINTS[2], POINTS[3]))
+    assert np.abs(crossing - expected).max() < TEST_THRESHOLD
+    assert np.all(np.isnan(models.intersection(normals[0], normals[0])))
+
+    mobius = Mobius.translation(POINTS[0], POINTS[1]) @ Mobius.rotation(0.7)
+    images = models.hyperboloid_to_disk(models.apply(models.from_mobius(mobius), hyperboloid))
+    assert np.abs(images - np.array([mobius(point) for point in POINTS])).max() < TEST_THRESHOLD
+    origin_image = models.apply(models.translation(hyperboloid[1]), [0.0, 0.0, 1.0])
+    assert np.abs(origin_image - hyperboloid[1]).max() < TEST_THRESHOLD
+
+    reflected = models.apply(models.reflection(normals[0]), hyperboloid)
+    assert np.abs(reflected[:2] - hyperboloid[:2]).max() < TEST_THRESHOLD
+    signed_distances = models.signed_distance(hyperboloid[2:], normals[0])
+    assert np.abs(models.signed_distance(reflected[2:], normals[0]) + signed_distances).max() < TEST_THRESHOLD
+
+def test_deep_points():
+    '''Test points so far out that their disk coordinates round to the boundary'''
+    radius, angle = 40.0, 1e-3
+    points = models.apply(np.stack([models.rotation(0.0), models.rotation(angle)]),
+                          [math.sinh(radius), 0.0, math.cosh(radius)])
+    expected = 2.0 * math.asinh(math.sinh(radius) * math.sin(angle / 2.0))
+    assert abs(models.distance(points[0], points[1]) - expected) < TEST_THRESHOLD * expected
+    assert np.abs(models.hyperboloid_to_disk(points)).max() <= 1.0
+
+    # two perpendicular geodesics moved out to cross far from the origin
+    center = np.array([math.sinh(5.0) * math.cos(0.3), math.sinh(5.0) * math.sin(0.3), math.cosh(5.0)])
+    directions = np.array([[math.sinh(1.0) * math.cos(a), math.sinh(1.0) * math.sin(a), math.cosh(1.0)]
+                           for a in (0.5, 0.5 + math.pi, 0.5 + 0.5 * math.pi, 0.5 + 1.5 * math.pi)])
+    ends = models.apply(models.translation(center), directions)
+    crossing = models.intersection(models.geodesic(ends[0], ends[1]), models.geodesic(ends[2], ends[3]))
+    assert models.distance(crossing, center) < 10e-9
+    assert abs(models.distance(ends[0], ends[1]) - 2.0) < 10e-9
+
+if __name__ == '__main__':
+    print('Testing model conversions...')
+    test_conversions()
+    print('Testing hyperboloid operations...')
+    test_hyperboloid_operations()
+    print('Testing deep points...')
+    test_deep_points()
+    print('All tests passed successfully.')
@@ -0,0 +1,40 @@
+'''Test suite to test blocked pairwise hyperbolic distances.'''
+
+import os
+import tempfile
+
+import numpy as np
+
+from poincare.testing import random_points
+from poincare.pairwise import pairwise_distances, nearest_k
+
+TEST_THRESHOLD = 10e-12
+
+def test_pairwise_distances():
+    '''Test the blocked distance matrix against the point array distances'''
+    points_a, points_b = random_points(70, 0, max_radius=0.99), random_points(45, 1, max_radius=0.99)
+    distances = pairwise_distances(points_a, points_b, block_size=16, workers=3)
+    for i in range(len(points_a)):
+        assert np.allclose(distances[i], points_b.distance(points_a[i]), atol=TEST_THRESHOLD)
+
+    with tempfile.TemporaryDirectory() as directory:
+        mapped = pairwise_distances(points_a, points_b, out=os.path.join(directory, 'distances'), block_size=16)
+        assert np.allclose(mapped, distances, atol=TEST_THRESHOLD)
+        del mapped
+
+    assert np.allclose(np.diag(pairwise_distances(points_a)), 0.0)
+
+def test_nearest_k():
+    '''Test the top k reduction against sorting the full matrix'''
+    points_a, points_b = random_points(70, 2, max_radius=0.99), random_points(45, 3, max_radius=0.99)
+    distances = pairwise_distances(points_a, points_b)
+    indices, nearest_distances = nearest_k(points_a, points_b, 4, block_size=8, workers=2)
+    assert np.allclose(nearest_distances, np.sort(distances, axis=1)[:, :4], atol=TEST_THRESHOLD)
+    assert (indices[:, 0] == np.argmin(distances, axis=1)).all()
+
+if __name__ == '__main__':
+    print('Testing pairwise_distances...')
+    test_pairwise_distances()
+    print('Testing nearest_k...')
+    test_nearest_k()
+    print('All tests passed successfully.')
@@ -0,0 +1,59 @@
+'''Test suite to test building star patterns, in this process and on a pool of processes.'''
+
+import math
+
+from poincare.hyperbolic import HyperbolicPoint
+from poincare.patterns import Star, Rosette, build, sweep
+
+TEST_THRESHOLD = 10e-12
+
+def test_rosette():
+    '''Test the stars of a rosette sit where the rosette says, and touch the major star'''
+    rosette = Rosette(9, 9, math.pi / 10)
+    major_radius_length, minor_radius_length = rosette.radius_lengths()
+    stars = rosette.components()
+    assert len(stars) == 10
+    assert all(type(star) is Star for star in stars)
+    origin = HyperbolicPoint(0, 0)
+    for star in stars[1:]:
+        corner, center = star.baseline.end_points
+        assert abs(origin.distance(corner) - major_radius_length) < TEST_THRESHOLD
+        assert abs(origin.distance(center) - major_radius_length - minor_radius_length) < TEST_THRESHOLD
+
+    lines = rosette.lines()
+    assert len(lines) == 4 * 9 + 9 * 4 * 9
+    assert [line.end_points for line in lines[:36]] == [line.end_points for line in stars[0].lines()]
+    assert all(line.end_points[0].is_in_unit_disk() for line in lines)
+
+def test_parallel_build():
+    '''Test a pool of processes builds the same lines in the same order as a single process'''
+    patterns = [Rosette(7, 8, math.pi / 8), Star(Rosette(7, 8, 0.3).components()[1].baseline, 5, 0.4),
+                Rosette(9, 9, math.pi / 10)]
+    serial = build(patterns, workers=1)
+    parallel = build(patterns, workers=3)
+    assert [len(lines) for lines in serial] == [4 * 7 + 7 * 4 * 8, 4 * 5, 4 * 9 + 9 * 4 * 9]
+    assert [[line.end_points for line in lines] for lines in parallel] == \
+        [[line.end_points for line in lines] for lines in serial]
+
+    thetas = [math.pi / 12, math.pi / 10, math.pi / 8]
+    swept = sweep(Rosette(9, 9, 0.0), thetas, workers=2)
+    assert [[line.end_points for line in lines] for lines in swept] == \
+        [[line.end_points for line in Rosette(9, 9, theta).lines()] for theta in thetas]
+
+def test_invalid_rosette():
+    '''Test a rosette whose minor stars cannot fit is rejected'''
+    try:
+        Rosette(3, 5, 0.3).components()
+    except ValueError:
+        pass
+    else:
+        assert False
+
+if __name__ == '__main__':
+    print('Testing rosettes...')
+    test_rosette()
+    print('Testing parallel builds...')
+    test_parallel_build()
+    print('Testing invalid rosettes...')
+    test_invalid_rosette()
+    print('All tests passed successfully.')
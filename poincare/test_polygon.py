@@ -0,0 +1,55 @@
+'''Test suite to test geodesic polygons and point in polygon queries.'''
+
+import math
+
+import numpy as np
+
+from poincare.hyperbolic import HyperbolicPoint
+from poincare.tiling import RegularTiling
+from poincare.polygon import HyperbolicPolygon, locate
+
+TEST_THRESHOLD = 10e-12
+
+def test_polygon():
+    '''Test area, perimeter, angles and convexity of tiles and of a non convex polygon'''
+    tiling = RegularTiling(7, 3)
+    tile = HyperbolicPolygon(next(tiling.polygons(0)))
+    assert tile.is_counter_clockwise() and tile.is_convex()
+    assert all(abs(angle - 2 * math.pi / 3) < TEST_THRESHOLD for angle in tile.angles())
+    assert abs(tile.area() - math.pi / 3) < TEST_THRESHOLD
+    assert abs(tile.perimeter() - 7 * tile.vertices[0].distance(tile.vertices[1])) < TEST_THRESHOLD
+    assert tile.centroid().euclidean_distance_to_origin() < TEST_THRESHOLD
+
+    reversed_tile = HyperbolicPolygon.from_lines(HyperbolicPolygon(tile.vertices[::-1]).edges())
+    assert not reversed_tile.is_counter_clockwise() and abs(reversed_tile.area() - tile.area()) < TEST_THRESHOLD
+    for polygon in tiling.polygons(2):
+        assert abs(HyperbolicPolygon(polygon).area() - math.pi / 3) < 10e-9
+
+    a, b, c, d = [HyperbolicPoint(x, y) for x, y in [(0, 0.5), (-0.5, -0.4), (0, 0), (0.5, -0.4)]]
+    dart = HyperbolicPolygon([a, b, c, d])
+    assert not dart.is_convex() and dart.angles()[2] > math.pi
+    triangles = HyperbolicPolygon([a, b, c]).area() + HyperbolicPolygon([a, c, d]).area()
+    assert abs(dart.area() - triangles) < TEST_THRESHOLD
+    assert dart.contains([HyperbolicPoint(0, 0.2), HyperbolicPoint(0, -0.2), HyperbolicPoint(0.9, 0)]).tolist() == \
+        [True, False, False]
+
+def test_locate():
+    '''Test assigning random points to the tiles of a tiling against testing every tile'''
+    polygons = [HyperbolicPolygon(vertices) for vertices in RegularTiling(5, 4).polygons(3)]
+    rng = np.random.default_rng(0)
+    radii, angles = 0.9 * np.sqrt(rng.random(5000)), 2 * math.pi * rng.random(5000)
+    points = np.stack([radii * np.cos(angles), radii * np.sin(angles)], axis=1)
+
+    masks = np.array([polygon.contains(points) for polygon in polygons])
+    assert masks.sum(axis=0).max() == 1
+    expected = np.where(masks.any(axis=0), masks.argmax(axis=0), -1)
+    located = locate(points, polygons)
+    assert np.array_equal(located, expected)
+    assert np.all(located[radii < 0.5] >= 0) and located[np.argmin(radii)] == 0
+
+if __name__ == '__main__':
+    print('Testing HyperbolicPolygon class...')
+    test_polygon()
+    print('Testing point location...')
+    test_locate()
+    print('All tests passed successfully.')
@@ -0,0 +1,96 @@
+'''Test suite to test rendering specs, with and without the geometry cache, and the command line.'''
+
+import io
+import os
+import json
+import tempfile
+
+import numpy as np
+
+from poincare.cache import GeometryCache
+from poincare.hyperbolic import HyperbolicLine, HyperbolicPoint
+from poincare.poincaredisk import PoincareDiskModel
+from poincare.render import load_specs, render, render_all, lines_to_array, array_to_lines, draw_array
+from poincare.__main__ import main
+
+ROSETTE = {'pattern': {'type': 'rosette', 'major_side_num': 9, 'minor_side_num': 9, 'theta': 0.3},
+           'style': {'line_color': 'navy'}, 'output': 'rosette.svg'}
+TILING = {'pattern': {'type': 'tiling', 'p': 7, 'q': 3, 'depth': 3}, 'model': {'resolution': 100},
+          'backend_options': {'size': 100}, 'output': 'tiling.svg'}
+
+def _read(filename):
+    with open(filename) as output:
+        return output.read()
+
+def test_render():
+    '''Test cached renders draw the same as computed ones, and only the geometry is cached'''
+    with tempfile.TemporaryDirectory() as path:
+        cache = GeometryCache(os.path.join(path, 'cache'))
+        for spec in [ROSETTE, TILING]:
+            spec = dict(spec, output=os.path.join(path, spec['output']))
+            expected = _read(render(spec))
+            assert _read(render(spec, cache)) == expected
+            assert _read(render(spec, cache)) == expected
+        assert len(cache) == 2
+
+        restyled = dict(ROSETTE, style={'line_color': 'red'}, output=os.path.join(path, 'red.svg'))
+        assert 'red' in _read(render(restyled, cache))
+        assert len(cache) == 2
+
+def test_draw_array():
+    '''Test lines drawn from their columns match lines drawn one by one, up to the order of the elements'''
+    lines = [HyperbolicLine(HyperbolicPoint(0.1, -0.5), HyperbolicPoint(0.2, 0.6)),
+             HyperbolicLine(HyperbolicPoint(-0.5, 0), HyperbolicPoint(0.5, 0)),
+             HyperbolicLine(HyperbolicPoint(0.2, 0.6), HyperbolicPoint(0.1, -0.5))]
+    array = lines_to_array(lines)
+    assert np.isinf(array[:, 6]).tolist() == [False, True, False]
+    assert [line.end_points for line in array_to_lines(array)] == [line.end_points for line in lines]
+
+    for options in [{}, {'deduplicate': True}]:
+        outputs = []
+        for draw in [lambda model: [model.drawline(line, line_color='red') for line in lines],
+                     lambda model: draw_array(model, array, line_color='red')]:
+            output = io.StringIO()
+            draw(PoincareDiskModel(backend='svg', output=output, **options))
+            outputs.append(sorted(output.getvalue().splitlines()))
+        assert outputs[0] == outputs[1] and len(outputs[0]) == 5 - len(options)
+
+def test_command_line():
+    '''Test specs are read from JSON and TOML files and rendered in parallel'''
+    with tempfile.TemporaryDirectory() as path:
+        with open(os.path.join(path, 'specs.json'), 'w') as spec_file:
+            json.dump({'specs': [ROSETTE, TILING]}, spec_file)
+        with open(os.path.join(path, 'star.toml'), 'w') as spec_file:
+            spec_file.write('output = "star.svg"\n[pattern]\ntype = "star"\nside_num = 7\ntheta = 0.4\nradius = 1.0\n')
+        specs = load_specs(os.path.join(path, 'specs.json'))
+        assert [spec['output'] for spec in specs] == [os.path.join(path, 'rosette.svg'),
+                                                      os.path.join(path, 'tiling.svg')]
+
+        assert main([os.path.join(path, 'specs.json'), os.path.join(path, 'star.toml'), '--workers', '2',
+                     '--cache-dir', os.path.join(path, 'cache')]) == 0
+        for name in ['rosette.svg', 'tiling.svg', 'star.svg']:
+            assert _read(os.path.join(path, name)).rstrip().endswith('</svg>')
+        assert len(GeometryCache(os.path.join(path, 'cache'))) == 3
+
+        outputs = render_all(load_specs(os.path.join(path, 'star.toml')), workers=1)
+        assert outputs == [os.path.join(path, 'star.svg')]
+
+def test_unknown_pattern():
+    '''Test specs with an unknown pattern type are rejected'''
+    try:
+        render({'pattern': {'type': 'spiral'}, 'output': os.devnull})
+    except ValueError:
+        pass
+    else:
+        assert False
+
+if __name__ == '__main__':
+    print('Testing rendering...')
+    test_render()
+    print('Testing drawing arrays...')
+    test_draw_array()
+    print('Testing the command line...')
+    test_command_line()
+    print('Testing unknown patterns...')
+    test_unknown_pattern()
+    print('All tests passed successfully.')
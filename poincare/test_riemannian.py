@@ -0,0 +1,79 @@
+'''Test suite to test the Riemannian operations of the Poincare Disk.'''
+
+import numpy as np
+
+from poincare.hyperbolic import HyperbolicPoint, Mobius
+from poincare.arrays import HyperbolicPointArray
+from poincare.testing import random_points
+from poincare import riemannian
+
+TEST_THRESHOLD = 10e-12
+
+def test_maps():
+    '''Test exp and log maps invert each other and agree with distances and Mobius translations'''
+    x, y = random_points(50, 0, 0.9).coordinates, random_points(50, 1, 0.9).coordinates
+    tangents = riemannian.log_map(x, y)
+    assert np.abs(riemannian.exp_map(x, tangents) - y).max() < 10e-10
+    lengths = riemannian.conformal_factor(x)[:, 0] * np.hypot(*tangents.T)
+    assert np.abs(lengths - HyperbolicPointArray(x).distance(HyperbolicPointArray(y))).max() < 10e-10
+    assert np.abs(riemannian.distance(x, y) - HyperbolicPointArray(x).distance(HyperbolicPointArray(y))).max() < \
+        TEST_THRESHOLD
+    assert np.abs(riemannian.exp_map(x, np.zeros_like(x)) - x).max() < TEST_THRESHOLD
+    assert np.abs(riemannian.log_map(x, x)).max() < TEST_THRESHOLD
+
+    p, q = HyperbolicPoint(0.3, -0.2), HyperbolicPoint(-0.1, 0.6)
+    image = Mobius.translation(HyperbolicPoint(0, 0), p)(q)
+    assert np.abs(riemannian.mobius_add([p.x, p.y], [q.x, q.y]) - [image.x, image.y]).max() < TEST_THRESHOLD
+
+def test_gradient_step():
+    '''Test gradient rescaling, projection, and descent on the squared distance to a point'''
+    x = np.array([[0.5, 0.0], [0.999999999, 0.0], [2.0, 0.0]])
+    projected = riemannian.project(x)
+    assert np.all(np.hypot(*projected.T) <= 1.0 - riemannian.DEFAULT_EPSILON + TEST_THRESHOLD)
+    assert np.array_equal(projected[0], x[0])
+    assert abs(riemannian.riemannian_gradient(x[0], [1.0, 0.0])[0] - (0.75 / 2.0)**2) < TEST_THRESHOLD
+
+    # the Riemannian gradient of d(x, target)^2 / 2 is -log_x(target), followed to the target with a unit rate
+    point, target = np.array([0.4, 0.3]), np.array([-0.5, 0.1])
+    euclidean_gradient = -riemannian.log_map(point, target) * riemannian.conformal_factor(point)**2
+    assert np.abs(riemannian.gradient_step(point, euclidean_gradient, 1.0) - target).max() < 10e-10
+
+def test_frechet_mean():
+    '''Test Frechet means are equivariant and minimize the sum of squared distances'''
+    points = random_points(40, 2, 0.9).coordinates
+    mean = riemannian.frechet_mean(points)
+    objective = lambda center: np.sum(riemannian.distance(points, center)**2)
+    for offset in [[1e-4, 0.0], [0.0, 1e-4], [-1e-4, 0.0], [0.0, -1e-4]]:
+        assert objective([mean.x, mean.y]) < objective(np.add([mean.x, mean.y], offset))
+
+    isometry = Mobius.translation(HyperbolicPoint(0.0, 0.0), HyperbolicPoint(0.4, -0.3))
+    moved = np.array([isometry(HyperbolicPoint(x, y)) for x, y in points.tolist()])
+    assert isometry(mean).distance(riemannian.frechet_mean(moved)) < 10e-9
+
+    labels = np.arange(40) % 3
+    means = riemannian.frechet_means(points, labels, 4)
+    for label in range(3):
+        assert means[label].distance(riemannian.frechet_mean(points[labels == label])) < 10e-9
+    assert means[3].euclidean_distance_to_origin() == 0.0
+
+def test_kmeans():
+    '''Test k-means separates clusters around distinct centers'''
+    rng = np.random.default_rng(3)
+    true_centers = np.array([[0.6, 0.0], [-0.3, 0.5], [-0.3, -0.5]])
+    labels = rng.integers(3, size=600)
+    points = riemannian.exp_map(true_centers[labels], 0.05 * rng.standard_normal((600, 2)))
+    centers, found = riemannian.kmeans(points, 3, workers=2)
+    for cluster in range(3):
+        assert len(set(labels[found == cluster])) == 1
+    assert np.sort(HyperbolicPointArray(true_centers).distance(centers[0])).min() < 0.05
+
+if __name__ == '__main__':
+    print('Testing exponential and logarithmic maps...')
+    test_maps()
+    print('Testing gradient steps...')
+    test_gradient_step()
+    print('Testing Frechet means...')
+    test_frechet_mean()
+    print('Testing k-means...')
+    test_kmeans()
+    print('All tests passed successfully.')
@@ -0,0 +1,84 @@
+'''Test suite to test writing and memory mapped loading of scenes.'''
+
+import io
+import tempfile
+
+import numpy as np
+
+from poincare.hyperbolic import HyperbolicLine, HyperbolicPoint
+from poincare.tiling import RegularTiling
+from poincare.poincaredisk import PoincareDiskModel
+from poincare.scene import Scene, SceneWriter
+
+TEST_THRESHOLD = 10e-12
+
+def test_round_trip():
+    '''Test that a scene written through the model loads back as memory mapped columns'''
+    edges = list(RegularTiling(5, 4).edges(2))
+    with tempfile.TemporaryDirectory() as path:
+        # a small buffer makes the writer stream the columns in several chunks
+        model = PoincareDiskModel(backend=SceneWriter(path, buffer_size=16))
+        for edge in edges:
+            model.drawline(edge, line_color='red')
+        model.drawline(HyperbolicLine(HyperbolicPoint(-0.5, 0), HyperbolicPoint(0.5, 0)))
+        model.drawpoint(HyperbolicPoint(0.1, 0.2), size=6)
+        model.save(None)
+
+        scene = Scene(path)
+        assert isinstance(scene.column('end_points'), np.memmap)
+        assert np.shares_memory(scene.points.coordinates, scene.column('points'))
+        assert len(scene.circles) == 1 and len(scene.points) == 1 and len(scene.arcs) == len(edges) + 1
+        assert scene.styles == [{}, {'line_color': 'red'}, {'size': 6}]
+        assert scene.line_styles.tolist() == [1] * len(edges) + [0]
+        assert scene.is_a_straight_line.tolist() == [edge.is_a_straight_line for edge in edges] + [True]
+
+        start_points, end_points = scene.end_points
+        expected = np.array([edge.end_points[0] for edge in edges])
+        assert np.abs(start_points.coordinates[:-1] - expected).max() < TEST_THRESHOLD
+        arcs = [not edge.is_a_straight_line for edge in edges] + [False]
+        radii = [edge.representation().radius for edge in edges if not edge.is_a_straight_line]
+        assert np.abs(scene.arcs.radii[arcs] - radii).max() < TEST_THRESHOLD
+
+        output = io.StringIO()
+        scene.draw(PoincareDiskModel(backend='svg', output=output))
+        elements = [line.split()[0] for line in output.getvalue().splitlines()[1:-1]]
+        assert elements.count('<path') == sum(arcs) and elements.count('<line') == len(edges) + 1 - sum(arcs)
+        # the model draws its own boundary, and only points were drawn as circles besides it
+        assert [line.split()[0] for line in output.getvalue().splitlines()[1:]].count('<circle') == 2
+        del scene, start_points, end_points
+
+def test_draw_through_model():
+    '''Test that lines replayed on a model are deduplicated and culled as the model is configured'''
+    line = HyperbolicLine(HyperbolicPoint(0.1, -0.5), HyperbolicPoint(0.2, 0.6))
+    reversed_line = HyperbolicLine(HyperbolicPoint(0.2, 0.6), HyperbolicPoint(0.1, -0.5))
+    tiny_line = HyperbolicLine(HyperbolicPoint(0.99, 0), HyperbolicPoint(0.99, 0.001))
+    with tempfile.TemporaryDirectory() as path:
+        with SceneWriter(path) as writer:
+            for recorded in (line, reversed_line, tiny_line):
+                writer.drawarc(recorded.representation().center, recorded.representation().radius,
+                               *recorded.end_points)
+        scene = Scene(path)
+        for options, expected_elements in [({}, ['<circle', '<path', '<path', '<path']),
+                                           ({'deduplicate': True, 'resolution': 500}, ['<circle', '<path', '<circle']),
+                                           ({'resolution': 500, 'collapse': False}, ['<circle', '<path', '<path'])]:
+            output = io.StringIO()
+            scene.draw(PoincareDiskModel(backend='svg', output=output, **options))
+            assert [element.split()[0] for element in output.getvalue().splitlines()[1:]] == expected_elements
+        del scene
+
+def test_empty_scene():
+    '''Test that a scene without any objects loads'''
+    with tempfile.TemporaryDirectory() as path:
+        with SceneWriter(path):
+            pass
+        scene = Scene(path)
+        assert len(scene.points) == 0 and len(scene.arcs) == 0 and scene.styles == []
+
+if __name__ == '__main__':
+    print('Testing scene round trip...')
+    test_round_trip()
+    print('Testing drawing through a model...')
+    test_draw_through_model()
+    print('Testing empty scene...')
+    test_empty_scene()
+    print('All tests passed successfully.')
@@ -0,0 +1,42 @@
+'''Test suite to test the hyperbolic spatial index against brute force queries.'''
+
+import numpy as np
+
+from poincare.hyperbolic import HyperbolicPoint
+from poincare.testing import random_points
+from poincare.spatial import HyperbolicKDTree
+
+TEST_THRESHOLD = 10e-12
+
+def test_queries():
+    '''Test nearest neighbour and radius queries'''
+    points = random_points(5000, 0, max_radius=0.99)
+    tree = HyperbolicKDTree(points, leaf_size=8)
+    for query in [HyperbolicPoint(0, 0), HyperbolicPoint(0.9, -0.3), points[17]]:
+        distances = points.distance(query)
+        indices, knn_distances = tree.knn(query, 7)
+        assert np.allclose(knn_distances, np.sort(distances)[:7], atol=TEST_THRESHOLD)
+        assert tree.nearest(query)[0] == np.argmin(distances)
+
+        indices, within_distances = tree.within(query, 0.8)
+        assert set(indices) == set(np.flatnonzero(distances <= 0.8))
+
+def test_insert():
+    '''Test queries after incremental inserts'''
+    points = random_points(600, 1, max_radius=0.99)
+    tree = HyperbolicKDTree(points[:100])
+    for start in range(100, 600, 50):
+        assert list(tree.insert(points[start:start + 50])) == list(range(start, start + 50))
+    assert len(tree) == 600
+
+    indices, distances = tree.query_knn(points[:20], 3)
+    assert (indices[:, 0] == np.arange(20)).all()
+    for query, query_distances in zip(points[:20], distances):
+        assert np.allclose(query_distances, np.sort(points.distance(query))[:3], atol=TEST_THRESHOLD)
+
+if __name__ == '__main__':
+    print('Testing HyperbolicKDTree queries...')
+    test_queries()
+    print('Testing HyperbolicKDTree inserts...')
+    test_insert()
+    print('All tests passed successfully.')
@@ -0,0 +1,60 @@
+'''Test suite to test the regular tiling generator.'''
+
+from collections import Counter
+
+from poincare.euclidean import Point
+from poincare.hyperbolic import HyperbolicPoint
+from poincare.tiling import RegularTiling
+
+APPROX_TEST_THRESHOLD = 10e-6
+
+def test_tiles():
+    '''Test the number of tiles generated at every depth'''
+    depth_counts = Counter(depth for depth, _ in RegularTiling(7, 3).transformations(4))
+    assert [depth_counts[depth] for depth in range(5)] == [1, 7, 21, 56, 147]
+
+    depth_counts = Counter(depth for depth, _ in RegularTiling(4, 5).transformations(4))
+    assert [depth_counts[depth] for depth in range(5)] == [1, 4, 12, 28, 64]
+
+def test_edges():
+    '''Test that every edge is generated once and all edges have the same length'''
+    tiling = RegularTiling(5, 4)
+    polygons = list(tiling.polygons(3))
+    side_length = polygons[0][0].distance(polygons[0][1])
+    edges = list(tiling.edges(3))
+
+    midpoints = set()
+    for edge in edges:
+        assert abs(edge.end_points[0].distance(edge.end_points[1]) - side_length) < APPROX_TEST_THRESHOLD
+        midpoint = (edge.end_points[0] + edge.end_points[1]) / 2
+        midpoints.add((round(midpoint.x, 6), round(midpoint.y, 6)))
+    assert len(midpoints) == len(edges) == 225
+
+def test_culling():
+    '''Test that tiles below the minimal radius are culled along with the tiles beyond them'''
+    tiling = RegularTiling(7, 3)
+    all_tiles = list(tiling.transformations(7))
+    tiles = list(tiling.transformations(7, min_radius=0.01))
+    assert len(tiles) < len(all_tiles) / 2
+    assert all(tiling.bounding_radius(transformation) >= 0.01 for _, transformation in tiles)
+    assert all(tiling.bounding_radius(transformation) < 0.01
+               for _, transformation in all_tiles if transformation.apply_complex(0j).real > 0.999)
+
+    central_polygon = next(tiling.polygons(0))
+    central_radius = central_polygon[0].euclidean_distance_to_origin()
+    assert abs(tiling.bounding_radius(all_tiles[0][1]) - central_radius) < APPROX_TEST_THRESHOLD
+    # the bounding circle of a tile contains its vertices
+    for polygon, (_, transformation) in zip(tiling.polygons(2), tiling.transformations(2)):
+        center = HyperbolicPoint.from_complex(transformation.apply_complex(0j))
+        circle = center.hyperbolic_circle(central_polygon[0].distance_to_origin())
+        assert abs(circle.radius - tiling.bounding_radius(transformation)) < APPROX_TEST_THRESHOLD
+        assert all(Point.distance(circle.center, vertex) <= circle.radius + APPROX_TEST_THRESHOLD for vertex in polygon)
+
+if __name__ == '__main__':
+    print('Testing RegularTiling tiles...')
+    test_tiles()
+    print('Testing RegularTiling edges...')
+    test_edges()
+    print('Testing RegularTiling culling...')
+    test_culling()
+    print('All tests passed successfully.')
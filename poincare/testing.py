@@ -0,0 +1,12 @@
+'''Helpers shared by the test suites.'''
+
+import numpy as np
+
+from poincare.arrays import HyperbolicPointArray
+
+
+def random_points(count, seed=0, max_radius=0.95):
+    '''Returns a HyperbolicPointArray of count points spread uniformly over the Euclidean disk of max_radius.'''
+    rng = np.random.default_rng(seed)
+    radii, angles = max_radius * np.sqrt(rng.random(count)), 2.0 * np.pi * rng.random(count)
+    return HyperbolicPointArray(np.stack([radii * np.cos(angles), radii * np.sin(angles)], axis=1))
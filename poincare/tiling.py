@@ -0,0 +1,89 @@
+'''Module generating regular {p,q} tilings of the Poincare Disk.'''
+
+import math
+import cmath
+import itertools
+
+from . hyperbolic import HyperbolicLine, HyperbolicPoint, Mobius
+
+
+def _key(z, tolerance):
+    '''Quantized key of a complex disk position. The position is first lifted to the hyperboloid,
+       where neighbouring tiles stay apart no matter how close to the boundary they are.'''
+    scale = 2.0 / (1.0 - abs(z)**2) / tolerance
+    return (round(z.real * scale), round(z.imag * scale))
+
+def _seen(key, *key_sets):
+    '''Checks if a key, or a key in one of its neighbouring cells, is in any of the key sets.'''
+    for dx, dy in itertools.product((-1, 0, 1), repeat=2):
+        neighbour = (key[0] + dx, key[1] + dy)
+        if any(neighbour in key_set for key_set in key_sets):
+            return True
+    return False
+
+
+class RegularTiling(object):
+    '''Regular tiling of the Poincare Disk by p-gons, q of which meet at every vertex.
+       Tiles are generated breadth first, by half turns around the edge midpoints of the central tile.
+       Only the keys of the last few depths are remembered, since a tile can only be reached again from
+       its own depth or a neighbouring one.'''
+
+    def __init__(self, p, q, tolerance=1e-4):
+        '''Constructs the tiling, with the central tile centered at the origin and a vertex on the positive x axis.'''
+        if (p - 2) * (q - 2) <= 4:
+            raise ValueError('Regular {p,q} tilings are hyperbolic only when (p - 2)(q - 2) > 4.')
+        self.p, self.q, self.tolerance = p, q, tolerance
+
+        circumradius = math.acosh(1.0 / math.tan(math.pi / p) / math.tan(math.pi / q))
+        inradius = math.acosh(math.cos(math.pi / q) / math.sin(math.pi / p))
+        self._vertices = [cmath.rect(math.tanh(circumradius / 2.0), 2.0 * math.pi * k / p) for k in range(p)]
+        self._edge_midpoints = [cmath.rect(math.tanh(inradius / 2.0), math.pi * (2 * k + 1) / p) for k in range(p)]
+        self._half_turns = [Mobius.rotation(math.pi, HyperbolicPoint.from_complex(m)) for m in self._edge_midpoints]
+        self._circumradius_tanh = math.tanh(circumradius / 2.0)
+
+    def bounding_radius(self, transformation):
+        '''Euclidean radius of the hyperbolic circle circumscribing the tile the transformation maps to.'''
+        squared_distance, radius_tanh = abs(transformation.apply_complex(0j))**2, self._circumradius_tanh
+        return radius_tanh * (1.0 - squared_distance) / (1.0 - squared_distance * radius_tanh**2)
+
+    def transformations(self, max_depth, min_radius=None):
+        '''Yields (depth, Mobius) pairs, each mapping the central tile onto a distinct tile, depth by depth.
+           Tiles with a Euclidean bounding radius below min_radius are neither yielded nor expanded. Tiles further
+           out are smaller still, so this culls the whole part of the tiling beyond them.'''
+        frontier = [Mobius.identity()]
+        previous_keys, current_keys = set(), {_key(0j, self.tolerance)}
+        for depth in range(max_depth + 1):
+            next_frontier, next_keys = [], set()
+            for transformation in frontier:
+                if min_radius is not None and self.bounding_radius(transformation) < min_radius:
+                    continue
+                yield depth, transformation
+                if depth == max_depth:
+                    continue
+                for half_turn in self._half_turns:
+                    neighbour = transformation @ half_turn
+                    key = _key(neighbour.apply_complex(0j), self.tolerance)
+                    if not _seen(key, previous_keys, current_keys, next_keys):
+                        next_keys.add(key)
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+            previous_keys, current_keys = current_keys, next_keys
+
+    def polygons(self, max_depth, min_radius=None):
+        '''Yields the vertex lists of the tiles up to the given depth, as lists of HyperbolicPoints.'''
+        for _, transformation in self.transformations(max_depth, min_radius):
+            yield [HyperbolicPoint.from_complex(transformation.apply_complex(v)) for v in self._vertices]
+
+    def edges(self, max_depth, min_radius=None):
+        '''Yields every edge of the tiles up to the given depth exactly once, as HyperbolicLines.'''
+        current_depth, previous_keys, current_keys = 0, set(), set()
+        for depth, transformation in self.transformations(max_depth, min_radius):
+            if depth != current_depth:
+                current_depth, previous_keys, current_keys = depth, current_keys, set()
+            vertices = [transformation.apply_complex(v) for v in self._vertices]
+            for k, midpoint in enumerate(self._edge_midpoints):
+                key = _key(transformation.apply_complex(midpoint), self.tolerance)
+                if not _seen(key, previous_keys, current_keys):
+                    current_keys.add(key)
+                    yield HyperbolicLine(HyperbolicPoint.from_complex(vertices[k]),
+                                         HyperbolicPoint.from_complex(vertices[(k + 1) % self.p]))